@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: offline batch conversion throughput from 1 to N worker processes.
+
+Generates a synthetic clip (moving shapes over a gradient) unless --input is
+given, converts it with each worker count and checks every run produces the
+same frames in the same order.
+
+Usage: python benchmarks/bench_batch.py [--input clip.mp4] [--max-workers N]
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+import config
+from processing.batch import BatchJob, BatchConverter
+
+
+def make_clip(path: str, frames: int, size=(640, 480)):
+    """Write a deterministic MJPG test clip"""
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, size)
+    gradient = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    for i in range(frames):
+        frame = cv2.cvtColor(gradient, cv2.COLOR_GRAY2BGR)
+        cv2.circle(frame, ((i * 7) % width, height // 2), height // 5, (255, 255, 255), -1)
+        cv2.rectangle(frame, (width // 3, (i * 5) % height), (width // 3 + 80, (i * 5) % height + 60), (0, 0, 0), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', help='Video to convert (default: generated clip)')
+    parser.add_argument('--frames', type=int, default=600, help='Frames in the generated clip')
+    parser.add_argument('--width', type=int, default=200, help='Output columns')
+    parser.add_argument('--height', type=int, default=60, help='Output rows')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--glitch', action='store_true', help='Enable seeded glitch effects')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input
+        if path is None:
+            path = os.path.join(tmp, 'bench.avi')
+            make_clip(path, args.frames)
+
+        job = BatchJob(path, args.width, args.height, config.RAMP_ALPHA, glitch=args.glitch, seed=1)
+        reference = None
+        base_fps = None
+        print(f"{'workers':>8}{'frames':>8}{'seconds':>9}{'fps':>9}{'speedup':>9}")
+        counts = sorted({1, args.max_workers} | {2 ** i for i in range(1, 8) if 2 ** i < args.max_workers})
+        for workers in counts:
+            start = time.perf_counter()
+            frames = list(BatchConverter(job, workers).frames())
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference = frames
+            elif frames != reference:
+                raise SystemExit(f"Output with {workers} workers differs from 1 worker")
+            fps = len(frames) / elapsed
+            base_fps = base_fps or fps
+            print(f"{workers:>8}{len(frames):>8}{elapsed:>9.2f}{fps:>9.1f}{fps / base_fps:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ImageConverter.enhance vs enhance_fast (time and allocations per frame).
+
+Usage: python benchmarks/bench_converter.py [--frames N]
+"""
+
+import sys
+import os
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from processing.converter import ImageConverter, ENHANCE_FAST_TOLERANCE
+
+SIZES = [(80, 24), (200, 60), (250, 80), (400, 120)]
+
+
+def measure(fn, frames, repeat):
+    """Return (ms per frame, peak bytes allocated while processing a frame)"""
+    fn(frames[0])  # warm up scratch buffers
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(frames[i % len(frames)])
+    elapsed = (time.perf_counter() - start) / repeat * 1000.0
+
+    tracemalloc.start()
+    for i in range(len(frames)):
+        fn(frames[i])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200, help='Frames per measurement')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    converter = ImageConverter()
+    print(f"{'size':>9}{'ref ms':>9}{'fast ms':>9}{'ref alloc':>11}{'fast alloc':>12}{'max diff':>10}")
+    for width, height in SIZES:
+        frames = [cv2.GaussianBlur(rng.integers(0, 256, (height, width), dtype=np.uint8), (0, 0), 2)
+                  for _ in range(8)]
+        diff = int(np.abs(converter.enhance(frames[0]).astype(int) - converter.enhance_fast(frames[0])).max())
+        ref_ms, ref_peak = measure(converter.enhance, frames, args.frames)
+        fast_ms, fast_peak = measure(converter.enhance_fast, frames, args.frames)
+        print(f"{f'{width}x{height}':>9}{ref_ms:>9.3f}{fast_ms:>9.3f}{ref_peak:>10}B{fast_peak:>11}B{diff:>10}")
+    print(f"(alloc = peak bytes allocated per frame; tolerance: {ENHANCE_FAST_TOLERANCE} grey levels)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: cost and banding of each dither method per ramp.
+
+Cost is ms per frame of Ditherer.apply on the gradient fixture at several
+grid sizes. Banding is measured on the same gradient: each cell is replaced
+by the centre of its glyph's gray-level bin, both that and the undithered
+input are blurred (roughly what the eye does at viewing distance), and the
+mean absolute difference is reported in gray levels. 'auto' shows what the
+per-ramp default (DITHER_BY_BIN_WIDTH) picks.
+
+Usage: python benchmarks/bench_dither.py [--frames N] [--linear-ramp]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import cv2
+import numpy as np
+
+import config
+from processing.dither import Ditherer, DITHER_METHODS
+from processing.mapper import AsciiMapper
+from fixtures import gradient_frames
+
+SIZES = [(80, 24), (200, 60), (400, 120)]
+RAMPS = [
+    ('alpha', config.RAMP_ALPHA),
+    ('standard', config.RAMP_STANDARD),
+    ('block', config.RAMP_BLOCK),
+    ('minimal', config.RAMP_MINIMAL),
+]
+METHODS = [m for m in DITHER_METHODS if m != 'auto']
+
+
+def best_of(fn, frames, repeat=3):
+    """Lowest mean ms per call over `repeat` runs of `frames` calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(frames):
+            fn()
+        best = min(best, (time.perf_counter() - start) / frames * 1000.0)
+    return best
+
+
+def grid_gradient(width, height):
+    """The gradient fixture as a grid-sized gray frame"""
+    gray = cv2.cvtColor(gradient_frames(1)[0], cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+
+
+def banding(ditherer, gray, lookup):
+    """Mean absolute blurred-brightness error (gray levels) after dithering and mapping"""
+    out = ditherer.apply(gray, lookup)
+    shown = ditherer._centre[out]
+    blur = lambda img: cv2.GaussianBlur(img.astype(np.float32), (0, 0), 2.0)
+    return float(np.abs(blur(shown) - blur(gray)).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=50, help='Frames per measurement')
+    parser.add_argument('--linear-ramp', action='store_true', help='Use evenly spaced ramps instead of calibrated ones')
+    args = parser.parse_args()
+    calibrated = False if args.linear_ramp else None
+
+    mapper = AsciiMapper(config.RAMP_BLOCK, calibrated)
+    print("cost (ms/frame, block ramp)")
+    print(f"{'size':>10}" + "".join(f"{m:>17}" for m in METHODS))
+    for width, height in SIZES:
+        gray = grid_gradient(width, height)
+        row = f"{f'{width}x{height}':>10}"
+        for method in METHODS:
+            ditherer = Ditherer(method)
+            ditherer.apply(gray, mapper.lookup)  # build tables outside the timing
+            row += f"{best_of(lambda: ditherer.apply(gray, mapper.lookup), args.frames):>17.3f}"
+        print(row)
+
+    gray = grid_gradient(200, 60)
+    print("\nbanding (mean blurred error in gray levels, 200x60; lower is smoother)")
+    print(f"{'ramp':>10}" + "".join(f"{m:>17}" for m in METHODS) + f"{'auto':>17}")
+    for name, ramp in RAMPS:
+        lookup = AsciiMapper(ramp, calibrated).lookup
+        row = f"{name:>10}"
+        for method in METHODS:
+            row += f"{banding(Ditherer(method), gray, lookup):>17.2f}"
+        auto = Ditherer('auto')
+        auto.prepare(lookup)
+        print(row + f"{auto.active:>17}")
+
+
+if __name__ == "__main__":
+    main()
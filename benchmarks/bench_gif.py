@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GIF frame rasterization, glyph atlas vs per-line ImageDraw.text.
+
+Builds a synthetic clip (moving shapes through the mapper), then times
+rasterizing it both ways, a full GifExporter.export of the clip and the
+streaming encoder (export_stream) with its peak traced memory.
+
+Usage: python benchmarks/bench_gif.py [--frames N] [--legacy-frames N] [--size WxH] [-j N]
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import config
+from processing.mapper import AsciiMapper
+from rendering.export import GifExporter
+
+
+def make_clip(frames: int, width: int, height: int) -> list:
+    """ASCII frames of a bright disc and bar drifting over a gradient"""
+    mapper = AsciiMapper(config.RAMP_ALPHA)
+    ys, xs = np.mgrid[0:height, 0:width]
+    base = (xs * 255 // max(width - 1, 1)).astype(np.uint8) // 2
+    clip = []
+    for i in range(frames):
+        gray = base.copy()
+        cx = (i * 2) % width
+        cy = height / 2 + np.sin(i / 15) * height / 3
+        gray[(xs - cx) ** 2 + ((ys - cy) * 2) ** 2 < (height / 4) ** 2] = 255
+        gray[:, (i * 3) % width:(i * 3) % width + 4] = 200
+        clip.append("\n".join(mapper.map_frame_lut(gray)))
+    return clip
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=900, help='Clip length')
+    parser.add_argument('--legacy-frames', type=int, default=60,
+                        help='Frames rasterized with ImageDraw.text (slow; extrapolated)')
+    parser.add_argument('--size', default='120x40', help='Grid size WxH')
+    parser.add_argument('-j', '--workers', type=int, default=1, help='Streaming encoder processes')
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.lower().split('x'))
+
+    clip = make_clip(args.frames, width, height)
+    exporter = GifExporter()
+    size = exporter.frame_size(clip[0])
+
+    legacy = clip[:args.legacy_frames]
+    start = time.perf_counter()
+    for text in legacy:
+        exporter.render_frame_draw(text, size)
+    draw_ms = (time.perf_counter() - start) / max(len(legacy), 1) * 1000.0
+
+    start = time.perf_counter()
+    for text in clip:
+        exporter.render_frame(text, size)
+    atlas_ms = (time.perf_counter() - start) / len(clip) * 1000.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        exporter.export(clip, os.path.join(tmp, "bench.gif"))
+        export_s = time.perf_counter() - start
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        exporter.export_stream(iter(clip), os.path.join(tmp, "stream.gif"), args.workers)
+        stream_s = time.perf_counter() - start
+        stream_peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+    print(f"clip: {args.frames} frames of {width}x{height} "
+          f"({size[0] * exporter.atlas.cell_width}x{size[1] * exporter.atlas.cell_height} px)")
+    print(f"{'rasterizer':<12}{'ms/frame':>10}{'clip s':>10}")
+    print(f"{'draw.text':<12}{draw_ms:>10.2f}{draw_ms * args.frames / 1000:>10.1f}")
+    print(f"{'atlas':<12}{atlas_ms:>10.2f}{atlas_ms * args.frames / 1000:>10.1f}")
+    print(f"speedup {draw_ms / atlas_ms:.1f}x; full export (atlas + encode) {export_s:.1f}s")
+    print(f"streaming export ({args.workers} worker(s)): {stream_s:.1f}s, peak {stream_peak:.1f} MB traced")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: glitch effects on the code array vs the per-character string loop.
+
+The string loop is the pre-vectorization GlitchProcessor.apply, kept here
+as the baseline. Both run at the configured GLITCH_INTENSITY.
+
+Usage: python benchmarks/bench_glitch.py [--frames N] [--intensity X]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import config
+from processing.glitch import GlitchProcessor, NOISE_CHARS
+from processing.mapper import AsciiMapper
+
+SIZES = [(80, 24), (200, 60), (250, 80), (400, 120)]
+
+
+def legacy_apply(lines, rng, intensity, max_shift):
+    """Original line-by-line implementation (shift + per-character noise)"""
+    out = []
+    for line in lines:
+        if rng.random() < intensity:
+            shift = rng.randint(-max_shift, max_shift) % len(line)
+            line = line[-shift:] + line[:-shift]
+        if rng.random() < intensity * 0.5:
+            chars = list(line)
+            for i in range(len(chars)):
+                if rng.random() < 0.02:
+                    chars[i] = rng.choice(NOISE_CHARS)
+            line = "".join(chars)
+        out.append(line)
+    return out
+
+
+def best_of(fn, frames, repeat=3):
+    """Lowest mean ms per call over `repeat` runs of `frames` calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(frames):
+            fn()
+        best = min(best, (time.perf_counter() - start) / frames * 1000.0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200, help='Frames per measurement')
+    parser.add_argument('--intensity', type=float, default=config.GLITCH_INTENSITY,
+                        help='Glitch intensity (default: config value)')
+    args = parser.parse_args()
+
+    config.ENABLE_GLITCH = True
+    config.GLITCH_INTENSITY = args.intensity
+    glitcher = GlitchProcessor()
+    mapper = AsciiMapper(config.RAMP_ALPHA)
+    rng = np.random.default_rng(0)
+
+    print(f"intensity {args.intensity}")
+    print(f"{'size':>10}{'loop ms':>10}{'codes ms':>10}{'speedup':>9}")
+    for width, height in SIZES:
+        gray = rng.integers(0, 256, (height, width), dtype=np.uint8)
+        lines = mapper.map_frame_lut(gray)
+
+        py_rng = random.Random(0)
+        loop_ms = best_of(lambda: legacy_apply(lines, py_rng, glitcher.intensity, glitcher.max_shift),
+                          args.frames)
+
+        np_rng = GlitchProcessor.frame_rng(0, 0)
+        codes = mapper.frame_buffer(gray)[:, :-1]
+        codes_ms = best_of(lambda: glitcher.apply_codes(codes, np_rng), args.frames)
+
+        print(f"{f'{width}x{height}':>10}{loop_ms:>10.3f}{codes_ms:>10.3f}{loop_ms / codes_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
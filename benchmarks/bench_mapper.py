@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: AsciiMapper.map_frame_fast vs the lookup-table engine.
+
+Usage: python benchmarks/bench_mapper.py [--frames N]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import config
+from processing.mapper import AsciiMapper
+
+SIZES = [(80, 24), (200, 60), (250, 80), (400, 120)]
+RAMPS = [('alpha', config.RAMP_ALPHA), ('block', config.RAMP_BLOCK)]
+
+
+def time_call(fn, frames, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(frames[i % len(frames)])
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200, help='Frames per measurement')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'ramp':<7}{'size':>10}{'fast ms':>10}{'lut ms':>10}{'speedup':>9}")
+    for ramp_name, ramp in RAMPS:
+        mapper = AsciiMapper(ramp)
+        for width, height in SIZES:
+            frames = [rng.integers(0, 256, (height, width), dtype=np.uint8) for _ in range(8)]
+            assert mapper.map_frame_fast(frames[0]) == mapper.map_frame_lut(frames[0])
+            fast = time_call(mapper.map_frame_fast, frames, args.frames)
+            lut = time_call(mapper.map_frame_lut, frames, args.frames)
+            print(f"{ramp_name:<7}{f'{width}x{height}':>10}{fast:>10.3f}{lut:>10.3f}{fast / lut:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Load test: broadcast server fan-out to many loopback viewers.
+
+Publishes the moving-shapes fixture (mapped at --width x --height) at --fps
+to 1..N plain TCP viewers running in a separate process, plus optional
+stalled viewers that connect and never read. Reports the frame rate each
+reading viewer actually received, total throughput, the server's encode
+and fan-out latency, and how many frames were skipped by backpressure.
+
+Usage: python benchmarks/bench_server.py [--clients 1,10,100,250,500] [--stalled N]
+"""
+
+import sys
+import os
+import time
+import socket
+import asyncio
+import argparse
+import multiprocessing
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import cv2
+
+import config
+from network.server import BroadcastServer
+from processing.mapper import AsciiMapper
+from rendering.ansi import SYNC_END
+from fixtures import shapes_frames
+
+
+def fixture_lines(count: int, width: int, height: int):
+    """The shapes fixture as ASCII frames"""
+    mapper = AsciiMapper(config.RAMP_STANDARD)
+    frames = []
+    for frame in shapes_frames(count):
+        gray = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (width, height), interpolation=cv2.INTER_AREA)
+        frames.append(mapper.map_frame_fast(gray))
+    return frames
+
+
+async def _reader(port: int, counts: list, index: int, connected: asyncio.Queue, stop: asyncio.Event):
+    """Count complete frames (one SYNC_END each) until stopped"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    connected.put_nowait(index)
+    tail = b''
+    while not stop.is_set():
+        try:
+            data = await asyncio.wait_for(reader.read(1 << 16), 0.2)
+        except asyncio.TimeoutError:
+            continue
+        if not data:
+            break
+        data = tail + data
+        counts[index] += data.count(SYNC_END)
+        tail = data[-(len(SYNC_END) - 1):]
+    writer.close()
+
+
+async def _clients(port: int, readers: int, stalled: int, seconds: float, conn):
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    connected = asyncio.Queue()
+    counts = [0] * readers
+    # Stalled viewers: tiny receive buffer, never read
+    idle = []
+    for _ in range(stalled):
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.connect(('127.0.0.1', port))
+        idle.append(sock)
+    tasks = [asyncio.ensure_future(_reader(port, counts, i, connected, stop)) for i in range(readers)]
+    for _ in range(readers):
+        await connected.get()
+    conn.send('connected')
+    await loop.run_in_executor(None, conn.recv)   # publishing started
+    await asyncio.sleep(0.5)                       # let the first keyframes land
+    start = list(counts)
+    await asyncio.sleep(seconds)
+    received = [c - s for c, s in zip(counts, start)]
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for sock in idle:
+        sock.close()
+    conn.send(received)
+
+
+def client_process(port, readers, stalled, seconds, conn):
+    asyncio.run(_clients(port, readers, stalled, seconds, conn))
+
+
+def run(frames, readers: int, stalled: int, fps: float, seconds: float, max_kbps: float):
+    server = BroadcastServer('127.0.0.1', 0, max_clients=readers + stalled + 1, max_kbps=max_kbps)
+    server.start()
+    parent, child = multiprocessing.Pipe()
+    proc = multiprocessing.Process(target=client_process,
+                                   args=(server.port, readers, stalled, seconds, child))
+    proc.start()
+    parent.recv()
+    deadline = time.monotonic() + 10.0
+    while len(server.viewers) < readers + stalled and time.monotonic() < deadline:
+        time.sleep(0.05)  # wait out protocol sniffing
+    viewers = len(server.viewers)
+
+    # Publish through the clients' measurement window, plus a warm-up and a margin
+    parent.send('go')
+    base = server.stats()
+    interval = 1.0 / fps
+    next_frame = time.perf_counter()
+    i = 0
+    end = next_frame + seconds + 1.0
+    while next_frame < end:
+        server.publish(frames[i % len(frames)])
+        i += 1
+        next_frame += interval
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+    received = parent.recv()
+    proc.join()
+    stats = server.stats()
+    server.stop()
+
+    received.sort()
+    return {
+        'viewers': viewers,
+        'median_fps': received[len(received) // 2] / seconds if received else 0.0,
+        'min_fps': received[0] / seconds if received else 0.0,
+        'mbps': (stats['bytes_sent'] - base['bytes_sent']) / (seconds + 1.0) / 1e6,
+        'encode_ms': stats['encode']['p50_ms'],
+        'fanout_p50': stats['fanout']['p50_ms'],
+        'fanout_p95': stats['fanout']['p95_ms'],
+        'skipped': stats['skipped'] - base['skipped'],
+        'keyframes': stats['keyframes_sent'] - base['keyframes_sent'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', default='1,10,100,250,500', help='Comma-separated reading viewer counts')
+    parser.add_argument('--stalled', type=int, default=0, help='Extra viewers that never read')
+    parser.add_argument('--fps', type=float, default=config.TARGET_FPS, help='Publish rate')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Measurement window per run')
+    parser.add_argument('--width', type=int, default=120, help='Frame columns')
+    parser.add_argument('--height', type=int, default=40, help='Frame rows')
+    parser.add_argument('--max-kbps', type=float, default=0, help='Per-viewer bitrate cap (0 = uncapped)')
+    args = parser.parse_args()
+
+    frames = fixture_lines(60, args.width, args.height)
+    print(f"{args.width}x{args.height} at {args.fps:.0f} fps, {args.stalled} stalled viewer(s)")
+    print(f"{'viewers':>8}{'med fps':>9}{'min fps':>9}{'MB/s':>8}{'enc ms':>8}"
+          f"{'fan p50':>9}{'fan p95':>9}{'skipped':>9}{'keyfr':>7}")
+    for readers in [int(n) for n in args.clients.split(',')]:
+        r = run(frames, readers, args.stalled, args.fps, args.seconds, args.max_kbps)
+        print(f"{r['viewers']:>8}{r['median_fps']:>9.1f}{r['min_fps']:>9.1f}{r['mbps']:>8.2f}{r['encode_ms']:>8.2f}"
+              f"{r['fanout_p50']:>9.2f}{r['fanout_p95']:>9.2f}{r['skipped']:>9}{r['keyframes']:>7}")
+
+
+if __name__ == "__main__":
+    main()
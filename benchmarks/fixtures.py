@@ -0,0 +1,93 @@
+"""
+Deterministic frame fixtures for the benchmarks: synthetic camera frames
+(gradients, noise, moving shapes) and, optionally, frames from a recorded
+clip. Every synthetic generator is seeded, so two runs see identical input.
+"""
+
+import os
+import sys
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from camera.offline import open_source
+
+# Native capture size the fixtures are generated at (a common webcam mode)
+NATIVE_SIZE = (640, 480)
+
+
+def gradient_frames(count: int, size: Tuple[int, int] = NATIVE_SIZE) -> List[np.ndarray]:
+    """Smooth diagonal gradient drifting across the frame"""
+    w, h = size
+    ys, xs = np.mgrid[0:h, 0:w].astype(np.float32)
+    frames = []
+    for i in range(count):
+        phase = i * 8.0
+        gray = ((xs + ys * 0.5 + phase) % (w + h * 0.5)) / (w + h * 0.5) * 255.0
+        frames.append(cv2.cvtColor(gray.astype(np.uint8), cv2.COLOR_GRAY2BGR))
+    return frames
+
+
+def noise_frames(count: int, size: Tuple[int, int] = NATIVE_SIZE, seed: int = 0) -> List[np.ndarray]:
+    """Uniform sensor-like noise (worst case for diffing and compression)"""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (h, w, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def shapes_frames(count: int, size: Tuple[int, int] = NATIVE_SIZE, seed: int = 0) -> List[np.ndarray]:
+    """Bright circles and boxes moving over a dark, lightly noisy background"""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    background = rng.integers(10, 40, (h, w), dtype=np.uint8)
+    shapes = [(rng.uniform(0, w), rng.uniform(0, h), rng.uniform(-12, 12), rng.uniform(-8, 8),
+               int(rng.integers(20, 80)), int(rng.integers(120, 256)), bool(rng.integers(0, 2)))
+              for _ in range(6)]
+    frames = []
+    for i in range(count):
+        gray = background.copy()
+        for x, y, vx, vy, r, shade, circle in shapes:
+            cx, cy = int((x + vx * i) % w), int((y + vy * i) % h)
+            if circle:
+                cv2.circle(gray, (cx, cy), r, shade, -1)
+            else:
+                cv2.rectangle(gray, (cx - r, cy - r // 2), (cx + r, cy + r // 2), shade, -1)
+        frames.append(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+    return frames
+
+
+def clip_frames(spec: str, count: int) -> List[np.ndarray]:
+    """Up to `count` frames of a recorded clip (video file or image sequence)"""
+    source = open_source(spec)
+    if not source.open():
+        raise RuntimeError(f"Could not open clip {spec}")
+    frames = []
+    try:
+        while len(frames) < count:
+            ret, frame = source.read()
+            if not ret or frame is None:
+                break
+            frames.append(frame if frame.ndim == 3 else cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
+    finally:
+        source.release()
+    if not frames:
+        raise RuntimeError(f"Clip {spec} has no frames")
+    return frames
+
+
+SYNTHETIC = {
+    'gradient': gradient_frames,
+    'noise': noise_frames,
+    'shapes': shapes_frames,
+}
+
+
+def load_fixtures(names: List[str], count: int, clip: str = None) -> Dict[str, List[np.ndarray]]:
+    """Native BGR frames per fixture name; a clip is added as 'clip'"""
+    fixtures = {name: SYNTHETIC[name](count) for name in names}
+    if clip:
+        fixtures['clip'] = clip_frames(clip, count)
+    return fixtures
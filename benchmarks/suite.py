@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: every pipeline stage over a matrix of fixtures, grid sizes and ramps.
+
+Needs no camera: input comes from the deterministic fixtures in
+benchmarks/fixtures.py (plus an optional recorded clip). For each fixture
+and grid size it measures, per ramp where the ramp matters:
+
+    preprocess  FramePlan crop/resize/gray of a native frame
+    enhance     ImageConverter.enhance_fast
+    map         AsciiMapper code buffer -> lines
+    glitch      GlitchProcessor.apply_codes
+    diff        changed_spans between consecutive frames (curses renderer's work)
+    render      AnsiRenderer frame assembly, written to /dev/null
+    gif         GifExporter.render_frame (glyph atlas)
+    e2e         preprocess -> FrameProcessor -> NullRenderer, end to end
+
+and reports ms per frame, frames per second and peak bytes allocated while
+processing one frame (tracemalloc).
+
+Results are saved as JSON (default benchmarks/results/<commit>.json) and
+can be compared with an earlier run:
+
+    python benchmarks/suite.py --quick
+    python benchmarks/suite.py --quick --compare benchmarks/results/abc1234.json
+
+Usage: python benchmarks/suite.py [--quick] [--frames N] [--clip PATH] [--save PATH] [--compare PATH]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import cv2
+import numpy as np
+
+import config
+from camera.plan import FramePlan
+from processing.converter import ImageConverter
+from processing.mapper import AsciiMapper, buffer_to_text
+from processing.glitch import GlitchProcessor
+from processing.pipeline import FrameProcessor
+from rendering.ansi import AnsiRenderer
+from rendering.diff import lines_to_codes, changed_spans
+from rendering.export import GifExporter
+from rendering.null import NullRenderer
+from fixtures import SYNTHETIC, load_fixtures
+
+SIZES = [(80, 24), (120, 40), (200, 60), (250, 80), (400, 120)]
+QUICK_SIZES = [(80, 24), (200, 60)]
+RAMPS = [
+    ('alpha', config.RAMP_ALPHA),
+    ('symbols', config.RAMP_SYMBOLS),
+    ('dense', config.RAMP_DENSE),
+    ('standard', config.RAMP_STANDARD),
+    ('block', config.RAMP_BLOCK),
+    ('minimal', config.RAMP_MINIMAL),
+]
+QUICK_RAMPS = ['alpha', 'block']
+STAGES = ['preprocess', 'enhance', 'map', 'glitch', 'diff', 'render', 'gif', 'e2e']
+ANY_RAMP = '*'
+
+
+def measure(fn, count: int, repeat: int = 3, alloc_samples: int = 5) -> dict:
+    """
+    Time fn(i) for i in range(count), keeping the best of `repeat` passes
+    (the least disturbed by other load), and sample its peak allocation.
+    """
+    fn(0)  # warm up caches and scratch buffers
+    ms = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(count):
+            fn(i)
+        ms = min(ms, (time.perf_counter() - start) / count * 1000.0)
+
+    tracemalloc.start()
+    peak = 0
+    for i in range(min(alloc_samples, count)):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(i)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return {'ms': ms, 'fps': 1000.0 / ms if ms > 0 else 0.0, 'alloc_bytes': peak}
+
+
+def bench_size(natives, size, ramps, stages, count, repeat, exporter, devnull) -> list:
+    """All stage measurements for one fixture at one grid size"""
+    w, h = size
+    n = len(natives)
+    native_h, native_w = natives[0].shape[:2]
+    plan = FramePlan((native_w, native_h), size)
+    converter = ImageConverter()
+    grays = [plan.apply(frame).copy() for frame in natives]
+    enhanced = [converter.enhance_fast(gray).copy() for gray in grays]
+    rows = []
+
+    def add(ramp, stage, fn):
+        if stage in stages:
+            rows.append(dict(ramp=ramp, stage=stage, **measure(fn, count, repeat)))
+
+    add(ANY_RAMP, 'preprocess', lambda i: plan.apply(natives[i % n]))
+    add(ANY_RAMP, 'enhance', lambda i: converter.enhance_fast(grays[i % n]))
+
+    for ramp_name, ramp in ramps:
+        mapper = AsciiMapper(ramp)
+        buffers = [mapper.frame_buffer(e).copy() for e in enhanced]
+        lines = [buffer_to_text(buf).split('\n') for buf in buffers]
+        texts = ['\n'.join(frame) for frame in lines]
+        codes = [lines_to_codes(frame, w) for frame in lines]
+
+        add(ramp_name, 'map', lambda i: buffer_to_text(mapper.frame_buffer(enhanced[i % n])).split('\n'))
+
+        config.ENABLE_GLITCH = True
+        glitcher = GlitchProcessor()
+        rng = GlitchProcessor.frame_rng(0, 0)
+        add(ramp_name, 'glitch', lambda i: glitcher.apply_codes(buffers[i % n][:, :-1], rng))
+        config.ENABLE_GLITCH = False
+
+        add(ramp_name, 'diff', lambda i: changed_spans(codes[(i - 1) % n], codes[i % n]))
+
+        renderer = AnsiRenderer(out_fd=devnull, in_fd=devnull)
+        renderer.width, renderer.height = w + 1, h + 2
+        add(ramp_name, 'render', lambda i: renderer.render_frame(lines[i % n]))
+
+        add(ramp_name, 'gif', lambda i: exporter.render_frame(texts[i % n], size))
+
+        processor = FrameProcessor(converter, mapper, GlitchProcessor())
+        null = NullRenderer(w + 1, h + 2)
+        add(ramp_name, 'e2e', lambda i: null.render_frame(processor.process(plan.apply(natives[i % n]))))
+    return rows
+
+
+def git_revision() -> str:
+    """Short commit id of the working tree, with '-dirty' if it has changes"""
+    root = os.path.dirname(BENCH_DIR)
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_table(results: list, ramps: list):
+    """One table per fixture/size: stages down, ramps across (ms per frame)"""
+    groups = {}
+    for r in results:
+        groups.setdefault((r['fixture'], r['size']), []).append(r)
+    names = [name for name, _ in ramps]
+    for (fixture, size), rows in groups.items():
+        print(f"\n{fixture} {size}  (ms/frame; alloc = peak KB per frame)")
+        print(f"{'stage':<11}" + "".join(f"{name:>9}" for name in names) + f"{'alloc':>9}")
+        for stage in STAGES:
+            by_ramp = {r['ramp']: r for r in rows if r['stage'] == stage}
+            if not by_ramp:
+                continue
+            if ANY_RAMP in by_ramp:
+                r = by_ramp[ANY_RAMP]
+                cells = f"{r['ms']:>9.3f}" + f"{'':>9}" * (len(names) - 1)
+                alloc = r['alloc_bytes']
+            else:
+                cells = "".join(f"{by_ramp[n]['ms']:>9.3f}" if n in by_ramp else f"{'-':>9}" for n in names)
+                alloc = max(r['alloc_bytes'] for r in by_ramp.values())
+            print(f"{stage:<11}{cells}{alloc / 1024:>8.1f}K")
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> int:
+    """Print changes against a saved run; returns the number of regressions"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    key = lambda r: (r['fixture'], r['size'], r['ramp'], r['stage'])
+    old = {key(r): r for r in baseline['results']}
+    ratios = {}
+    regressions = []
+    for r in results:
+        base = old.get(key(r))
+        if base is None or base['ms'] <= 0:
+            continue
+        ratio = r['ms'] / base['ms']
+        ratios.setdefault(r['stage'], []).append(ratio)
+        if ratio > 1.0 + threshold:
+            regressions.append((ratio, r, base))
+
+    print(f"\nCompared with {baseline.get('revision', '?')} ({baseline_path}):")
+    print(f"{'stage':<11}{'geo-mean':>10}{'best':>8}{'worst':>8}{'n':>5}")
+    for stage in STAGES:
+        values = ratios.get(stage)
+        if values:
+            geo = float(np.exp(np.mean(np.log(values))))
+            print(f"{stage:<11}{geo:>9.2f}x{min(values):>7.2f}x{max(values):>7.2f}x{len(values):>5}")
+    if regressions:
+        print(f"\n{len(regressions)} measurement(s) slower by more than {threshold:.0%}:")
+        for ratio, r, base in sorted(regressions, key=lambda item: -item[0])[:20]:
+            print(f"  {r['fixture']:<9}{r['size']:>8} {r['ramp']:<9}{r['stage']:<11}"
+                  f"{base['ms']:>8.3f} -> {r['ms']:.3f} ms ({ratio:.2f}x)")
+    else:
+        print(f"\nNo measurement slower by more than {threshold:.0%}.")
+    return len(regressions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=50, help='Frames per measurement (default: 50)')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes per measurement, best kept (default: 3)')
+    parser.add_argument('--fixtures', default=','.join(SYNTHETIC),
+                        help=f"Comma-separated synthetic fixtures (default: {','.join(SYNTHETIC)})")
+    parser.add_argument('--clip', help='Also benchmark frames from this video file or image sequence')
+    parser.add_argument('--sizes', help='Comma-separated grid sizes, e.g. 80x24,400x120')
+    parser.add_argument('--ramps', help='Comma-separated ramp names (default: all six)')
+    parser.add_argument('--stages', help=f"Comma-separated stages (default: {','.join(STAGES)})")
+    parser.add_argument('--quick', action='store_true', help='Two sizes and two ramps only')
+    parser.add_argument('--save', help='Result file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--no-save', action='store_true', help="Don't write a result file")
+    parser.add_argument('--compare', help='Earlier result file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown reported as a regression (default: 0.10)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 if any measurement regressed')
+    args = parser.parse_args()
+
+    if args.sizes:
+        sizes = [tuple(int(v) for v in s.lower().split('x')) for s in args.sizes.split(',')]
+    else:
+        sizes = QUICK_SIZES if args.quick else SIZES
+    ramp_names = args.ramps.split(',') if args.ramps else (QUICK_RAMPS if args.quick else [n for n, _ in RAMPS])
+    ramps = [(name, ramp) for name, ramp in RAMPS if name in ramp_names]
+    stages = args.stages.split(',') if args.stages else STAGES
+    fixture_names = [name for name in args.fixtures.split(',') if name]
+
+    cv2.setRNGSeed(0)
+    fixtures = load_fixtures(fixture_names, min(args.frames, 16), args.clip)
+    exporter = GifExporter()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    saved_glitch = config.ENABLE_GLITCH
+    config.ENABLE_GLITCH = False
+
+    revision = git_revision()
+    print(f"revision {revision}; {len(fixtures)} fixture(s) x {len(sizes)} size(s) x {len(ramps)} ramp(s), "
+          f"{args.frames} frames per measurement")
+    results = []
+    start = time.perf_counter()
+    try:
+        for fixture, natives in fixtures.items():
+            for size in sizes:
+                for row in bench_size(natives, size, ramps, stages, args.frames, args.repeat,
+                                      exporter, devnull):
+                    results.append(dict(fixture=fixture, size=f"{size[0]}x{size[1]}", **row))
+    finally:
+        config.ENABLE_GLITCH = saved_glitch
+        os.close(devnull)
+    print_table(results, ramps)
+    print(f"\n(total {time.perf_counter() - start:.1f}s)")
+
+    report = {
+        'revision': revision,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+        },
+        'settings': {'frames': args.frames, 'repeat': args.repeat, 'fixtures': list(fixtures),
+                     'sizes': [f"{w}x{h}" for w, h in sizes], 'ramps': [n for n, _ in ramps]},
+        'results': results,
+    }
+    if not args.no_save:
+        path = args.save or os.path.join(BENCH_DIR, 'results', f"{revision}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=1)
+        print(f"saved {path}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
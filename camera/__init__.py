@@ -1,4 +1,7 @@
 """Camera capture module"""
-from .capture import CameraCapture
+from .source import FrameSource
+from .capture import CameraCapture, CaptureMode
+from .offline import VideoFileSource, ImageSequenceSource, RawStreamSource, open_source
 
-__all__ = ['CameraCapture']
+__all__ = ['FrameSource', 'CameraCapture', 'CaptureMode', 'VideoFileSource',
+           'ImageSequenceSource', 'RawStreamSource', 'open_source']
@@ -4,17 +4,42 @@ Real-Time ASCII Camera - Camera Capture Module
 
 import cv2
 import numpy as np
-from typing import Optional, Tuple
+from typing import NamedTuple, Optional, Tuple
 
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from camera.source import FrameSource
 
-class CameraCapture:
+
+class CaptureMode(NamedTuple):
+    """Capture format actually delivered by the driver"""
+    width: int
+    height: int
+    fourcc: str
+    fps: float
+    luma: bool  # frames are the Y plane of YUYV, not BGR
+    
+    def describe(self) -> str:
+        fps = f"@{self.fps:.0f}" if self.fps > 0 else ""
+        return f"{self.width}x{self.height} {self.fourcc or '?'}{fps}{' luma' if self.luma else ''}"
+
+
+def _fourcc_to_str(value: float) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+
+
+class CameraCapture(FrameSource):
     """Handles webcam capture and frame preprocessing"""
     
     def __init__(self, camera_id: int = 0):
+        super().__init__()
         self.camera_id = camera_id
         self.cap: Optional[cv2.VideoCapture] = None
-        self._width = 0
-        self._height = 0
+        self.mode: Optional[CaptureMode] = None
+        self._luma = False
     
     def open(self) -> bool:
         """Open the camera"""
@@ -28,56 +53,103 @@ class CameraCapture:
         
         # Optimize for speed
         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.mode = self._current_mode()
         
         return True
     
-    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
-        """Read a frame from the camera"""
-        if self.cap is None:
-            return False, None
-        return self.cap.read()
-    
-    def read_grayscale(self, target_width: int, target_height: int, zoom: float = 1.0, mirror: bool = False) -> Optional[np.ndarray]:
+    def negotiate(self, target_width: int, target_height: int, fps: float = None,
+                  color: bool = False) -> Optional[CaptureMode]:
         """
-        Read a frame, apply zoom/mirror, resize it, and convert to grayscale.
+        Ask the driver for the smallest capture mode that still covers the
+        target grid, preferring uncompressed YUYV over MJPG so there is no
+        JPEG decode. For YUYV the luma plane is used directly, skipping
+        BGR conversion, unless `color` frames are needed. Drivers that
+        ignore a request fall through to the next candidate; if none fits,
+        whatever the driver delivers is kept. Returns the negotiated mode.
         """
-        ret, frame = self.read()
-        if not ret or frame is None:
+        if self.cap is None:
             return None
+        fps = fps or config.TARGET_FPS
+        sizes = sorted(config.CAPTURE_RESOLUTIONS, key=lambda wh: wh[0] * wh[1])
+        covering = [(w, h) for w, h in sizes if w >= target_width and h >= target_height]
+        candidates = covering or sizes[-1:]
         
-        # Mirroring
-        if mirror:
-            frame = cv2.flip(frame, 1)
-            
-        # Zoom (Cropping)
-        if zoom > 1.0:
-            h, w = frame.shape[:2]
-            new_h, new_w = int(h / zoom), int(w / zoom)
-            start_y, start_x = (h - new_h) // 2, (w - new_w) // 2
-            frame = frame[start_y:start_y+new_h, start_x:start_x+new_w]
-            
-        # Resize to target dimensions
-        resized = cv2.resize(frame, (target_width, target_height), interpolation=cv2.INTER_AREA)
+        original = self._current_mode()
+        accepted = False
+        for fourcc in config.CAPTURE_FOURCCS:
+            for width, height in candidates:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                self.cap.set(cv2.CAP_PROP_FPS, fps)
+                mode = self._current_mode()
+                if mode.fourcc == fourcc and mode.width >= target_width and mode.height >= target_height:
+                    accepted = True
+                    break
+            if accepted:
+                break
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
+        if not accepted:
+            # Put the driver back the way open() found it (a FOURCC it did
+            # not report cannot be restored; writing blanks would corrupt it)
+            if original.fourcc:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*original.fourcc.ljust(4)))
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, original.width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, original.height)
+            mode = self._current_mode()
         
-        return gray
-
+        self._width, self._height = int(mode.width), int(mode.height)
+        if accepted and mode.fourcc == 'YUYV' and config.CAPTURE_LUMA_ONLY and not color:
+            self._enable_luma()
+        self.mode = self._current_mode()
+        return self.mode
+    
+    def _current_mode(self) -> CaptureMode:
+        """Read back the mode the driver is actually using"""
+        return CaptureMode(
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            _fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            float(self.cap.get(cv2.CAP_PROP_FPS)),
+            self._luma,
+        )
+    
+    def _enable_luma(self):
+        """Switch to raw YUYV frames if the backend really delivers them"""
+        self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        ret, frame = self.cap.read()
+        if ret and frame is not None and frame.size == self._width * self._height * 2:
+            self._luma = True
+        else:
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            self._luma = False
+    
+    def enable_color(self):
+        """Deliver BGR frames again if the luma path is active (e.g. colour switched on)"""
+        if self._luma and self.cap is not None:
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            self._luma = False
+            self.mode = self._current_mode()
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read a frame from the camera"""
+        if self.cap is None:
+            return False, None
+        ret, frame = self.cap.read()
+        # Decided per frame, not by _luma, so a frame read while
+        # enable_color() switches formats on another thread is still handled
+        if ret and frame is not None and frame.size == self._width * self._height * 2:
+            frame = self._extract_luma(frame)
+        return ret, frame
+    
+    def _extract_luma(self, raw: np.ndarray) -> np.ndarray:
+        """Y plane of a packed YUYV frame (Y0 U Y1 V ...) as a gray image"""
+        if raw.size != self._width * self._height * 2:
+            return raw
+        return cv2.extractChannel(raw.reshape(self._height, self._width, 2), 0)
+    
     def release(self):
         """Release the camera"""
         if self.cap is not None:
             self.cap.release()
             self.cap = None
-    
-    @property
-    def native_resolution(self) -> Tuple[int, int]:
-        """Get native camera resolution (width, height)"""
-        return self._width, self._height
-    
-    def __enter__(self):
-        self.open()
-        return self
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.release()
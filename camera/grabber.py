@@ -0,0 +1,70 @@
+"""
+Real-Time ASCII Camera - Background Frame Grabber
+Reads the camera on its own thread so blocking reads never stall processing.
+"""
+
+import threading
+import time
+import numpy as np
+from typing import Optional, Tuple
+
+
+class LatestFrameSlot:
+    """Single-entry mailbox that only ever holds the newest frame"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._timestamp = 0.0
+        self._seq = 0
+        self.overwritten = 0  # Frames replaced before anyone took them
+
+    def put(self, frame: np.ndarray, timestamp: float):
+        """Store a frame, replacing any frame that has not been taken yet"""
+        with self._cond:
+            if self._frame is not None:
+                self.overwritten += 1
+            self._frame = frame
+            self._timestamp = timestamp
+            self._seq += 1
+            self._cond.notify_all()
+
+    def take(self, timeout: Optional[float] = None) -> Optional[Tuple[int, float, np.ndarray]]:
+        """Wait for and remove the newest frame as (seq, timestamp, frame)"""
+        with self._cond:
+            if self._frame is None:
+                self._cond.wait(timeout)
+            if self._frame is None:
+                return None
+            frame, self._frame = self._frame, None
+            return self._seq, self._timestamp, frame
+
+
+class FrameGrabber(threading.Thread):
+    """Background thread that keeps a LatestFrameSlot filled from a camera"""
+
+    def __init__(self, camera, slot: LatestFrameSlot, timings=None):
+        super().__init__(name="frame-grabber", daemon=True)
+        self.camera = camera
+        self.slot = slot
+        self.timings = timings
+        self.failed_reads = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            start = time.perf_counter()
+            ret, frame = self.camera.read()
+            if self.timings is not None:
+                self.timings.add('grab', time.perf_counter() - start)
+            if not ret or frame is None:
+                self.failed_reads += 1
+                time.sleep(0.005)
+                continue
+            self.slot.put(frame, start)
+
+    def stop(self, timeout: float = 1.0):
+        """Ask the thread to finish and wait for the current read to return"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
@@ -0,0 +1,168 @@
+"""
+Real-Time ASCII Camera - Offline Frame Sources
+Video files, image sequences and raw frame streams, for headless conversion
+and reproducible benchmarking without a camera.
+"""
+
+import glob
+import cv2
+import numpy as np
+from typing import BinaryIO, List, Optional, Tuple
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from camera.source import FrameSource
+
+
+class VideoFileSource(FrameSource):
+    """Frames from a video file (anything cv2.VideoCapture can open)"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.cap: Optional[cv2.VideoCapture] = None
+        self._fps: Optional[float] = None
+        self._frame_count: Optional[int] = None
+
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+        self._width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self._height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._fps = self.cap.get(cv2.CAP_PROP_FPS) or None
+        count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._frame_count = count if count > 0 else None
+        return True
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.cap is None:
+            return False, None
+        return self.cap.read()
+
+    def seek(self, index: int):
+        """Position the source so the next read returns frame `index`"""
+        if self.cap is not None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._fps
+
+    @property
+    def frame_count(self) -> Optional[int]:
+        return self._frame_count
+
+
+class ImageSequenceSource(FrameSource):
+    """Frames from image files matching a glob pattern (or all images in a directory)"""
+
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp', '.pgm', '.ppm')
+
+    def __init__(self, pattern: str, fps: float = None):
+        super().__init__()
+        self.pattern = pattern
+        self.paths: List[str] = []
+        self._fps = fps or config.TARGET_FPS
+        self._index = 0
+
+    def open(self) -> bool:
+        if os.path.isdir(self.pattern):
+            paths = [os.path.join(self.pattern, name) for name in os.listdir(self.pattern)]
+            paths = [p for p in paths if p.lower().endswith(self.IMAGE_EXTENSIONS)]
+        else:
+            paths = glob.glob(self.pattern)
+        self.paths = sorted(paths)
+        self._index = 0
+        if not self.paths:
+            return False
+        first = cv2.imread(self.paths[0], cv2.IMREAD_UNCHANGED)
+        if first is None:
+            return False
+        self._height, self._width = first.shape[:2]
+        return True
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        while self._index < len(self.paths):
+            frame = cv2.imread(self.paths[self._index], cv2.IMREAD_COLOR)
+            self._index += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def seek(self, index: int):
+        """Position the source so the next read returns frame `index`"""
+        self._index = max(0, min(index, len(self.paths)))
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._fps
+
+    @property
+    def frame_count(self) -> Optional[int]:
+        return len(self.paths)
+
+
+class RawStreamSource(FrameSource):
+    """
+    Fixed-size raw frames from a byte stream (stdin by default), e.g.
+    ffmpeg -i clip.mp4 -f rawvideo -pix_fmt gray - | asciicam convert - ...
+    """
+
+    def __init__(self, width: int, height: int, channels: int = 1,
+                 stream: BinaryIO = None, fps: float = None):
+        super().__init__()
+        if channels not in (1, 3):
+            raise ValueError("Raw frames must have 1 (gray) or 3 (BGR) channels")
+        self._width = width
+        self._height = height
+        self.channels = channels
+        self.stream = stream
+        self._fps = fps or config.TARGET_FPS
+        self._frame_bytes = width * height * channels
+
+    def open(self) -> bool:
+        if self.stream is None:
+            self.stream = sys.stdin.buffer
+        return True
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.stream is None:
+            return False, None
+        frame = np.empty(self._frame_bytes, np.uint8)
+        view = memoryview(frame)
+        filled = 0
+        while filled < self._frame_bytes:
+            n = self.stream.readinto(view[filled:])
+            if not n:
+                return False, None
+            filled += n
+        shape = (self._height, self._width, 3) if self.channels == 3 else (self._height, self._width)
+        return True, frame.reshape(shape)
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._fps
+
+
+def open_source(spec: str, raw_size: Tuple[int, int] = None, raw_channels: int = 1,
+                fps: float = None) -> FrameSource:
+    """
+    Pick a source for an input spec: '-' reads raw frames from stdin
+    (raw_size required), a directory or glob pattern is an image sequence,
+    anything else is a video file.
+    """
+    if spec == '-':
+        if raw_size is None:
+            raise ValueError("Reading raw frames from stdin needs a frame size")
+        return RawStreamSource(raw_size[0], raw_size[1], raw_channels, fps=fps)
+    if os.path.isdir(spec) or any(ch in spec for ch in '*?['):
+        return ImageSequenceSource(spec, fps=fps)
+    return VideoFileSource(spec)
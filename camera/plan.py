@@ -0,0 +1,88 @@
+"""
+Real-Time ASCII Camera - Frame Plan
+Caches the crop/resize geometry for a (source size, grid size, zoom, mirror)
+combination so it is worked out once instead of on every frame.
+"""
+
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+class FramePlan:
+    """Precomputed crop box, resize target and mirror for one geometry"""
+
+    def __init__(self, source_size: Tuple[int, int], target_size: Tuple[int, int],
+                 zoom: float = 1.0, mirror: bool = False, use_remap: bool = False,
+                 interpolation: int = cv2.INTER_AREA):
+        self.source_size = source_size
+        self.target_size = target_size
+        self.zoom = zoom
+        self.mirror = mirror
+        self.use_remap = use_remap
+        self.interpolation = interpolation
+
+        # Zoom is a centred crop of the native frame
+        w, h = source_size
+        if zoom > 1.0:
+            crop_w, crop_h = int(w / zoom), int(h / zoom)
+        else:
+            crop_w, crop_h = w, h
+        x0, y0 = (w - crop_w) // 2, (h - crop_h) // 2
+        self.crop = (slice(y0, y0 + crop_h), slice(x0, x0 + crop_w))
+
+        tw, th = target_size
+        self._resized = np.empty((th, tw, 3), np.uint8)
+        self._gray = np.empty((th, tw), np.uint8)
+        self._color_source = False
+        self._flip = False
+
+        # Optional remap: one gather straight from the native frame with the
+        # crop, scale and mirror folded in. Only touches the sampled pixels,
+        # but samples bilinearly instead of area-averaging.
+        self._maps = None
+        if use_remap:
+            xs = x0 + (np.arange(tw, dtype=np.float32) + 0.5) * (crop_w / tw) - 0.5
+            ys = y0 + (np.arange(th, dtype=np.float32) + 0.5) * (crop_h / th) - 0.5
+            if mirror:
+                xs = (w - 1) - xs
+            map_x, map_y = np.meshgrid(xs, ys)
+            self._maps = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+    @property
+    def key(self) -> tuple:
+        return (self.source_size, self.target_size, self.zoom, self.mirror,
+                self.use_remap, self.interpolation)
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Turn a native BGR (or single-channel) frame into a grid-sized gray frame.
+
+        The result is a view into buffers owned by the plan; mirroring is a
+        reversed-stride view rather than a separate flipped copy.
+        """
+        color = frame.ndim == 3
+        resized = self._resized if color else self._gray
+
+        if self._maps is not None:
+            cv2.remap(frame, self._maps[0], self._maps[1], cv2.INTER_LINEAR, dst=resized)
+            mirror = False  # already folded into the map
+        else:
+            cv2.resize(frame[self.crop], self.target_size, dst=resized, interpolation=self.interpolation)
+            mirror = self.mirror
+
+        if color:
+            cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        self._color_source = color
+        self._flip = mirror
+        gray = self._gray
+        return gray[:, ::-1] if mirror else gray
+
+    def color(self) -> Optional[np.ndarray]:
+        """
+        Grid-sized BGR frame from the last apply() (a view, mirrored like
+        the gray frame), or None if that frame was single-channel.
+        """
+        if not self._color_source:
+            return None
+        return self._resized[:, ::-1] if self._flip else self._resized
@@ -0,0 +1,102 @@
+"""
+Real-Time ASCII Camera - Frame Source Interface
+Common base for the live camera and offline inputs (files, image
+sequences, raw streams): they only need to provide read(), and share the
+zoom/mirror/resize/grayscale preprocessing.
+"""
+
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from camera.plan import FramePlan
+
+
+class FrameSource(ABC):
+    """Base class for anything that produces BGR (or single-channel) frames"""
+    
+    def __init__(self):
+        self._width = 0
+        self._height = 0
+        self._plan: Optional[FramePlan] = None
+        self.use_remap = config.CAPTURE_USE_REMAP
+        self.interpolation = cv2.INTER_AREA
+    
+    @abstractmethod
+    def open(self) -> bool:
+        """Open the source; returns False if it is unavailable"""
+    
+    @abstractmethod
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read the next frame as (ok, frame)"""
+    
+    def release(self):
+        """Release any underlying handles"""
+    
+    @property
+    def fps(self) -> Optional[float]:
+        """Nominal frame rate, if the source has one"""
+        return None
+    
+    @property
+    def frame_count(self) -> Optional[int]:
+        """Total number of frames, if known"""
+        return None
+    
+    def read_grayscale(self, target_width: int, target_height: int, zoom: float = 1.0, mirror: bool = False) -> Optional[np.ndarray]:
+        """
+        Read a frame, apply zoom/mirror, resize it, and convert to grayscale.
+        """
+        ret, frame = self.read()
+        if not ret or frame is None:
+            return None
+        return self.preprocess(frame, target_width, target_height, zoom, mirror)
+
+    def preprocess(self, frame: np.ndarray, target_width: int, target_height: int, zoom: float = 1.0, mirror: bool = False) -> np.ndarray:
+        """
+        Apply zoom/mirror, resize and grayscale conversion to an already-read frame.
+        
+        The crop/resize geometry is cached in a FramePlan and only rebuilt
+        when the frame size, target grid, zoom or mirror setting changes.
+        The returned array is reused by the next call.
+        """
+        plan = self.plan_for(frame, target_width, target_height, zoom, mirror)
+        return plan.apply(frame)
+    
+    def preprocess_color(self, frame: np.ndarray, target_width: int, target_height: int, zoom: float = 1.0,
+                         mirror: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Like preprocess(), but also returns the grid-sized BGR frame the gray
+        one was made from (None for single-channel sources). Both are reused
+        by the next call.
+        """
+        plan = self.plan_for(frame, target_width, target_height, zoom, mirror)
+        gray = plan.apply(frame)
+        return gray, plan.color()
+    
+    def plan_for(self, frame: np.ndarray, target_width: int, target_height: int, zoom: float = 1.0, mirror: bool = False) -> FramePlan:
+        """Return the cached FramePlan for this geometry, rebuilding it if needed"""
+        source_size = (frame.shape[1], frame.shape[0])
+        key = (source_size, (target_width, target_height), zoom, mirror, self.use_remap, self.interpolation)
+        if self._plan is None or self._plan.key != key:
+            self._plan = FramePlan(source_size, (target_width, target_height), zoom, mirror,
+                                   use_remap=self.use_remap, interpolation=self.interpolation)
+        return self._plan
+    
+    @property
+    def native_resolution(self) -> Tuple[int, int]:
+        """Get native source resolution (width, height)"""
+        return self._width, self._height
+    
+    def __enter__(self):
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -28,11 +28,51 @@ RAMP_MINIMAL = " .:oO@"
 # Default ramp to use (now using rich alphanumeric)
 DEFAULT_RAMP = RAMP_ALPHA
 
+# Calibrated ramps: map intensity by each glyph's measured ink coverage
+# (rasterized once in the GIF font, cached on disk) instead of spacing the
+# ramp's characters evenly. --linear-ramp turns it off.
+CALIBRATED_RAMPS = True
+CALIBRATION_GAMMA = 2.2       # Gray level -> coverage exponent (1.0 = coverage linear in gray level)
+CALIBRATION_FONT_SIZE = 32    # Rasterization size for the measurement
+CALIBRATION_CACHE_DIR = None  # None = $XDG_CACHE_HOME/asciicam (or ~/.cache/asciicam)
+
 # ============================================================================
 # DISPLAY SETTINGS
 # ============================================================================
 TARGET_FPS = 30
 ASPECT_CORRECTION = 0.55  # Terminal chars are ~2x taller than wide
+ENABLE_DIFF_RENDER = True     # Redraw only changed spans (--full-redraw disables)
+ANSI_SYNC_UPDATE = True       # Wrap --backend ansi frames in synchronized-update markers
+
+# Temporal reuse (--no-temporal disables): only rows whose tiles changed
+# since they were last processed are re-enhanced, re-mapped and redrawn
+ENABLE_TEMPORAL_REUSE = True
+TEMPORAL_TILE = (8, 4)        # Change-detection tile (columns, rows)
+TEMPORAL_THRESHOLD = 3.0      # Mean grey-level change that marks a tile as changed
+TEMPORAL_REFRESH_FRAMES = 150 # Reprocess the whole frame this often regardless
+
+# Colour output (--color, 'c' cycles): 'none', '256' (xterm palette) or
+# 'truecolor' (--backend ansi only; curses falls back to 256)
+COLOR_MODE = 'none'
+COLOR_TRUECOLOR_DROP_BITS = 3 # Low bits cleared per channel so runs of one colour are longer
+
+# Adaptive quality (--fixed-quality disables): drops edge blend, resize
+# quality, CLAHE rate and vertical sampling, in that order, to hold TARGET_FPS
+ENABLE_QUALITY_GOVERNOR = True
+GOVERNOR_SMOOTHING = 0.1      # EMA weight of the newest frame's work time
+GOVERNOR_DOWN_RATIO = 0.9     # Step down when work time exceeds this share of the frame budget...
+GOVERNOR_DOWN_FRAMES = 15     # ...for this many frames in a row
+GOVERNOR_UP_RATIO = 0.5       # Step up when it stays under this share...
+GOVERNOR_UP_FRAMES = 90       # ...for this many frames in a row
+GOVERNOR_COOLDOWN_FRAMES = 30 # Frames to wait after any change before judging again
+
+# Threaded pipeline (--threaded): processed frames waiting for the renderer.
+# When rendering falls behind the oldest frame is dropped, so keep this small.
+PIPELINE_QUEUE_SIZE = 2
+
+# Offline batch conversion (asciicam convert --workers N): frames per chunk
+# handed to each worker process
+BATCH_CHUNK_SIZE = 32
 
 # ============================================================================
 # ENHANCEMENT SETTINGS
@@ -46,6 +86,32 @@ EDGE_BLEND_ALPHA = 0.15       # Subtle edge enhancement
 
 ENABLE_INVERT = False         # Light text on dark background
 
+# Mapper mode (--mode): 'ramp' maps intensity only; 'structure' draws edges
+# with direction glyphs taken from the edge-blend Sobel gradients
+MAPPER_MODE = 'ramp'
+STRUCTURE_EDGE_THRESHOLD = 96 # Gradient magnitude (0-255) below which the ramp is used
+STRUCTURE_GLYPHS = ('-|/\\',) # Per magnitude band, weakest first: horizontal, vertical, rising, falling
+# 'shape' samples 2x3 points per cell and picks the glyph with the closest
+# ink layout; 'quadrant' samples 2x2 and draws Unicode quadrant blocks
+SHAPE_GLYPHS = ''.join(chr(c) for c in range(32, 127)) # Candidates for 'shape' (printable ASCII)
+SHAPE_CONTRAST_THRESHOLD = 48 # Min sample range (0-255) within a cell for shape matching; flatter cells use the ramp
+# 'braille' packs 2x4 pixels per cell into braille dots, 'halfblock' 1x2
+# pixels into half blocks; each pixel is on or off
+DOTS_DITHER = 'bayer'         # 'bayer' (8x8 ordered dither), 'blue-noise' or 'threshold'
+DOTS_THRESHOLD = 128          # Fixed threshold for DOTS_DITHER = 'threshold'
+
+# Dithering between enhancement and mapping (--dither): 'auto' picks per
+# ramp from DITHER_BY_BIN_WIDTH, else 'none', 'bayer', 'blue-noise' or
+# 'floyd-steinberg'. Dot modes dither on their own (DOTS_DITHER).
+DITHER_METHOD = 'auto'
+# (typical interior bin width in gray levels, method), first match wins
+# (see processing.dither.bin_step). Long ramps (alpha, symbols, dense:
+# ~3-8 levels) show no bands and only gain a pattern; short ones
+# (standard, minimal, block: 25+) get Bayer, one add per cell.
+# Floyd-Steinberg is a little smoother at ~100x the cost
+# (benchmarks/bench_dither.py).
+DITHER_BY_BIN_WIDTH = ((12, 'none'), (256, 'bayer'))
+
 # Brightness/contrast adjustments
 BRIGHTNESS_BOOST = 10         # Add slight brightness
 CONTRAST_BOOST = 1.1          # Slight contrast multiplier
@@ -58,13 +124,54 @@ MAX_ZOOM = 4.0
 # Mirror mode
 ENABLE_MIRROR = True
 
+# Sample the camera frame with one precomputed remap (crop, scale and mirror
+# folded together) instead of an area-averaging resize. Faster on large
+# native frames, slightly more aliased.
+CAPTURE_USE_REMAP = False
+
+# Capture format negotiation: ask the camera for the smallest of these
+# resolutions that covers the character grid at MAX_ZOOM (instead of
+# decoding 1080p and shrinking it), trying the FOURCCs in order. With YUYV the luma plane is
+# used directly, so there is no JPEG decode and no BGR->gray conversion.
+ENABLE_CAPTURE_NEGOTIATION = True
+CAPTURE_RESOLUTIONS = [(160, 120), (320, 240), (424, 240), (640, 360), (640, 480),
+                       (800, 600), (1280, 720), (1920, 1080)]
+CAPTURE_FOURCCS = ('YUYV', 'MJPG')
+CAPTURE_LUMA_ONLY = True
+
+# Network streaming (--serve [HOST:]PORT): one port for plain TCP (netcat),
+# telnet and WebSocket viewers. Each frame is encoded once as ANSI deltas;
+# a viewer that falls behind skips frames and rejoins at a keyframe.
+# Viewers are not authenticated, so a bare --serve PORT stays on loopback;
+# exposing the feed takes an explicit --serve 0.0.0.0:PORT.
+NETWORK_HOST = '127.0.0.1'
+NETWORK_PORT = 2323
+NETWORK_MAX_CLIENTS = 500
+NETWORK_KEYFRAME_INTERVAL = 150 # Full screen every N frames even for viewers in sync
+NETWORK_MAX_KBPS = 4000       # Per-viewer bitrate cap in kbit/s (0 = unlimited)
+NETWORK_BURST_SECONDS = 0.5   # Token bucket depth for the bitrate cap
+NETWORK_HIGH_WATER = 256 * 1024 # Unsent bytes on a viewer's socket before it skips frames
+NETWORK_STALL_SECONDS = 10.0  # Disconnect viewers that stay backed up this long
+NETWORK_SNIFF_SECONDS = 0.3   # Wait for a telnet/WebSocket greeting before assuming plain TCP
+
 # Glitch Effect Settings
 ENABLE_GLITCH = False         # Global glitch toggle
 GLITCH_INTENSITY = 0.05       # Probability of a glitch event (0.0 to 1.0)
 GLITCH_MAX_SHIFT = 5          # Max horizontal line shift
+GLITCH_BLOCK_CHANCE = 0.1     # Per-frame chance of a displaced block
+GLITCH_TEAR_CHANCE = 0.05     # Per-frame chance of a torn band of scanlines
+
+# Recording (streamed to an indexed .acr file while recording)
+RECORD_QUEUE_SIZE = 64        # Frames buffered for the writer thread
+RECORD_COMPRESSION_LEVEL = 1  # zlib/lzma level per block (1 = fastest)
+RECORD_CODEC = 'zlib'         # Block compression: 'zlib', 'lzma' or 'none'
+RECORD_KEYFRAME_INTERVAL = 60 # Full frame every N frames, deltas in between
 
 # GIF Export Settings
 GIF_DURATION = 100            # Milliseconds per frame in GIF
 GIF_FONT_SIZE = 12
 GIF_BG_COLOR = (20, 20, 20)   # Dark grey background
 GIF_TEXT_COLOR = (240, 240, 240) # Off-white text
+GIF_SHADES = 16               # Anti-aliasing levels between background and text colour
+GIF_EXPORT_WORKERS = 0        # Processes for streaming GIF export (0 = one per CPU)
+GIF_CHUNK_FRAMES = 16         # Consecutive frames encoded per worker task
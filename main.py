@@ -9,8 +9,11 @@ Developed by: Yaduraj Singh
 import sys
 import os
 import time
+import atexit
 import curses
+import shutil
 import argparse
+import tempfile
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -21,10 +24,24 @@ import numpy as np
 import config
 from camera.capture import CameraCapture
 from processing.converter import ImageConverter
-from processing.mapper import AsciiMapper
 from processing.glitch import GlitchProcessor
+from processing.pipeline import FrameProcessor, ThreadedPipeline, StageTimings
+from processing.governor import QualityGovernor
+from processing.temporal import TemporalReuse
+from processing.color import ColorQuantizer, COLOR_MODES
+from processing.dither import Ditherer, DITHER_METHODS
+from processing.modes import MAPPER_MODES, create_mapper
+from processing.telemetry import Telemetry
 from rendering.renderer import AsciiRenderer
+from rendering.ansi import AnsiRenderer
+from rendering.null import NullRenderer
 from rendering.export import GifExporter
+from rendering.sinks import open_sink, TextSink, AnsiSink
+from rendering.recording import (RecordingReader, RecordingPlayer, StreamingRecorder,
+                                 text_to_recording, recording_to_text, recode_recording)
+from camera.offline import open_source
+from processing.batch import BatchJob, BatchConverter, convert_sequential
+from network.server import BroadcastServer, parse_address
 
 
 def parse_args():
@@ -54,6 +71,76 @@ def parse_args():
         action='store_true',
         help='Disable contrast enhancement'
     )
+    parser.add_argument(
+        '--native-capture',
+        action='store_true',
+        help="Keep the camera's default capture mode instead of negotiating a smaller one"
+    )
+    parser.add_argument(
+        '--threaded',
+        action='store_true',
+        help='Capture and process frames on background threads'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['curses', 'ansi', 'null'],
+        default='curses',
+        help="Terminal output backend; 'null' draws nothing (e.g. headless --serve) (default: curses)"
+    )
+    parser.add_argument(
+        '--full-redraw',
+        action='store_true',
+        help='Clear and redraw the whole screen every frame'
+    )
+    parser.add_argument(
+        '--mode',
+        choices=list(MAPPER_MODES),
+        default=config.MAPPER_MODE,
+        help="Mapper mode: 'ramp' (intensity), 'structure' (edge direction glyphs), 'shape' (2x3 sub-cell glyph matching), 'quadrant' (2x2 quadrant blocks), 'braille' (2x4 dots) or 'halfblock' (1x2 blocks) (default: %(default)s)"
+    )
+    parser.add_argument(
+        '--linear-ramp',
+        action='store_true',
+        help='Space ramp characters evenly instead of by measured glyph brightness'
+    )
+    parser.add_argument(
+        '--dither',
+        choices=DITHER_METHODS,
+        default=config.DITHER_METHOD,
+        help="Dither before mapping to hide banding on short ramps; 'auto' picks per ramp (default: %(default)s)"
+    )
+    parser.add_argument(
+        '--color',
+        choices=COLOR_MODES,
+        default=config.COLOR_MODE,
+        help='Colour each character from the camera image: xterm 256-colour palette or '
+             '24-bit truecolor (--backend ansi only) (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--serve',
+        metavar='[HOST:]PORT',
+        help='Broadcast the feed to telnet, netcat and WebSocket viewers on this port '
+             '(loopback only unless HOST is given, e.g. 0.0.0.0:2323)'
+    )
+    parser.add_argument(
+        '--no-temporal',
+        action='store_true',
+        help='Reprocess every pixel each frame instead of only the regions that changed'
+    )
+    parser.add_argument(
+        '--fixed-quality',
+        action='store_true',
+        help='Keep full image quality instead of lowering it to hold the target frame rate'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Collect per-stage latency telemetry and show it in the status line (toggle with t)'
+    )
+    parser.add_argument(
+        '--stats-file',
+        help='Collect telemetry and write it to this .json or .csv file on exit'
+    )
     parser.add_argument(
         '--version',
         action='store_true',
@@ -75,12 +162,31 @@ def get_ramp(name: str) -> str:
     return ramps.get(name, config.RAMP_ALPHA)
 
 
-def run_camera(stdscr, args):
-    """Main camera loop"""
+def run_camera(stdscr, args, telemetry=None, server=None):
+    """Main camera loop (stdscr is None for the raw ANSI and null backends)"""
     # Setup renderer
-    renderer = AsciiRenderer()
-    renderer.set_screen(stdscr)
-    
+    if stdscr is not None:
+        renderer = AsciiRenderer(differential=not args.full_redraw)
+        renderer.set_screen(stdscr)
+    elif args.backend == 'null':
+        renderer = NullRenderer()
+    else:
+        renderer = AnsiRenderer(differential=not args.full_redraw)
+        renderer.start()
+    try:
+        return _camera_loop(renderer, args, telemetry, server)
+    finally:
+        if isinstance(renderer, AnsiRenderer):
+            renderer.stop()
+
+
+def _camera_loop(renderer, args, telemetry=None, server=None):
+    """
+    Capture, process and render until the user quits, snapshots or stops recording.
+    With telemetry (a Telemetry) every stage is timed; without it only the
+    threaded pipeline keeps its own running averages. With a BroadcastServer
+    every displayed frame is also published to its viewers.
+    """
     # Setup processing
     converter = ImageConverter()
     glitcher = GlitchProcessor()
@@ -95,56 +201,138 @@ def run_camera(stdscr, args):
         ('6', 'minimal', config.RAMP_MINIMAL),
     ]
     current_ramp_idx = 0
-    mapper = AsciiMapper(ramp_list[current_ramp_idx][2])
+    mapper = create_mapper(args.mode, ramp_list[current_ramp_idx][2], False if args.linear_ramp else None)
     current_ramp_name = ramp_list[current_ramp_idx][1]
+    timings = telemetry if telemetry is not None else (StageTimings() if args.threaded else None)
+    temporal = None
+    if config.ENABLE_TEMPORAL_REUSE and not args.no_temporal:
+        temporal = TemporalReuse(converter, mapper)
+    processor = FrameProcessor(converter, mapper, glitcher, timings, temporal)
+    governor = QualityGovernor(enabled=config.ENABLE_QUALITY_GOVERNOR and not args.fixed_quality)
+    color_mode = renderer.set_color_mode(args.color)
+    processor.quantizer = ColorQuantizer(color_mode) if color_mode != 'none' else None
+    processor.ditherer = Ditherer(args.dither) if args.dither != 'none' else None
     
     # State
     show_help = False
+    show_stats = telemetry is not None and args.stats
+    counted_drops = 0
     zoom_level = config.DEFAULT_ZOOM
-    recording = False
-    recorded_frames = []
+    recorder = None
     
     # Open camera
     camera = CameraCapture(args.camera)
     if not camera.open():
         raise RuntimeError(f"Could not open camera {args.camera}")
+    governor.apply(converter, camera)
+    if config.ENABLE_CAPTURE_NEGOTIATION and not args.native_capture:
+        # Ask for the smallest mode covering the initial terminal grid at
+        # MAX_ZOOM: zooming crops the frame, and the crop must still cover
+        # the grid or it would be upscaled (this also leaves room for the
+        # terminal to grow)
+        term_width, term_height = renderer.get_dimensions()
+        sx, sy = mapper.cell_samples
+        zoom = config.MAX_ZOOM
+        camera.negotiate(int(term_width * sx * zoom),
+                         int(int((term_height - 2) / config.ASPECT_CORRECTION) * sy * zoom),
+                         color=color_mode != 'none')
+    
+    pipeline = None
+    if args.threaded:
+        pipeline = ThreadedPipeline(camera, processor)
+        pipeline.start()
     
     frame_time = 1.0 / config.TARGET_FPS
     fps = 0
     frame_count = 0
     fps_update_time = time.time()
+    term_size = None
     
     try:
         while True:
             current_time = time.time()
-            term_width, term_height = renderer.get_dimensions()
-            
-            # Adjust dimensions for UI
-            capture_height = int((term_height - 2) / config.ASPECT_CORRECTION)
-            capture_width = term_width
             
-            # 1. Capture and Process frame
-            # Grayscale Mode
-            gray = camera.read_grayscale(capture_width, capture_height, zoom_level, config.ENABLE_MIRROR)
-            if gray is None: continue
-            enhanced = converter.enhance(gray)
-            ascii_lines = mapper.map_frame_fast(enhanced)
+            # Adjust dimensions for UI (only when the terminal was resized)
+            if renderer.get_dimensions() != term_size:
+                term_size = renderer.get_dimensions()
+                term_width, term_height = term_size
+                capture_height = int((term_height - 2) / config.ASPECT_CORRECTION)
+                capture_width = term_width
             
-            # 2. Apply Glitch
-            if config.ENABLE_GLITCH:
-                ascii_lines = glitcher.apply(ascii_lines)
+            # 1. Capture and Process frame (enhance, map, glitch)
+            # Mappers that match shapes sample several pixels per cell
+            sample_width = capture_width * mapper.cell_samples[0]
+            sample_height = governor.capture_height(capture_height) * mapper.cell_samples[1]
+            if pipeline is not None:
+                pipeline.set_geometry(sample_width, sample_height, zoom_level, config.ENABLE_MIRROR)
+                frame = pipeline.get_frame(timeout=0.1)
+                if frame is None: continue
+                ascii_lines = frame.lines
+                colors = frame.colors
+                work = frame.work
+            else:
+                # Grayscale Mode (the camera wait is not counted as work)
+                capture_start = time.perf_counter()
+                ret, raw = camera.read()
+                if not ret or raw is None: continue
+                process_start = time.perf_counter()
+                if processor.quantizer is not None:
+                    gray, bgr = camera.preprocess_color(raw, sample_width, sample_height, zoom_level, config.ENABLE_MIRROR)
+                else:
+                    gray, bgr = camera.preprocess(raw, sample_width, sample_height, zoom_level, config.ENABLE_MIRROR), None
+                if telemetry is not None:
+                    telemetry.add('capture', process_start - capture_start)
+                    telemetry.add('preprocess', time.perf_counter() - process_start)
+                ascii_lines, colors = processor.process_color(gray, bgr)
+                work = time.perf_counter() - process_start
+            ascii_lines = governor.expand_rows(ascii_lines, capture_height)
+            colors = governor.expand_rows(colors, capture_height)
             
-            # 3. Render
-            renderer.render_frame(ascii_lines)
+            # 2. Render
+            render_start = time.perf_counter()
+            renderer.render_frame(ascii_lines, colors)
+            render_time = time.perf_counter() - render_start
+            if pipeline is not None:
+                pipeline.record_render(frame, render_time)
+                # Stages overlap, so the slowest one sets the frame rate
+                work = max(work, render_time)
+            else:
+                if telemetry is not None:
+                    telemetry.add('render', render_time)
+                work += render_time
+            if server is not None:
+                server.publish(ascii_lines, colors, color_mode)
+            if governor.update(work):
+                with processor.lock:
+                    governor.apply(converter, camera)
+            if telemetry is not None:
+                telemetry.frame_done()
+                telemetry.count('tty_bytes', renderer.last_bytes_written)
+                # Pipeline and recorder are per call, telemetry per session:
+                # add only this call's new drops
+                dropped = (pipeline.dropped if pipeline is not None else 0) + (recorder.dropped if recorder is not None else 0)
+                if dropped > counted_drops:
+                    telemetry.count('dropped', dropped - counted_drops)
+                    counted_drops = dropped
+                if server is not None:
+                    telemetry.set('net_viewers', len(server.viewers))
+                    telemetry.set('net_bytes', server.bytes_sent)
             
-            # 4. Recording
-            if recording:
-                recorded_frames.append("\n".join(ascii_lines))
+            # 3. Recording
+            if recorder is not None:
+                recorder.add(ascii_lines)
             
-            # 5. UI and Status
-            rec_status = "● REC" if recording else "     "
+            # 4. UI and Status
+            rec_status = "● REC" if recorder is not None else "     "
             glitch_status = "GLT" if config.ENABLE_GLITCH else "---"
-            status = f" {rec_status} | {current_ramp_name} | {glitch_status} | Zoom:{zoom_level:.1f}x | h:Help q:Quit"
+            color_status = "" if color_mode == 'none' else f" {color_mode}"
+            status = f" {rec_status} | {current_ramp_name}{color_status} | {glitch_status} | Zoom:{zoom_level:.1f}x {governor.format_status()} | tx:{renderer.last_bytes_written / 1024:.1f}K | h:Help q:Quit"
+            if server is not None:
+                status += f" | {server.format_status()}"
+            if show_stats:
+                status = f" {rec_status.strip() or '-'} |" + telemetry.format_overlay()
+            elif pipeline is not None:
+                status += f" | drop:{pipeline.dropped} {pipeline.timings.format_compact()}"
             renderer.render_status(status)
             
             if show_help:
@@ -161,25 +349,46 @@ def run_camera(stdscr, args):
                     "║  m   : Toggle Mirror Mode         ║",
                     "║  i   : Toggle Invert              ║",
                     "║  e   : Toggle Edge Sharpness      ║",
+                    "║  c   : Cycle Colour Mode          ║",
+                    "║  t   : Toggle Stats (--stats)     ║",
                     "║  h   : Hide Help                  ║",
                     "║  q   : Quit App                   ║",
+                    "╠═══════════════════════════════════╣",
+                    f"║  cam : {camera.mode.describe()[:26]:<26} ║" if camera.mode else "║                                   ║",
                     "╚═══════════════════════════════════╝",
                 ]
-                sy = (term_height - len(help_lines)) // 2
-                sx = (term_width - len(help_lines[0])) // 2
-                for i, line in enumerate(help_lines):
-                    try: stdscr.addstr(sy + i, sx, line, curses.A_REVERSE)
-                    except: pass
-                stdscr.refresh()
+                renderer.render_overlay(help_lines)
             
-            # 6. Input Handling
+            # 5. Input Handling
             key = renderer.get_key()
-            if key in (ord('q'), ord('Q'), 27): break
-            elif key in (ord('h'), ord('H')): show_help = not show_help
+            if key in (ord('q'), ord('Q'), 27):
+                if recorder is not None:
+                    # Offer the recording in progress for saving before quitting
+                    path = finish_recording(recorder)
+                    recorder = None
+                    return "quit", path
+                break
+            elif key in (ord('h'), ord('H')):
+                show_help = not show_help
+                renderer.invalidate()
             elif key in (ord('g'), ord('G')): config.ENABLE_GLITCH = not config.ENABLE_GLITCH
             elif key in (ord('m'), ord('M')): config.ENABLE_MIRROR = not config.ENABLE_MIRROR
             elif key in (ord('i'), ord('I')): config.ENABLE_INVERT = not config.ENABLE_INVERT
             elif key in (ord('e'), ord('E')): config.ENABLE_EDGE_BLEND = not config.ENABLE_EDGE_BLEND
+            elif key in (ord('c'), ord('C')):
+                # Next mode the backend supports (curses has no truecolor)
+                idx = COLOR_MODES.index(color_mode)
+                for step in range(1, len(COLOR_MODES)):
+                    mode = renderer.set_color_mode(COLOR_MODES[(idx + step) % len(COLOR_MODES)])
+                    if mode != color_mode:
+                        break
+                color_mode = mode
+                if color_mode != 'none':
+                    camera.enable_color()  # the luma-only path has no colour
+                with processor.lock:
+                    processor.quantizer = ColorQuantizer(color_mode) if color_mode != 'none' else None
+            elif key in (ord('t'), ord('T')) and telemetry is not None:
+                show_stats = not show_stats
             elif key == ord('+') or key == ord('='): 
                 zoom_level = min(config.MAX_ZOOM, zoom_level + config.ZOOM_STEP)
             elif key == ord('-') or key == ord('_'):
@@ -187,22 +396,27 @@ def run_camera(stdscr, args):
             elif key == ord('0'): zoom_level = 1.0
             
             elif key in (ord('s'), ord('S')):
-                # Snapshot
-                return "snapshot", "\n".join(ascii_lines)
+                # Snapshot (a recording in progress ends here and is offered for saving)
+                path = finish_recording(recorder) if recorder is not None else None
+                recorder = None
+                return "snapshot", "\n".join(ascii_lines), path
                 
             elif key in (ord('r'), ord('R')):
-                if not recording:
-                    recording = True
-                    recorded_frames = []
+                if recorder is None:
+                    recorder = StreamingRecorder(
+                        new_recording_path(), len(ascii_lines[0]) if ascii_lines else 0,
+                        len(ascii_lines), config.TARGET_FPS, mapper.ramp)
                 else:
-                    recording = False
+                    path = finish_recording(recorder)
+                    recorder = None
                     # Signal to main that we have a recording to save
-                    return "record_result", recorded_frames
+                    return "record_result", path
             elif ord('1') <= key <= ord('6'):
                 idx = key - ord('1')
                 current_ramp_idx = idx
                 current_ramp_name = ramp_list[idx][1]
-                mapper.set_ramp(ramp_list[idx][2])
+                with processor.lock:
+                    mapper.set_ramp(ramp_list[idx][2])
             
             # FPS Calculation
             frame_count += 1
@@ -216,6 +430,13 @@ def run_camera(stdscr, args):
             if elapsed < frame_time: time.sleep(frame_time - elapsed)
             
     finally:
+        if recorder is not None:
+            # Interrupted or failed mid-recording: keep what was captured and
+            # say where once the terminal is restored
+            path = finish_recording(recorder)
+            atexit.register(print, f"💾 Unsaved recording kept at {path}")
+        if pipeline is not None:
+            pipeline.stop()
         camera.release()
 
 def discover_cameras(max_cameras: int = 5) -> list:
@@ -269,14 +490,38 @@ def save_snapshot(frame_text: str):
     except Exception as e:
         print(f"❌ Error saving snapshot: {e}")
 
-def handle_recording(frames):
-    """Handle saved ASCII frames - offers text and GIF export"""
-    if not frames: return
+def new_recording_path() -> str:
+    """Temporary .acr path for a recording in progress"""
+    name = time.strftime("asciicam-%Y%m%d-%H%M%S.acr")
+    return os.path.join(tempfile.gettempdir(), name)
+
+def finish_recording(recorder: StreamingRecorder) -> str:
+    """
+    Close a recording and return its path. If the writer failed (e.g. disk
+    full) the file still holds the frames written before that; the error is
+    reported on exit, once the terminal is restored, instead of propagating.
+    """
+    try:
+        return recorder.close()
+    except Exception as e:
+        cause = e.__cause__ or e
+        atexit.register(print, f"⚠️ Recording stopped early after a write error: {cause}")
+        return recorder.path
+
+def handle_recording(path):
+    """Handle a finished recording file - offers text, GIF and .acr export"""
+    frames = RecordingReader(path)
+    if not len(frames):
+        frames.close()
+        os.remove(path)
+        return
     
     print(f"\n🔴 Recorded {len(frames)} frames.")
-    choice = input("Save as [T]ext, [G]IF, [B]oth, or [N]one? (t/g/b/n): ").strip().lower()
+    choice = input("Save as [T]ext, [G]IF, [B]oth, [A]rchive (.acr), or [N]one? (t/g/b/a/n): ").strip().lower()
     
     if choice == 'n' or not choice:
+        frames.close()
+        os.remove(path)
         print("Recording discarded.")
         return
 
@@ -287,8 +532,9 @@ def handle_recording(frames):
     if choice in ('t', 'b'):
         txt_name = filename_base + ".txt"
         try:
-            with open(txt_name, "w") as f:
-                f.write("\n\f\n".join(frames))
+            with TextSink(txt_name) as sink:
+                for i in range(len(frames)):
+                    sink.write(frames.frame_lines(i))
             print(f"✅ Text saved to {os.path.abspath(txt_name)}")
         except Exception as e:
             print(f"❌ Error saving text: {e}")
@@ -296,10 +542,177 @@ def handle_recording(frames):
     if choice in ('g', 'b'):
         gif_name = filename_base + ".gif"
         exporter = GifExporter()
-        exporter.export(frames, gif_name)
+        exporter.export_stream(frames, gif_name)
+    
+    frames.close()
+    if choice == 'a':
+        acr_name = filename_base + ".acr"
+        shutil.move(path, acr_name)
+        print(f"✅ Recording saved to {os.path.abspath(acr_name)}")
+    else:
+        os.remove(path)
+
+def frame_size(text: str) -> tuple:
+    """argparse type for 'WxH' frame sizes"""
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT (e.g. 640x480), got '{text}'")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"frame size must be positive, got '{text}'")
+    return width, height
+
+
+def parse_convert_args(argv):
+    """Parse arguments for the headless 'convert' command"""
+    parser = argparse.ArgumentParser(
+        prog="asciicam convert",
+        description="Convert a video file, image sequence or raw stream to ASCII without a terminal"
+    )
+    parser.add_argument('input', help="Video file, image glob/directory, or '-' for raw frames on stdin")
+    parser.add_argument('-o', '--output', default='-', help="Output file (default: stdout)")
+    parser.add_argument(
+        '-f', '--format',
+        choices=['txt', 'ansi', 'gif'],
+        help='Output format (default: from the output extension, else ansi)'
+    )
+    parser.add_argument('-w', '--width', type=int, default=120, help='Columns per frame (default: 120)')
+    parser.add_argument('--height', type=int, help='Rows per frame (default: keep the source aspect)')
+    parser.add_argument(
+        '-r', '--ramp',
+        choices=['standard', 'alpha', 'symbols', 'dense', 'block', 'minimal'],
+        default='alpha',
+        help='Character ramp to use (default: alpha)'
+    )
+    parser.add_argument('--invert', action='store_true', help='Invert colors (for light backgrounds)')
+    parser.add_argument('--no-enhance', action='store_true', help='Disable contrast enhancement')
+    parser.add_argument('--glitch', action='store_true', help='Apply the glitch effect')
+    parser.add_argument('--mode', choices=list(MAPPER_MODES), default=config.MAPPER_MODE,
+                        help='Mapper mode (default: %(default)s)')
+    parser.add_argument('--linear-ramp', action='store_true',
+                        help='Space ramp characters evenly instead of by measured glyph brightness')
+    parser.add_argument('--dither', choices=DITHER_METHODS, default=config.DITHER_METHOD,
+                        help='Dither before mapping (default: %(default)s)')
+    parser.add_argument('--raw-size', type=frame_size, help="Frame size for raw stdin input, e.g. 640x480")
+    parser.add_argument('--raw-format', choices=['gray', 'bgr'], default='gray', help='Pixel format for raw stdin input')
+    parser.add_argument('--fps', type=float, help='Frame rate for image sequences and raw input')
+    parser.add_argument('--max-frames', type=int, help='Stop after this many frames')
+    parser.add_argument('-j', '--workers', type=int, default=1, help='Worker processes for file inputs (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for reproducible glitch effects (default: 0)')
+    args = parser.parse_args(argv)
+    if args.input == '-' and args.raw_size is None:
+        parser.error("--raw-size is required when reading raw frames from stdin")
+    return args
+
+
+def run_convert(args) -> int:
+    """Stream frames from a file source through the converter and mapper into a sink"""
+    fmt = args.format
+    if fmt is None:
+        ext = os.path.splitext(args.output)[1].lower()
+        fmt = {'.txt': 'txt', '.gif': 'gif'}.get(ext, 'ansi')
+    
+    source = open_source(args.input, args.raw_size, 3 if args.raw_format == 'bgr' else 1, args.fps)
+    if not source.open():
+        print(f"❌ Could not open input {args.input}", file=sys.stderr)
+        return 1
+    
+    width = args.width
+    height = args.height
+    if height is None:
+        src_w, src_h = source.native_resolution
+        height = max(1, round(width * src_h / src_w * config.ASPECT_CORRECTION))
+    job = BatchJob(args.input, width, height, get_ramp(args.ramp), enhance=not args.no_enhance,
+                   invert=args.invert, glitch=args.glitch, seed=args.seed, fps=args.fps, mode=args.mode,
+                   calibrated=False if args.linear_ramp else None, dither=args.dither)
+    
+    if args.workers > 1 and args.input != '-':
+        # Parallel path: workers open the file themselves
+        source.release()
+        frame_iter = BatchConverter(job, args.workers, max_frames=args.max_frames).frames()
+    else:
+        frame_iter = convert_sequential(job, source, args.max_frames)
+    
+    frames = 0
+    start = time.perf_counter()
+    try:
+        with open_sink(fmt, args.output, args.workers) as sink:
+            for lines in frame_iter:
+                sink.write(lines)
+                frames += 1
+                if frames % 100 == 0:
+                    print(f"   Converted {frames} frames...", file=sys.stderr)
+    finally:
+        source.release()
+    
+    elapsed = time.perf_counter() - start
+    fps = frames / elapsed if elapsed > 0 else 0.0
+    print(f"✅ Converted {frames} frames in {elapsed:.2f}s ({fps:.1f} fps)", file=sys.stderr)
+    return 0
+
+
+def parse_play_args(argv):
+    """Parse arguments for the 'play' command"""
+    parser = argparse.ArgumentParser(prog="asciicam play", description="Play back an .acr recording in the terminal")
+    parser.add_argument('input', help="Recording file (.acr)")
+    parser.add_argument('-s', '--start', type=float, default=0.0, help='Start at this many seconds in')
+    parser.add_argument('--speed', type=float, default=1.0, help='Playback speed factor (default: 1.0)')
+    return parser.parse_args(argv)
+
+def run_play(args) -> int:
+    """Play a recording to the terminal as an ANSI stream"""
+    with RecordingReader(args.input) as reader:
+        if not len(reader):
+            print(f"❌ {args.input} has no frames", file=sys.stderr)
+            return 1
+        try:
+            with AnsiSink('-') as sink:
+                RecordingPlayer(reader, args.speed).play(sink, args.start)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+def parse_recode_args(argv):
+    """Parse arguments for the 'recode' command"""
+    parser = argparse.ArgumentParser(
+        prog="asciicam recode",
+        description="Convert recordings between .txt and .acr, or rewrite an .acr with new settings"
+    )
+    parser.add_argument('input', help="Source recording (.txt or .acr)")
+    parser.add_argument('output', help="Destination recording (.txt or .acr)")
+    parser.add_argument('--codec', choices=['zlib', 'lzma', 'none'], help=f"Block compression (default: {config.RECORD_CODEC})")
+    parser.add_argument('--keyframe-interval', type=int, help=f"Frames between keyframes (default: {config.RECORD_KEYFRAME_INTERVAL})")
+    parser.add_argument('--fps', type=float, help='Frame rate for .txt input (default: TARGET_FPS)')
+    return parser.parse_args(argv)
+
+def run_recode(args) -> int:
+    """Convert a recording between the text and binary formats"""
+    src_txt = args.input.lower().endswith('.txt')
+    dst_txt = args.output.lower().endswith('.txt')
+    if src_txt and dst_txt:
+        print("❌ Nothing to do: both files are .txt", file=sys.stderr)
+        return 1
+    if src_txt:
+        count = text_to_recording(args.input, args.output, args.fps, keyframe_interval=args.keyframe_interval,
+                                  codec=args.codec)
+    elif dst_txt:
+        count = recording_to_text(args.input, args.output)
+    else:
+        count = recode_recording(args.input, args.output, args.keyframe_interval, args.codec)
+    before, after = os.path.getsize(args.input), os.path.getsize(args.output)
+    print(f"✅ {count} frames: {before / 1024:.1f}K -> {after / 1024:.1f}K", file=sys.stderr)
+    return 0
+
 
 def main():
     """Entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        sys.exit(run_convert(parse_convert_args(sys.argv[2:])))
+    if len(sys.argv) > 1 and sys.argv[1] == 'play':
+        sys.exit(run_play(parse_play_args(sys.argv[2:])))
+    if len(sys.argv) > 1 and sys.argv[1] == 'recode':
+        sys.exit(run_recode(parse_recode_args(sys.argv[2:])))
+    
     args = parse_args()
     
     # Camera selection
@@ -311,14 +724,34 @@ def main():
     print(f"\n🚀 Starting ASCII Camera...")
     time.sleep(0.5)
     
+    # Telemetry spans the whole session (snapshots and recordings included)
+    telemetry = Telemetry() if args.stats or args.stats_file else None
+    
+    # Viewers stay connected across snapshots and recordings
+    server = None
+    if args.serve:
+        try:
+            host, port = parse_address(args.serve)
+            server = BroadcastServer(host, port)
+            server.start()
+        except (ValueError, OSError) as e:
+            print(f"❌ Cannot serve on {args.serve}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"📡 Streaming on {server.host}:{server.port} (telnet, nc or WebSocket)")
+    
     # Run loop
     try:
         while True:
-            result = curses.wrapper(lambda stdscr: run_camera(stdscr, args))
+            if args.backend in ('ansi', 'null'):
+                result = run_camera(None, args, telemetry, server)
+            else:
+                result = curses.wrapper(lambda stdscr: run_camera(stdscr, args, telemetry, server))
             
             # 1. Handle Snapshot
             if isinstance(result, tuple) and result[0] == "snapshot":
                 save_snapshot(result[1])
+                if result[2] is not None:
+                    handle_recording(result[2])
                 input("\nPress Enter to return to camera...")
                 continue # Go back to camera
                 
@@ -328,7 +761,9 @@ def main():
                 input("\nPress Enter to return to camera...")
                 continue # Go back to camera
                 
-            # 3. Handle Quit
+            # 3. Handle Quit (saving a recording that was still running)
+            elif isinstance(result, tuple) and result[0] == "quit":
+                handle_recording(result[1])
             break
             
     except KeyboardInterrupt:
@@ -337,6 +772,12 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if server is not None:
+            server.stop()
+        if telemetry is not None and args.stats_file:
+            telemetry.dump(args.stats_file)
+            print(f"📊 Telemetry written to {os.path.abspath(args.stats_file)}")
 
 if __name__ == "__main__":
     main()
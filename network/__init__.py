@@ -0,0 +1,5 @@
+"""Network streaming module"""
+from .encoder import FrameEncoder, EncodedFrame
+from .server import BroadcastServer, parse_address
+
+__all__ = ['FrameEncoder', 'EncodedFrame', 'BroadcastServer', 'parse_address']
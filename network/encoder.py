@@ -0,0 +1,116 @@
+"""
+Real-Time ASCII Camera - Stream Encoder
+Encodes each frame once as ANSI bytes for every viewer: a delta that
+rewrites only the rows that changed, plus a keyframe for viewers that
+(re)join the stream.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from processing.color import COLOR_DTYPES
+from rendering.ansi import (CLEAR_BELOW, CLEAR_EOL, CLEAR_SCREEN, CURSOR_HOME, HIDE_CURSOR,
+                            RESET, SGR_256, SYNC_BEGIN, SYNC_END, color_row, cursor_to, sgr_truecolor)
+
+# Sent once to every viewer before its first keyframe
+VIEWER_PREAMBLE = HIDE_CURSOR + CLEAR_SCREEN
+
+
+class EncodedFrame:
+    """
+    One published frame. `delta` brings a viewer that has the previous
+    frame up to date (for a keyframe it is the keyframe); keyframe() is the
+    whole screen, built on first request from the encoder's row cache and
+    shared by every viewer that needs it.
+    """
+
+    __slots__ = ('seq', 'delta', 'is_keyframe', '_rows', '_colored', '_keyframe')
+
+    def __init__(self, seq: int, delta: bytes, is_keyframe: bool, rows: List[bytes], colored: bool):
+        self.seq = seq
+        self.delta = delta
+        self.is_keyframe = is_keyframe
+        self._rows = rows
+        self._colored = colored
+        self._keyframe = delta if is_keyframe else None
+
+    def keyframe(self) -> bytes:
+        if self._keyframe is None:
+            self._keyframe = _full_screen(self._rows, self._colored)
+        return self._keyframe
+
+
+def _full_screen(rows: List[bytes], colored: bool) -> bytes:
+    body = b'\r\n'.join([row + CLEAR_EOL for row in rows])
+    return SYNC_BEGIN + CURSOR_HOME + body + CLEAR_BELOW + (RESET if colored else b'') + SYNC_END
+
+
+class FrameEncoder:
+    """
+    Turns frames (text lines plus optional per-cell colours) into
+    EncodedFrames. The encoded bytes of every row are kept, so unchanged
+    rows are never re-encoded and a keyframe is a join. Every
+    NETWORK_KEYFRAME_INTERVAL frames, and whenever the frame size or colour
+    mode changes, the delta is a keyframe.
+    """
+
+    def __init__(self, keyframe_interval: int = None):
+        self.keyframe_interval = keyframe_interval or config.NETWORK_KEYFRAME_INTERVAL
+        self.seq = 0
+        self._lines: Optional[List[str]] = None
+        self._colors: Optional[np.ndarray] = None
+        self._mode = 'none'
+        self._rows: List[bytes] = []
+        self._since_keyframe = 0
+
+    def encode(self, lines: List[str], colors: Optional[np.ndarray] = None,
+               color_mode: str = 'none') -> EncodedFrame:
+        if color_mode == 'none' or colors is None or colors.dtype != COLOR_DTYPES[color_mode]:
+            colors, color_mode = None, 'none'
+        else:
+            colors = colors[:len(lines)]
+        self.seq += 1
+        prev_lines, prev_colors = self._lines, self._colors
+        keyframe = (prev_lines is None or len(prev_lines) != len(lines) or color_mode != self._mode
+                    or (colors is not None and colors.shape != prev_colors.shape)
+                    or self._since_keyframe + 1 >= self.keyframe_interval)
+        if keyframe:
+            targets = range(len(lines))
+            self._rows = [b''] * len(lines)
+        else:
+            changed = [line != prev_lines[y] for y, line in enumerate(lines)]
+            if colors is not None:
+                changed = np.logical_or(changed, (colors != prev_colors).any(axis=1))
+            targets = np.flatnonzero(changed).tolist()
+
+        rows = list(self._rows)
+        if colors is None:
+            for y in targets:
+                rows[y] = lines[y].encode('utf-8')
+        else:
+            sgr = SGR_256.__getitem__ if color_mode == '256' else sgr_truecolor
+            for y in targets:
+                rows[y] = color_row(lines[y], colors[y], sgr).encode('utf-8')
+        self._rows, self._lines, self._colors, self._mode = rows, lines, colors, color_mode
+
+        colored = colors is not None
+        if keyframe:
+            self._since_keyframe = 0
+            return EncodedFrame(self.seq, _full_screen(rows, colored), True, rows, colored)
+        self._since_keyframe += 1
+        if targets:
+            parts = [SYNC_BEGIN]
+            for y in targets:
+                parts += (cursor_to(y, 0), rows[y], CLEAR_EOL)
+            if colored:
+                parts.append(RESET)
+            parts.append(SYNC_END)
+            delta = b''.join(parts)
+        else:
+            delta = b''
+        return EncodedFrame(self.seq, delta, False, rows, colored)
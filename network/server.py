@@ -0,0 +1,407 @@
+"""
+Real-Time ASCII Camera - Broadcast Server
+Streams the live feed to many viewers at once over plain TCP, telnet or
+WebSocket, all on one port. Each frame is encoded once and fanned out;
+slow viewers skip ahead to the newest frame instead of buffering.
+"""
+
+import asyncio
+import base64
+import hashlib
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from network.encoder import EncodedFrame, FrameEncoder, VIEWER_PREAMBLE
+from processing.telemetry import LatencyHistogram
+
+VIEWER_KINDS = ('tcp', 'telnet', 'websocket')
+
+# Telnet: IAC WILL ECHO, IAC WILL SUPPRESS-GO-AHEAD (character mode, no local echo)
+TELNET_IAC = 0xFF
+TELNET_SETUP = bytes([TELNET_IAC, 251, 1, TELNET_IAC, 251, 3])
+
+WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+def parse_address(spec: str) -> Tuple[str, int]:
+    """'PORT', ':PORT' or 'HOST:PORT' -> (host, port); the host defaults to NETWORK_HOST"""
+    host, _, port = spec.rpartition(':')
+    return host or config.NETWORK_HOST, int(port)
+
+
+def websocket_frame(payload: bytes, opcode: int = 0x2) -> bytes:
+    """One unmasked, unfragmented server -> client WebSocket frame"""
+    n = len(payload)
+    if n < 126:
+        header = bytes([0x80 | opcode, n])
+    elif n < 1 << 16:
+        header = bytes([0x80 | opcode, 126]) + n.to_bytes(2, 'big')
+    else:
+        header = bytes([0x80 | opcode, 127]) + n.to_bytes(8, 'big')
+    return header + payload
+
+
+class Viewer(asyncio.Protocol):
+    """
+    One connected viewer.
+
+    The protocol is sniffed from the first bytes the client sends: an HTTP
+    GET is a WebSocket upgrade, a telnet IAC is telnet, and silence for
+    NETWORK_SNIFF_SECONDS (e.g. netcat) is plain TCP. Frames are written
+    with transport.write, so the only buffer is the transport's own; its
+    size is the backpressure signal.
+    """
+
+    def __init__(self, server: 'BroadcastServer'):
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+        self.kind: Optional[str] = None
+        self.seq = 0            # last frame this viewer has
+        self.synced = False     # has every frame up to seq (deltas apply)
+        self.started = False    # preamble sent
+        self.frames = 0
+        self.bytes_sent = 0
+        self._inbox = b''
+        self._sniff = None
+        self._tokens = 0.0
+        self._refilled = 0.0
+        self._stalled_since: Optional[float] = None
+
+    # -- connection ---------------------------------------------------------
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if not self.server._admit(self):
+            transport.write(b'Server full\r\n')
+            transport.close()
+            return
+        loop = asyncio.get_running_loop()
+        self._refilled = loop.time()
+        self._tokens = self.server.burst_bytes
+        self._sniff = loop.call_later(config.NETWORK_SNIFF_SECONDS, self._identify, 'tcp')
+
+    def connection_lost(self, exc):
+        if self._sniff is not None:
+            self._sniff.cancel()
+        self.server._forget(self)
+
+    def data_received(self, data: bytes):
+        if self.kind is None:
+            self._inbox += data
+            if self._inbox.startswith(b'GET '):
+                self._websocket_handshake()
+            elif self._inbox[0] == TELNET_IAC:
+                self._identify('telnet')
+            elif len(self._inbox) >= 4 or not b'GET '.startswith(self._inbox):
+                self._identify('tcp')
+        elif self.kind == 'websocket':
+            self._inbox += data
+            self._websocket_control()
+        # Keystrokes and telnet negotiation replies are ignored
+
+    def _identify(self, kind: str):
+        if self.kind is not None:
+            return
+        if self._sniff is not None:
+            self._sniff.cancel()
+            self._sniff = None
+        self.kind = kind
+        self._inbox = b''
+        if kind == 'telnet':
+            self.transport.write(TELNET_SETUP)
+        self.server._ready(self)
+
+    # -- websocket ----------------------------------------------------------
+
+    def _websocket_handshake(self):
+        end = self._inbox.find(b'\r\n\r\n')
+        if end < 0:
+            if len(self._inbox) > 8192:
+                self.transport.close()
+            return
+        headers = {}
+        for line in self._inbox[:end].split(b'\r\n')[1:]:
+            name, _, value = line.partition(b':')
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get(b'sec-websocket-key')
+        if key is None or b'websocket' not in headers.get(b'upgrade', b'').lower():
+            self.transport.write(b'HTTP/1.1 426 Upgrade Required\r\nUpgrade: websocket\r\n'
+                                 b'Content-Length: 0\r\nConnection: close\r\n\r\n')
+            self.transport.close()
+            return
+        accept = base64.b64encode(hashlib.sha1(key + WEBSOCKET_GUID).digest())
+        self.transport.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                             b'Connection: Upgrade\r\nSec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+        rest = self._inbox[end + 4:]
+        self._identify('websocket')
+        self._inbox = rest
+        self._websocket_control()
+
+    def _websocket_control(self):
+        """Handle complete client frames in the inbox: answer ping and close, drop the rest"""
+        data = self._inbox
+        while len(data) >= 2:
+            opcode, n = data[0] & 0x0F, data[1] & 0x7F
+            pos = 2
+            if n == 126:
+                if len(data) < 4:
+                    break
+                n, pos = int.from_bytes(data[2:4], 'big'), 4
+            elif n == 127:
+                if len(data) < 10:
+                    break
+                n, pos = int.from_bytes(data[2:10], 'big'), 10
+            masked = data[1] & 0x80
+            end = pos + (4 if masked else 0) + n
+            if len(data) < end:
+                break
+            payload = data[end - n:end]
+            if masked:
+                mask = np.frombuffer(data[pos:pos + 4] * (n // 4 + 1), dtype=np.uint8)[:n]
+                payload = (np.frombuffer(payload, dtype=np.uint8) ^ mask).tobytes()
+            data = data[end:]
+            if opcode == 0x8:
+                self.transport.write(websocket_frame(payload[:2], 0x8))
+                self.transport.close()
+                break
+            if opcode == 0x9:
+                self.transport.write(websocket_frame(payload, 0xA))
+        self._inbox = data
+
+    # -- streaming ----------------------------------------------------------
+
+    def offer(self, frame: EncodedFrame, now: float) -> int:
+        """
+        Send what this viewer needs of a new frame: its delta when the
+        viewer is in sync, else the frame's keyframe. Nothing is queued:
+        if the socket is backed up or the bitrate cap is spent, the frame
+        is skipped and the viewer resyncs with a later keyframe. Returns
+        the bytes written.
+        """
+        server = self.server
+        if self.transport.get_write_buffer_size() > server.high_water:
+            self.synced = False
+            server.skipped += 1
+            if self._stalled_since is None:
+                self._stalled_since = now
+            elif now - self._stalled_since > config.NETWORK_STALL_SECONDS:
+                server.stalled += 1
+                self.transport.abort()
+            return 0
+        self._stalled_since = None
+
+        if server.rate_bytes:
+            self._tokens = min(server.burst_bytes, self._tokens + (now - self._refilled) * server.rate_bytes)
+            self._refilled = now
+            if self._tokens <= 0:
+                self.synced = False
+                server.skipped += 1
+                return 0
+
+        resync = not (self.synced and frame.seq == self.seq + 1) and not frame.is_keyframe
+        data = frame.keyframe() if resync else frame.delta
+        if not self.started:
+            data = VIEWER_PREAMBLE + data
+            self.started = True
+        self.seq, self.synced = frame.seq, True
+        if not data:
+            return 0
+        if self.kind == 'websocket':
+            data = websocket_frame(data)
+        self.transport.write(data)
+        self._tokens -= len(data)
+        self.frames += 1
+        self.bytes_sent += len(data)
+        if resync or frame.is_keyframe:
+            server.keyframes_sent += 1
+        else:
+            server.deltas_sent += 1
+        return len(data)
+
+
+class BroadcastServer:
+    """
+    asyncio broadcast server running on its own thread.
+
+    publish() hands the newest frame to the event loop (frames published
+    faster than the loop can send are coalesced, keeping only the newest),
+    where it is encoded once by a FrameEncoder and offered to every viewer.
+    Per viewer there is a bitrate cap (token bucket of NETWORK_MAX_KBPS,
+    NETWORK_BURST_SECONDS deep) and a high-water mark on the socket buffer;
+    either one makes the viewer skip frames and rejoin at the next
+    keyframe. Viewers that stay backed up for NETWORK_STALL_SECONDS are
+    disconnected.
+    """
+
+    def __init__(self, host: str = None, port: int = None, max_clients: int = None,
+                 max_kbps: float = None, keyframe_interval: int = None):
+        self.host = host or config.NETWORK_HOST
+        self.port = config.NETWORK_PORT if port is None else port
+        self.max_clients = max_clients or config.NETWORK_MAX_CLIENTS
+        max_kbps = config.NETWORK_MAX_KBPS if max_kbps is None else max_kbps
+        self.rate_bytes = max_kbps * 1000 / 8 if max_kbps else 0.0
+        self.burst_bytes = self.rate_bytes * config.NETWORK_BURST_SECONDS if max_kbps else float('inf')
+        self.high_water = config.NETWORK_HIGH_WATER
+        self.encoder = FrameEncoder(keyframe_interval)
+        self.viewers: Set[Viewer] = set()   # streaming (protocol identified)
+        self._pending: Set[Viewer] = set()  # connected, protocol not known yet
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._latest = None
+        self._latest_lock = threading.Lock()
+        self._scheduled = False
+        # Counters (coalesced is counted by publish(), the rest on the loop thread)
+        self.connections = 0
+        self.rejected = 0
+        self.stalled = 0
+        self.published = 0
+        self.coalesced = 0
+        self.bytes_sent = 0
+        self.deltas_sent = 0
+        self.keyframes_sent = 0
+        self.skipped = 0
+        self.encode_times = LatencyHistogram()
+        self.fanout_times = LatencyHistogram()
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def start(self):
+        """Bind and start serving; raises if the address cannot be bound"""
+        self._thread = threading.Thread(target=self._run, name="stream-server", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        """Disconnect every viewer and stop the loop"""
+        if self._loop is not None and self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._shutdown)
+            self._thread.join(2.0)
+
+    def _run(self):
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(
+                loop.create_server(lambda: Viewer(self), self.host, self.port, backlog=1024))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except BaseException as e:
+            self._error = e
+            self._started.set()
+            loop.close()
+            return
+        self._started.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def _shutdown(self):
+        self._server.close()
+        for viewer in list(self.viewers | self._pending):
+            viewer.transport.abort()
+        self._loop.stop()
+
+    # -- viewers (loop thread) ----------------------------------------------
+
+    def _admit(self, viewer: Viewer) -> bool:
+        if len(self.viewers) + len(self._pending) >= self.max_clients:
+            self.rejected += 1
+            return False
+        self.connections += 1
+        self._pending.add(viewer)
+        return True
+
+    def _ready(self, viewer: Viewer):
+        self._pending.discard(viewer)
+        self.viewers.add(viewer)
+
+    def _forget(self, viewer: Viewer):
+        self._pending.discard(viewer)
+        self.viewers.discard(viewer)
+
+    # -- frames -------------------------------------------------------------
+
+    def publish(self, lines: List[str], colors: Optional[np.ndarray] = None, color_mode: str = 'none'):
+        """Queue a frame for broadcast (any thread; never blocks on viewers)"""
+        if self._loop is None or self._error is not None:
+            return
+        # Callers reuse their line list and colour buffer, so take a snapshot
+        frame = (list(lines), None if colors is None else colors.copy(), color_mode)
+        with self._latest_lock:
+            if self._latest is not None:
+                self.coalesced += 1
+            self._latest = frame
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._broadcast)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _broadcast(self):
+        with self._latest_lock:
+            latest, self._latest = self._latest, None
+            self._scheduled = False
+        if latest is None:
+            return
+        start = time.perf_counter()
+        frame = self.encoder.encode(*latest)
+        encoded = time.perf_counter()
+        self.published += 1
+        now = self._loop.time()
+        sent = 0
+        for viewer in list(self.viewers):
+            sent += viewer.offer(frame, now)
+        self.bytes_sent += sent
+        self.encode_times.add(encoded - start)
+        self.fanout_times.add(time.perf_counter() - encoded)
+
+    # -- stats --------------------------------------------------------------
+
+    def viewer_counts(self) -> Dict[str, int]:
+        """Streaming viewers per protocol"""
+        counts = dict.fromkeys(VIEWER_KINDS, 0)
+        for viewer in list(self.viewers):
+            counts[viewer.kind] += 1
+        return counts
+
+    def stats(self) -> dict:
+        """Connection counts, traffic counters and encode/fan-out latency"""
+        return {
+            'address': f"{self.host}:{self.port}",
+            'viewers': len(self.viewers),
+            'by_kind': self.viewer_counts(),
+            'connections': self.connections,
+            'rejected': self.rejected,
+            'stalled': self.stalled,
+            'published': self.published,
+            'coalesced': self.coalesced,
+            'bytes_sent': self.bytes_sent,
+            'deltas_sent': self.deltas_sent,
+            'keyframes_sent': self.keyframes_sent,
+            'skipped': self.skipped,
+            'encode': self.encode_times.stats_ms(),
+            'fanout': self.fanout_times.stats_ms(),
+        }
+
+    def format_status(self) -> str:
+        """Short status-line item, e.g. 'net:12'"""
+        return f"net:{len(self.viewers)}"
@@ -0,0 +1,212 @@
+"""
+Real-Time ASCII Camera - Batch Conversion Engine
+Converts seekable offline sources (video files, image sequences) on a pool
+of worker processes. Each worker converts a contiguous chunk of frames and
+writes the character codes into a shared-memory block, so only chunk
+indices cross the process boundary - never pickled frame arrays.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from camera.offline import open_source
+from processing.converter import ImageConverter
+from processing.mapper import buffer_to_text
+from processing.dither import Ditherer
+from processing.modes import create_mapper
+from processing.glitch import GlitchProcessor
+
+
+class BatchJob:
+    """Everything a worker needs to convert frames of one source"""
+
+    def __init__(self, spec: str, width: int, height: int, ramp: str,
+                 enhance: bool = True, invert: bool = False, glitch: bool = False,
+                 seed: int = 0, fps: float = None, mode: str = 'ramp', calibrated: bool = None,
+                 dither: str = None):
+        self.spec = spec
+        self.width = width
+        self.height = height
+        self.ramp = ramp
+        self.enhance = enhance
+        self.invert = invert
+        self.glitch = glitch
+        self.seed = seed
+        self.fps = fps
+        self.mode = mode
+        self.calibrated = config.CALIBRATED_RAMPS if calibrated is None else calibrated
+        self.dither = dither or config.DITHER_METHOD
+
+
+class _Worker:
+    """Per-process conversion state (source handle, converter, mapper)"""
+
+    def __init__(self, job: BatchJob, source=None):
+        config.ENABLE_INVERT = job.invert
+        config.ENABLE_GLITCH = job.glitch
+        self.job = job
+        self.source = source
+        if self.source is None:
+            self.source = open_source(job.spec, fps=job.fps)
+            if not self.source.open():
+                raise RuntimeError(f"Worker could not open {job.spec}")
+        self.converter = ImageConverter()
+        self.mapper = create_mapper(job.mode, job.ramp, job.calibrated)
+        self.converter.keep_gradients = self.mapper.needs_gradients
+        self.ditherer = Ditherer(job.dither) if self.mapper.cell_samples == (1, 1) else None
+        self.glitcher = GlitchProcessor()
+        self.position = -1
+
+    def convert_frame(self, frame: np.ndarray, index: int) -> np.ndarray:
+        """Newline-terminated code buffer (see AsciiMapper.frame_buffer) for one frame"""
+        job = self.job
+        sx, sy = self.mapper.cell_samples
+        gray = self.source.preprocess(frame, job.width * sx, job.height * sy)
+        if job.enhance:
+            enhanced = self.converter.enhance_fast(gray)
+        else:
+            # enhance_fast() is where inversion normally happens
+            enhanced = cv2.bitwise_not(gray) if job.invert else gray
+        if self.ditherer is not None:
+            enhanced = self.ditherer.apply(enhanced, self.mapper.lookup)
+        if self.mapper.needs_gradients:
+            buf = self.mapper.frame_buffer(enhanced, self.converter.last_gradients if job.enhance else None)
+        else:
+            buf = self.mapper.frame_buffer(enhanced)
+        if job.glitch:
+            # Glitch randomness depends only on (seed, frame index)
+            self.glitcher.apply_codes(buf[:, :-1], GlitchProcessor.frame_rng(job.seed, index))
+        return buf
+
+    def convert_into(self, out: np.ndarray, start: int, count: int) -> int:
+        """Convert frames [start, start + count) into `out`; returns frames written"""
+        if start != self.position:
+            self.source.seek(start)
+        written = 0
+        for i in range(count):
+            ret, frame = self.source.read()
+            if not ret or frame is None:
+                break
+            out[i] = self.convert_frame(frame, start + i)
+            written += 1
+        self.position = start + written
+        return written
+
+
+def convert_sequential(job: BatchJob, source=None, max_frames: int = None) -> Iterator[List[str]]:
+    """
+    Single-process equivalent of BatchConverter.frames(); also works for
+    sources that cannot seek (raw stdin). Output is identical for the same job.
+    """
+    worker = _Worker(job, source)
+    index = 0
+    while max_frames is None or index < max_frames:
+        ret, frame = worker.source.read()
+        if not ret or frame is None:
+            break
+        yield buffer_to_text(worker.convert_frame(frame, index)).split("\n")
+        index += 1
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(job: BatchJob):
+    global _worker
+    _worker = _Worker(job)
+
+
+def _convert_chunk(shm_name: str, shape: tuple, dtype: str, start: int, count: int) -> int:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        written = _worker.convert_into(out, start, count)
+        del out
+        return written
+    finally:
+        shm.close()
+
+
+class BatchConverter:
+    """
+    Order-preserving parallel converter for seekable sources.
+
+    The source is split into chunks of `chunk_size` frames; at most
+    `2 * workers` chunks are in flight, each with its own shared-memory
+    block that is released as soon as its frames have been yielded.
+    """
+
+    def __init__(self, job: BatchJob, workers: int = None, chunk_size: int = None,
+                 max_frames: int = None):
+        self.job = job
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or config.BATCH_CHUNK_SIZE
+        mapper = create_mapper(job.mode, job.ramp, job.calibrated)
+        self.dtype = mapper.code_dtype
+        self.frame_count = self._count_frames()
+        if max_frames is not None:
+            self.frame_count = min(self.frame_count, max_frames)
+
+    def _count_frames(self) -> int:
+        source = open_source(self.job.spec, fps=self.job.fps)
+        if not source.open():
+            raise RuntimeError(f"Could not open {self.job.spec}")
+        try:
+            if not hasattr(source, 'seek') or source.frame_count is None:
+                raise ValueError(f"{self.job.spec} is not seekable; batch conversion needs a file source")
+            return source.frame_count
+        finally:
+            source.release()
+
+    def frames(self) -> Iterator[List[str]]:
+        """Yield converted frames (lists of lines) in source order"""
+        job = self.job
+        frame_shape = (job.height, job.width + 1)
+        chunks = [(start, min(self.chunk_size, self.frame_count - start))
+                  for start in range(0, self.frame_count, self.chunk_size)]
+        pending = deque()
+        next_chunk = 0
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(job,)) as pool:
+            try:
+                while pending or next_chunk < len(chunks):
+                    while next_chunk < len(chunks) and len(pending) < 2 * self.workers:
+                        start, count = chunks[next_chunk]
+                        shape = (count,) + frame_shape
+                        size = int(np.prod(shape)) * self.dtype.itemsize
+                        shm = shared_memory.SharedMemory(create=True, size=size)
+                        future = pool.submit(_convert_chunk, shm.name, shape, self.dtype.str, start, count)
+                        pending.append((shm, shape, future))
+                        next_chunk += 1
+
+                    shm, shape, future = pending.popleft()
+                    block = None
+                    try:
+                        written = future.result()
+                        block = np.ndarray(shape, dtype=self.dtype, buffer=shm.buf)
+                        for i in range(written):
+                            yield buffer_to_text(block[i]).split("\n")
+                    finally:
+                        block = None  # drop the view before closing the mapping
+                        shm.close()
+                        shm.unlink()
+                    if written < shape[0]:
+                        break  # source ended early; later chunks would be empty
+            finally:
+                for shm, _, future in pending:
+                    future.cancel()
+                for shm, _, future in pending:
+                    try:
+                        future.result()
+                    except Exception:
+                        pass
+                    shm.close()
+                    shm.unlink()
@@ -0,0 +1,120 @@
+"""
+Real-Time ASCII Camera - Ramp Calibration
+Measures how much ink each glyph of a ramp really puts on screen and builds
+a 256-entry intensity -> glyph table that is linear in perceived brightness.
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+# Bump when the measurement changes so old cache files are ignored
+CACHE_VERSION = 2
+
+# Lookup tables built this run, by (font id, ramp, gamma)
+_lookups: Dict[Tuple[str, str, float], List[str]] = {}
+
+
+def cache_dir() -> str:
+    """Directory for calibration files (CALIBRATION_CACHE_DIR or the XDG cache)"""
+    if config.CALIBRATION_CACHE_DIR:
+        return os.path.expanduser(config.CALIBRATION_CACHE_DIR)
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'asciicam')
+
+
+def _font_id(font) -> str:
+    path = getattr(font, 'path', None)
+    if isinstance(path, str):
+        return f"{os.path.basename(path)}@{getattr(font, 'size', 0)}"
+    return 'builtin'
+
+
+def measure_coverage(ramp: str, font, grid: Tuple[int, int] = (1, 1)) -> np.ndarray:
+    """
+    Ink coverage (0-1) of each ramp glyph, rasterized once at the font's
+    size. The cell is split into a (columns, rows) grid of regions; the
+    result is (len(ramp), rows * columns), regions in row-major order.
+    """
+    from rendering.atlas import GlyphAtlas
+    atlas = GlyphAtlas(font, levels=256, chars=ramp)
+    codes = np.array([[ord(ch) for ch in ramp]], dtype=np.uint32)
+    strip = atlas.render(codes).astype(np.float32) / 255.0
+    tiles = strip.reshape(atlas.cell_height, len(ramp), atlas.cell_width).transpose(1, 0, 2)
+    # Area-weighted region means, also when the cell does not divide evenly
+    return np.array([cv2.resize(tile, grid, interpolation=cv2.INTER_AREA).ravel() for tile in tiles],
+                    dtype=np.float64)
+
+
+def glyph_coverage(ramp: str, font=None, grid: Tuple[int, int] = (1, 1)) -> np.ndarray:
+    """
+    measure_coverage() with an on-disk cache per font, ramp and grid. A
+    missing or unwritable cache directory only costs the measurement.
+    """
+    if font is None:
+        from rendering.atlas import load_font
+        font = load_font(config.CALIBRATION_FONT_SIZE)
+    font_id = _font_id(font)
+    digest = hashlib.sha1(f"{CACHE_VERSION}|{font_id}|{grid}|{ramp}".encode('utf-8')).hexdigest()[:16]
+    path = os.path.join(cache_dir(), f"ramp-{digest}.json")
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        coverage = np.array(cached['coverage'])
+        if cached.get('ramp') == ramp and cached.get('font') == font_id and coverage.shape == (len(ramp), grid[0] * grid[1]):
+            return coverage
+    except (OSError, ValueError, KeyError):
+        pass
+
+    coverage = measure_coverage(ramp, font, grid)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'font': font_id, 'ramp': ramp,
+                       'coverage': coverage.tolist()}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return coverage
+
+
+def build_lookup(ramp: str, coverage: np.ndarray, gamma: float = 1.0) -> List[str]:
+    """
+    256-entry intensity -> glyph table.
+
+    Coverage is normalized to the ramp's own range, and intensity i asks
+    for coverage (i / 255) ** gamma: gray levels are gamma-encoded while ink
+    coverage is linear light, so gamma ~2.2 spreads the glyphs evenly in
+    perceived brightness. Each intensity gets the glyph of nearest coverage
+    (the first in ramp order on ties), so hand ordering does not matter.
+    """
+    coverage = np.asarray(coverage, dtype=np.float64).reshape(len(ramp), -1).mean(axis=1)
+    span = coverage.max() - coverage.min()
+    if len(ramp) < 2 or span <= 0:
+        return [ramp[0]] * 256
+    normalized = (coverage - coverage.min()) / span
+    target = (np.arange(256) / 255.0) ** gamma
+    nearest = np.abs(target[:, None] - normalized[None, :]).argmin(axis=1)
+    return [ramp[i] for i in nearest]
+
+
+def calibrated_lookup(ramp: str, font=None, gamma: float = None) -> List[str]:
+    """Calibrated 256-entry table for a ramp, memoized for the session"""
+    gamma = config.CALIBRATION_GAMMA if gamma is None else gamma
+    if font is None:
+        from rendering.atlas import load_font
+        font = load_font(config.CALIBRATION_FONT_SIZE)
+    key = (_font_id(font), ramp, gamma)
+    lookup = _lookups.get(key)
+    if lookup is None:
+        lookup = _lookups[key] = build_lookup(ramp, glyph_coverage(ramp, font), gamma)
+    return lookup
@@ -0,0 +1,97 @@
+"""
+Real-Time ASCII Camera - Colour Quantization
+Turns the grid-sized BGR frame into one colour per cell: an xterm-256
+palette index or a packed 24-bit truecolour value.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+COLOR_MODES = ('none', '256', 'truecolor')
+# dtype ColorQuantizer produces per mode; renderers drop colour arrays that
+# do not match (e.g. frames queued before the mode was switched)
+COLOR_DTYPES = {'256': np.uint8, 'truecolor': np.uint32}
+
+# Channel levels of the 6x6x6 colour cube (indices 16-231)
+CUBE_LEVELS = np.array([0, 95, 135, 175, 215, 255], dtype=np.int32)
+
+# 256-colour lookups are done on 5-bit channels through one 32x32x32 table
+_LUT_BITS = 5
+_xterm_lut: Optional[np.ndarray] = None
+
+
+def xterm_palette() -> np.ndarray:
+    """(256, 3) RGB values of the xterm-256 palette"""
+    system = [(0, 0, 0), (128, 0, 0), (0, 128, 0), (128, 128, 0), (0, 0, 128), (128, 0, 128),
+              (0, 128, 128), (192, 192, 192), (128, 128, 128), (255, 0, 0), (0, 255, 0),
+              (255, 255, 0), (0, 0, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255)]
+    r, g, b = np.meshgrid(CUBE_LEVELS, CUBE_LEVELS, CUBE_LEVELS, indexing='ij')
+    cube = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+    grays = np.repeat((8 + 10 * np.arange(24, dtype=np.int32))[:, None], 3, axis=1)
+    return np.concatenate([np.array(system, dtype=np.int32), cube, grays])
+
+
+def nearest_colors(rgb: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """Index of the nearest palette entry (squared RGB distance) for each row of rgb"""
+    out = np.empty(len(rgb), dtype=np.intp)
+    for i in range(0, len(rgb), 4096):  # bounded temporaries
+        block = rgb[i:i + 4096, None, :].astype(np.int32)
+        out[i:i + 4096] = ((block - palette[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    return out
+
+
+def _xterm_table() -> np.ndarray:
+    """Flat 5-bit BGR -> xterm index table, built on first use"""
+    global _xterm_lut
+    if _xterm_lut is None:
+        step = 1 << (8 - _LUT_BITS)
+        centres = np.arange(1 << _LUT_BITS, dtype=np.int32) * step + step // 2
+        b, g, r = np.meshgrid(centres, centres, centres, indexing='ij')
+        rgb = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+        # Only the cube and the gray ramp: the 16 system colours are
+        # commonly redefined by terminal themes
+        palette = xterm_palette()
+        _xterm_lut = (nearest_colors(rgb, palette[16:]) + 16).astype(np.uint8)
+    return _xterm_lut
+
+
+def reduce_palette(colors: int) -> np.ndarray:
+    """256-entry table mapping xterm indices to the nearest of the first `colors`"""
+    if colors >= 256:
+        return np.arange(256, dtype=np.uint8)
+    palette = xterm_palette()
+    return nearest_colors(palette, palette[:colors]).astype(np.uint8)
+
+
+class ColorQuantizer:
+    """
+    Per-cell colours for a frame, vectorized over the whole grid.
+
+    '256' mode yields a uint8 array of xterm palette indices (one table
+    gather on 5-bit channels); 'truecolor' yields uint32 0xRRGGBB values
+    with the low COLOR_TRUECOLOR_DROP_BITS of each channel cleared, which
+    lengthens runs of equal colour and so shortens the escape stream.
+    """
+
+    def __init__(self, mode: str = '256'):
+        if mode not in COLOR_MODES[1:]:
+            raise ValueError(f"Unknown colour mode: {mode}")
+        self.mode = mode
+        self._mask = (0xFF << config.COLOR_TRUECOLOR_DROP_BITS) & 0xFF
+        self._table = _xterm_table() if mode == '256' else None
+
+    def quantize(self, bgr: np.ndarray) -> np.ndarray:
+        """(h, w) colour array for a (h, w, 3) BGR frame; a new array each call"""
+        if self.mode == '256':
+            shift = 8 - _LUT_BITS
+            q = bgr >> shift
+            index = (q[..., 0].astype(np.uint16) << (2 * _LUT_BITS)) | (q[..., 1].astype(np.uint16) << _LUT_BITS) | q[..., 2]
+            return self._table[index]
+        masked = bgr & self._mask
+        return (masked[..., 2].astype(np.uint32) << 16) | (masked[..., 1].astype(np.uint32) << 8) | masked[..., 0]
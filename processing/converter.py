@@ -11,6 +11,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 
+# Max per-pixel difference between enhance_fast() and enhance()
+ENHANCE_FAST_TOLERANCE = 3
+
 
 class ImageConverter:
     """Processes grayscale images for optimal ASCII conversion"""
@@ -21,6 +24,35 @@ class ImageConverter:
             clipLimit=config.CLAHE_CLIP_LIMIT,
             tileGridSize=config.CLAHE_TILE_SIZE
         )
+        # Brightness/contrast folded into one table for enhance_fast
+        self._tone_lut = self._build_tone_lut()
+        self._scratch = None
+        # Per-instance quality knobs (lowered by the QualityGovernor)
+        self.edge_blend = True
+        self.clahe_interval = 1
+        self._clahe_frame = 0
+        self._clahe_lut = None
+        self._band_clahes = {}
+        self._band_scratch = None
+        # Keep the Sobel gradients for the mapper (StructureMapper) even
+        # when they are not blended in; see last_gradients
+        self.keep_gradients = False
+        self.last_gradients = None
+    
+    def _build_tone_lut(self) -> np.ndarray:
+        """256-entry table equivalent to the float brightness/contrast step"""
+        values = np.arange(256, dtype=np.float32)
+        if hasattr(config, 'CONTRAST_BOOST'):
+            values = values * config.CONTRAST_BOOST
+        if hasattr(config, 'BRIGHTNESS_BOOST'):
+            values = values + config.BRIGHTNESS_BOOST
+        return np.clip(values, 0, 255).astype(np.uint8)
+    
+    def _scratch_for(self, shape: tuple) -> '_Scratch':
+        """Scratch buffers for this frame shape, reallocated only on resize"""
+        if self._scratch is None or self._scratch.shape != shape:
+            self._scratch = _Scratch(shape)
+        return self._scratch
     
     def enhance(self, gray: np.ndarray) -> np.ndarray:
         """
@@ -53,6 +85,137 @@ class ImageConverter:
         
         return result
     
+    def enhance_fast(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Allocation-free version of enhance().
+        
+        Brightness/contrast is a single cv2.LUT, edges come from int16 Sobel
+        with an alpha-max-plus-beta-min magnitude, and every intermediate
+        lives in scratch buffers that are reused while the frame shape stays
+        the same. Output matches enhance() to within ENHANCE_FAST_TOLERANCE
+        grey levels (the magnitude approximation is within ~7% and only
+        contributes EDGE_BLEND_ALPHA of the result).
+        
+        The returned array is owned by the converter and overwritten by the
+        next call. With keep_gradients set, last_gradients holds this frame's
+        (gx, gy, magnitude), also scratch buffers.
+        """
+        s = self._scratch_for(gray.shape)
+        
+        result = cv2.LUT(gray, self._tone_lut, dst=s.adjusted)
+        
+        if config.ENABLE_CLAHE:
+            result = self._equalize(result, s)
+        
+        blend = config.ENABLE_EDGE_BLEND and self.edge_blend
+        if blend or self.keep_gradients:
+            edges = self._detect_edges_fast(result, s)
+            self.last_gradients = (s.grad_x, s.grad_y, edges) if self.keep_gradients else None
+        if blend:
+            alpha = config.EDGE_BLEND_ALPHA
+            result = cv2.addWeighted(result, 1 - alpha, edges, alpha, 0, dst=s.out)
+        
+        if config.ENABLE_INVERT:
+            result = cv2.bitwise_not(result, dst=s.out)
+        
+        return result
+    
+    def clahe_tile_height(self, shape: tuple) -> int:
+        """Rows per CLAHE tile for a frame of this shape, as OpenCV lays it out"""
+        h, w = shape
+        tiles_x, tiles_y = config.CLAHE_TILE_SIZE
+        if h % tiles_y or w % tiles_x:
+            h += tiles_y - h % tiles_y  # OpenCV pads both axes when either is uneven
+        return h // tiles_y
+    
+    def enhance_rows(self, gray: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """
+        Rows [start, stop) of enhance_fast(gray), computed from a band around them.
+        
+        A pixel's CLAHE mapping blends the histograms of its neighbouring
+        tiles, so the band covers whole tiles with one tile of context on
+        either side, padded the way OpenCV pads the full frame. The rows
+        returned match a full-frame enhance_fast() to within two grey
+        levels: CLAHE's interpolation weights round differently in the band
+        (one level), and the edge blend can carry that into a neighbour's
+        gradient (one more).
+        Ignores clahe_interval. Returns a new array.
+        """
+        h, w = gray.shape
+        if config.ENABLE_CLAHE:
+            tiles_x, tiles_y = config.CLAHE_TILE_SIZE
+            tile_h = self.clahe_tile_height(gray.shape)
+            t0 = max(start // tile_h - 1, 0)
+            t1 = min(-(-stop // tile_h) + 1, tiles_y)
+            top, bottom = t0 * tile_h, min(t1 * tile_h, h)
+            band = cv2.LUT(gray[top:bottom], self._tone_lut)
+            pad_right = tiles_x - w % tiles_x if (h % tiles_y or w % tiles_x) else 0
+            pad_bottom = (t1 - t0) * tile_h - (bottom - top)
+            if pad_right or pad_bottom:
+                band = cv2.copyMakeBorder(band, 0, pad_bottom, 0, pad_right, cv2.BORDER_REFLECT_101)
+            result = self._band_clahe(t1 - t0).apply(band)[:bottom - top, :w]
+        else:
+            top, bottom = max(start - 1, 0), min(stop + 1, h)
+            result = cv2.LUT(gray[top:bottom], self._tone_lut)
+        
+        if config.ENABLE_EDGE_BLEND and self.edge_blend:
+            if self._band_scratch is None or self._band_scratch.shape != result.shape:
+                self._band_scratch = _Scratch(result.shape)
+            edges = self._detect_edges_fast(result, self._band_scratch)
+            alpha = config.EDGE_BLEND_ALPHA
+            result = cv2.addWeighted(result, 1 - alpha, edges, alpha, 0)
+        
+        if config.ENABLE_INVERT:
+            result = cv2.bitwise_not(result)
+        
+        return result[start - top:stop - top]
+    
+    def _band_clahe(self, tile_rows: int):
+        """CLAHE with the frame's tile width for a band `tile_rows` tiles tall"""
+        clahe = self._band_clahes.get(tile_rows)
+        if clahe is None:
+            clahe = self._band_clahes[tile_rows] = cv2.createCLAHE(
+                clipLimit=config.CLAHE_CLIP_LIMIT,
+                tileGridSize=(config.CLAHE_TILE_SIZE[0], tile_rows))
+        return clahe
+    
+    def _equalize(self, adjusted: np.ndarray, s: '_Scratch') -> np.ndarray:
+        """
+        CLAHE, run only every clahe_interval frames. In between, the last
+        CLAHE result's global tone curve (mean output per input level) is
+        applied with a LUT, so contrast stays steady without the tile work.
+        """
+        if self.clahe_interval <= 1:
+            self._clahe_lut = None
+            return self.clahe.apply(adjusted, dst=s.equalized)
+        self._clahe_frame += 1
+        if self._clahe_lut is not None and self._clahe_frame % self.clahe_interval:
+            return cv2.LUT(adjusted, self._clahe_lut, dst=s.equalized)
+        result = self.clahe.apply(adjusted, dst=s.equalized)
+        self._clahe_lut = self._tone_curve(adjusted, result)
+        return result
+    
+    @staticmethod
+    def _tone_curve(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        """256-entry LUT approximating the src -> dst mapping"""
+        counts = np.bincount(src.ravel(), minlength=256)
+        sums = np.bincount(src.ravel(), weights=dst.ravel(), minlength=256)
+        seen = np.flatnonzero(counts)
+        if seen.size == 0:
+            return np.arange(256, dtype=np.uint8)
+        curve = np.interp(np.arange(256), seen, sums[seen] / counts[seen])
+        return np.clip(np.rint(curve), 0, 255).astype(np.uint8)
+    
+    def _detect_edges_fast(self, gray: np.ndarray, s: '_Scratch') -> np.ndarray:
+        """Approximate Sobel magnitude: max(|gx|,|gy|) + 3/8 * min(|gx|,|gy|)"""
+        cv2.Sobel(gray, cv2.CV_16S, 1, 0, dst=s.grad_x, ksize=3)
+        cv2.Sobel(gray, cv2.CV_16S, 0, 1, dst=s.grad_y, ksize=3)
+        cv2.convertScaleAbs(s.grad_x, dst=s.abs_x)
+        cv2.convertScaleAbs(s.grad_y, dst=s.abs_y)
+        cv2.max(s.abs_x, s.abs_y, dst=s.hi)
+        cv2.min(s.abs_x, s.abs_y, dst=s.lo)
+        return cv2.addWeighted(s.hi, 1.0, s.lo, 0.375, 0, dst=s.edges)
+    
     def _detect_edges(self, gray: np.ndarray) -> np.ndarray:
         """Detect edges using Sobel operator"""
         grad_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
@@ -60,3 +223,20 @@ class ImageConverter:
         magnitude = np.sqrt(grad_x**2 + grad_y**2)
         magnitude = np.clip(magnitude, 0, 255).astype(np.uint8)
         return magnitude
+
+
+class _Scratch:
+    """Preallocated intermediates for ImageConverter.enhance_fast"""
+    
+    def __init__(self, shape: tuple):
+        self.shape = shape
+        self.adjusted = np.empty(shape, np.uint8)
+        self.equalized = np.empty(shape, np.uint8)
+        self.grad_x = np.empty(shape, np.int16)
+        self.grad_y = np.empty(shape, np.int16)
+        self.abs_x = np.empty(shape, np.uint8)
+        self.abs_y = np.empty(shape, np.uint8)
+        self.hi = np.empty(shape, np.uint8)
+        self.lo = np.empty(shape, np.uint8)
+        self.edges = np.empty(shape, np.uint8)
+        self.out = np.empty(shape, np.uint8)
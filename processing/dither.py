@@ -0,0 +1,163 @@
+"""
+Real-Time ASCII Camera - Dithering
+Spreads the quantization error of short ramps over neighbouring cells so
+smooth gradients come out as a mix of glyphs instead of flat bands.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+DITHER_METHODS = ('auto', 'none', 'bayer', 'blue-noise', 'floyd-steinberg')
+
+# 8x8 Bayer index matrix, built recursively from the 2x2 one
+_BAYER = np.array([[0, 2], [3, 1]])
+for _ in range(2):
+    _BAYER = np.block([[4 * _BAYER, 4 * _BAYER + 2], [4 * _BAYER + 3, 4 * _BAYER + 1]])
+BAYER_8X8 = (_BAYER + 0.5) / _BAYER.size  # thresholds in (0, 1)
+
+_blue_noise: Optional[np.ndarray] = None
+
+
+def blue_noise(size: int = 64, seed: int = 0) -> np.ndarray:
+    """
+    (size, size) tileable thresholds in (0, 1) with mostly high-frequency
+    energy: white noise with its low frequencies removed (Gaussian high-pass
+    in the Fourier domain, so it tiles seamlessly), then ranked so every
+    level is equally likely; three passes. A cheap stand-in for
+    void-and-cluster, generated once per process.
+    """
+    global _blue_noise
+    if _blue_noise is None or _blue_noise.shape != (size, size):
+        freq = np.fft.fftfreq(size)
+        radius2 = freq[:, None] ** 2 + freq[None, :] ** 2
+        highpass = 1.0 - np.exp(-radius2 / (2 * 0.15 ** 2))
+        noise = np.random.default_rng(seed).random((size, size))
+        for _ in range(3):
+            noise = np.fft.ifft2(np.fft.fft2(noise) * highpass).real
+            noise = (noise.argsort(axis=None).argsort().reshape(size, size) + 0.5) / noise.size
+        _blue_noise = noise
+    return _blue_noise
+
+
+def bin_step(widths: Sequence[int]) -> float:
+    """
+    Typical quantization step of a lookup with these bin widths: the width
+    of the bin an average gray level falls in, weighting each bin by its
+    width. The end bins (black and white, which calibration widens to the
+    darkest and brightest glyphs) are left out when there are others.
+    """
+    if len(widths) > 2:
+        widths = widths[1:-1]
+    return sum(w * w for w in widths) / sum(widths)
+
+
+def default_method(step: float) -> str:
+    """Cheapest method that hides the banding of a lookup whose bins are `step` gray levels wide (see bin_step)"""
+    for max_step, method in config.DITHER_BY_BIN_WIDTH:
+        if step <= max_step:
+            return method
+    return 'floyd-steinberg'
+
+
+class Ditherer:
+    """
+    Dithers enhanced gray frames against a mapper's 256-entry lookup.
+
+    The lookup's runs of equal glyphs are the quantization bins. Ordered
+    methods (Bayer, blue noise) add a tiled threshold offset of up to half
+    a bin either way, scaled per pixel by the width of its bin, so the
+    mapper's own quantization does the rest: one table lookup, one add.
+    Floyd-Steinberg snaps each pixel to its bin's centre and pushes the
+    error right and down (7/16, 3/16, 5/16, 1/16). Pixel (y, x) only
+    depends on earlier pixels of its row and the row above, so all pixels
+    with equal x + 2y are processed together, one skewed wavefront of
+    vector operations per step instead of a loop per pixel (still far
+    slower than the ordered methods; see benchmarks/bench_dither.py).
+    """
+
+    def __init__(self, method: str = None):
+        self.method = method or config.DITHER_METHOD
+        if self.method not in DITHER_METHODS:
+            raise ValueError(f"Unknown dither method: {self.method}")
+        self.active = 'none'
+        self._lookup: Optional[Sequence[str]] = None
+        self._offsets = None      # ordered: tiled thresholds - 0.5
+        self._width = None        # ordered: bin width per gray level
+        self._centre = None       # error diffusion: bin centre per gray level
+        self._fronts = None       # error diffusion: (shape, flat indices per wavefront)
+
+    def prepare(self, lookup: Sequence[str]):
+        """Rebuild the bin tables for a new mapper lookup (no-op if unchanged)"""
+        if lookup is self._lookup:
+            return
+        self._lookup = lookup
+        bounds = [0] + [i for i in range(1, 256) if lookup[i] != lookup[i - 1]] + [256]
+        widths = [stop - start for start, stop in zip(bounds, bounds[1:])]
+        self.active = default_method(bin_step(widths)) if self.method == 'auto' else self.method
+        width = np.empty(256, dtype=np.float32)
+        centre = np.empty(256, dtype=np.float32)
+        for start, stop in zip(bounds, bounds[1:]):
+            width[start:stop] = stop - start
+            centre[start:stop] = (start + stop - 1) / 2.0
+        self._width, self._centre = width, centre
+        self._offsets = None
+
+    def apply(self, gray: np.ndarray, lookup: Sequence[str]) -> np.ndarray:
+        """Dithered copy of a uint8 frame (the frame itself when 'none')"""
+        self.prepare(lookup)
+        if self.active == 'none':
+            return gray
+        if self.active == 'floyd-steinberg':
+            return self._error_diffusion(gray)
+        return self._ordered(gray)
+
+    def _ordered(self, gray: np.ndarray) -> np.ndarray:
+        h, w = gray.shape
+        if self._offsets is None or self._offsets.shape != (h, w):
+            tile = BAYER_8X8 if self.active == 'bayer' else blue_noise()
+            reps = (-(-h // tile.shape[0]), -(-w // tile.shape[1]))
+            self._offsets = (np.tile(tile, reps)[:h, :w] - 0.5).astype(np.float32)
+        out = gray + self._offsets * self._width[gray]
+        return np.clip(out, 0, 255, out=out).astype(np.uint8)
+
+    def _wavefronts(self, shape) -> List[np.ndarray]:
+        """Flat indices into the padded error frame, one array per wavefront"""
+        if self._fronts is None or self._fronts[0] != shape:
+            h, w = shape
+            stride = w + 2
+            ys, xs = np.mgrid[0:h, 0:w]
+            order = (xs + 2 * ys).ravel()
+            flat = (ys * stride + xs + 1).ravel()
+            sort = np.argsort(order, kind='stable')
+            splits = np.flatnonzero(np.diff(order[sort])) + 1
+            self._fronts = (shape, np.split(flat[sort], splits))
+        return self._fronts[1]
+
+    def _error_diffusion(self, gray: np.ndarray) -> np.ndarray:
+        h, w = gray.shape
+        stride = w + 2
+        # One column of padding each side and a row below absorb the
+        # error pushed off the frame
+        work = np.zeros((h + 1, stride), dtype=np.float32)
+        work[:h, 1:-1] = gray
+        work = work.ravel()
+        out = np.zeros_like(work)
+        centre = self._centre
+        for front in self._wavefronts((h, w)):
+            value = work[front]
+            level = centre[np.clip(value, 0, 255).astype(np.intp)]
+            out[front] = level
+            error = value - level
+            # Separate statements: within one wavefront each target is hit
+            # at most once per direction, but not across directions
+            work[front + 1] += error * (7 / 16)
+            work[front + stride - 1] += error * (3 / 16)
+            work[front + stride] += error * (5 / 16)
+            work[front + stride + 1] += error * (1 / 16)
+        return out.reshape(h + 1, stride)[:h, 1:-1].astype(np.uint8)
@@ -0,0 +1,102 @@
+"""
+Real-Time ASCII Camera - Dot Mappers
+High-density output: 2x4 pixels per cell as Unicode braille, or 1x2 pixels
+per cell as half blocks, with each pixel thresholded or ordered-dithered.
+"""
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from processing.dither import BAYER_8X8, blue_noise
+from processing.mapper import AsciiMapper
+
+DOT_DITHERS = ('bayer', 'blue-noise', 'threshold')
+
+
+class DotMapper(AsciiMapper):
+    """
+    Packs cell_samples pixels per cell into one glyph.
+
+    Each pixel is lit when it is above its threshold: DOTS_THRESHOLD, or
+    a tiled ordered-dither matrix (Bayer or blue noise, see DOTS_DITHER).
+    The lit bits of a cell are OR-ed together with bit_weights (one
+    shifted slice per pixel position) and a table turns the mask into a
+    code point. The ramp is not used.
+    """
+
+    # (rows, columns) bit value of each pixel position in a cell, matching
+    # cell_samples; glyphs[mask] is the character for a mask
+    cell_samples = (1, 1)
+    bit_weights = np.array([[1]], dtype=np.uint8)
+    glyphs = " █"
+
+    def _build_code_lut(self):
+        super()._build_code_lut()
+        self._is_ascii = False
+        self._code_lut = self._code_lut.astype(np.uint32)
+        self._newline = np.uint32(ord('\n'))
+        self._dot_lut = np.array([ord(ch) for ch in self.glyphs], dtype=np.uint32)
+        self._thresholds = None
+
+    def _threshold_map(self, shape) -> np.ndarray:
+        """Per-pixel thresholds for a frame of this shape (cached)"""
+        if self._thresholds is None or self._thresholds.shape != shape:
+            if config.DOTS_DITHER in ('bayer', 'blue-noise'):
+                # Lit fraction of a flat area ~ its level; with calibration
+                # that fraction is matched in linear light
+                level = BAYER_8X8 if config.DOTS_DITHER == 'bayer' else blue_noise()
+                if self.calibrated:
+                    level = level ** (1.0 / config.CALIBRATION_GAMMA)
+                tile = np.floor(level * 255.0).astype(np.uint8)
+                reps = (-(-shape[0] // tile.shape[0]), -(-shape[1] // tile.shape[1]))
+                self._thresholds = np.ascontiguousarray(np.tile(tile, reps)[:shape[0], :shape[1]])
+            else:
+                self._thresholds = np.full(shape, config.DOTS_THRESHOLD, dtype=np.uint8)
+        return self._thresholds
+
+    def frame_buffer(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Like AsciiMapper.frame_buffer for a frame sampled at cell_samples
+        per cell: the result has one code per cell.
+        """
+        sy, sx = self.bit_weights.shape
+        h, w = gray.shape[0] // sy, gray.shape[1] // sx
+        gray = gray[:h * sy, :w * sx]
+        lit = (gray > self._threshold_map(gray.shape)).view(np.uint8)
+
+        mask = np.zeros((h, w), dtype=np.uint8)
+        for i in range(sy):
+            for j in range(sx):
+                mask |= lit[i::sy, j::sx] * self.bit_weights[i, j]
+
+        buf = self._frame_buf
+        if buf is None or buf.shape != (h, w + 1):
+            buf = np.empty((h, w + 1), dtype=np.uint32)
+            buf[:, w] = self._newline
+            self._frame_buf = buf
+        np.take(self._dot_lut, mask, out=buf[:, :w])
+        return buf
+
+
+class BrailleMapper(DotMapper):
+    """2x4 pixels per cell as braille patterns (U+2800 + dot bits)"""
+
+    cell_samples = (2, 4)
+    # Dots 1-3 and 7 down the left column, 4-6 and 8 down the right
+    bit_weights = np.array([[0x01, 0x08],
+                            [0x02, 0x10],
+                            [0x04, 0x20],
+                            [0x40, 0x80]], dtype=np.uint8)
+    glyphs = ''.join(chr(0x2800 + bits) for bits in range(256))
+
+
+class HalfBlockMapper(DotMapper):
+    """1x2 pixels per cell as upper/lower half blocks"""
+
+    cell_samples = (1, 2)
+    bit_weights = np.array([[1],
+                            [2]], dtype=np.uint8)
+    glyphs = " ▀▄█"
@@ -3,49 +3,102 @@ Real-Time ASCII Camera - Glitch Processor
 Adds "cyberpunk" digital noise and character shifts.
 """
 
-import random
 import numpy as np
 from typing import List
 import config
 
+NOISE_CHARS = "!@#$%^&*()_+{}[]|\\<>?"
+
+
 class GlitchProcessor:
-    """Applies digital glitch effects to ASCII frames"""
-    
+    """
+    Applies digital glitch effects to ASCII frames.
+
+    Effects work on the (rows, cols) array of character codes before it is
+    turned into text, so each one costs a few array operations per frame
+    rather than Python work per character:
+      - row shifts: rows picked by one random mask are rolled sideways
+      - noise: one boolean mask scatters noise glyphs over the picked rows
+      - block displacement: a rectangle is copied sideways
+      - scanline tearing: a band of rows is rolled by the same offset
+    """
+
     def __init__(self):
         self.intensity = config.GLITCH_INTENSITY
         self.max_shift = config.GLITCH_MAX_SHIFT
+        self.block_chance = config.GLITCH_BLOCK_CHANCE
+        self.tear_chance = config.GLITCH_TEAR_CHANCE
+        self._noise = np.array([ord(ch) for ch in NOISE_CHARS], dtype=np.uint32)
+        self._rng = np.random.default_rng()
+        self._cols = np.arange(0)
+
+    def _columns(self, cols: int) -> np.ndarray:
+        if self._cols.size != cols:
+            self._cols = np.arange(cols)
+        return self._cols
+
+    @staticmethod
+    def frame_rng(seed: int, index: int) -> np.random.Generator:
+        """Deterministic generator for frame `index` of a run seeded with `seed`"""
+        return np.random.default_rng([seed & 0xFFFFFFFF, index])
+
+    def apply_codes(self, codes: np.ndarray, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Glitch a (rows, cols) code array in place and return it.
+        Pass a seeded generator (see frame_rng) for reproducible output.
+        """
+        rows, cols = codes.shape
+        if not config.ENABLE_GLITCH or rows == 0 or cols == 0:
+            return codes
+        rng = rng if rng is not None else self._rng
 
-    def apply(self, frames: List[str]) -> List[str]:
-        """Apply glitch effects to a list of ASCII lines"""
+        # One draw per row for each row effect, plus one per frame effect
+        draws = rng.random(2 * rows + 2)
+
+        # 1. Random horizontal shift of individual rows
+        shifted = (draws[:rows] < self.intensity).nonzero()[0]
+        if shifted.size:
+            shifts = rng.integers(-self.max_shift, self.max_shift + 1, shifted.size)
+            src = (self._columns(cols) - shifts[:, None]) % cols
+            codes[shifted] = codes[shifted[:, None], src]
+
+        # 2. Character noise (digital static) on a few rows
+        noisy = (draws[rows:2 * rows] < self.intensity * 0.5).nonzero()[0]
+        if noisy.size:
+            mask = rng.random((noisy.size, cols)) < 0.02  # 2% per-character noise
+            ys, xs = mask.nonzero()
+            if ys.size:
+                codes[noisy[ys], xs] = self._noise[rng.integers(0, self._noise.size, ys.size)]
+
+        # 3. Block displacement: a rectangle slides sideways
+        if draws[-2] < self.block_chance:
+            h = int(rng.integers(1, max(rows // 4, 1) + 1))
+            w = int(rng.integers(1, max(cols // 3, 1) + 1))
+            y, x = int(rng.integers(0, rows - h + 1)), int(rng.integers(0, cols - w + 1))
+            dx = int(rng.integers(-self.max_shift * 2, self.max_shift * 2 + 1))
+            x2 = min(max(x + dx, 0), cols - w)
+            codes[y:y + h, x2:x2 + w] = codes[y:y + h, x:x + w].copy()
+
+        # 4. Scanline tearing: a band of rows offset together
+        if draws[-1] < self.tear_chance:
+            y = int(rng.integers(0, rows))
+            h = int(rng.integers(1, max(rows // 6, 1) + 1))
+            offset = int(rng.integers(1, self.max_shift * 3 + 1)) * (1 if rng.random() < 0.5 else -1)
+            codes[y:y + h] = np.roll(codes[y:y + h], offset, axis=1)
+
+        return codes
+
+    def apply(self, frames: List[str], rng: np.random.Generator = None) -> List[str]:
+        """
+        Apply glitch effects to a list of ASCII lines (padded to equal length).
+        Pass a seeded generator as `rng` for reproducible output.
+        """
         if not config.ENABLE_GLITCH or not frames:
             return frames
-            
-        glitched_frames = []
-        for line in frames:
-            # 1. Random horizontal shift
-            if random.random() < self.intensity:
-                shift = random.randint(-self.max_shift, self.max_shift)
-                line = self._shift_line(line, shift)
-            
-            # 2. Character noise (digital static)
-            if random.random() < self.intensity * 0.5:
-                line = self._add_noise(line)
-                
-            glitched_frames.append(line)
-            
-        return glitched_frames
-
-    def _shift_line(self, line: str, shift: int) -> str:
-        """Cyclically shift a string"""
-        if not line: return line
-        shift = shift % len(line)
-        return line[-shift:] + line[:-shift]
-
-    def _add_noise(self, line: str) -> str:
-        """Replace some characters with high-density noise"""
-        chars = list(line)
-        noise_chars = "!@#$%^&*()_+{}[]|\\<>?"
-        for i in range(len(chars)):
-            if random.random() < 0.02: # 2% per-character noise
-                chars[i] = random.choice(noise_chars)
-        return "".join(chars)
+        width = max(len(line) for line in frames)
+        if width == 0:
+            return frames
+        codes = np.array(frames, dtype=f'<U{width}').view(np.uint32).reshape(len(frames), width).copy()
+        codes[codes == 0] = ord(' ')
+        self.apply_codes(codes, rng)
+        return codes.view(f'<U{width}').reshape(len(frames)).tolist()
@@ -0,0 +1,125 @@
+"""
+Real-Time ASCII Camera - Quality Governor
+Watches how long each frame takes to produce and steps image quality down
+when the frame budget is blown, and back up when there is headroom.
+"""
+
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+
+class QualityLevel(NamedTuple):
+    """One rung of the quality ladder"""
+    name: str
+    edge_blend: bool       # Sobel edge blend in ImageConverter
+    interpolation: int     # resize interpolation used by the camera's FramePlan
+    clahe_interval: int    # run CLAHE every Nth frame (reuse its tone curve between)
+    row_step: int          # sample every Nth text row and repeat it on screen
+
+
+# Cheapest savings first: each level keeps everything the previous one
+# dropped and gives up one more thing.
+LEVELS = (
+    QualityLevel('full', True, cv2.INTER_AREA, 1, 1),
+    QualityLevel('no-edges', False, cv2.INTER_AREA, 1, 1),
+    QualityLevel('linear', False, cv2.INTER_LINEAR, 1, 1),
+    QualityLevel('clahe/2', False, cv2.INTER_LINEAR, 2, 1),
+    QualityLevel('half-rows', False, cv2.INTER_LINEAR, 2, 2),
+)
+
+
+class QualityGovernor:
+    """
+    Picks a QualityLevel from measured per-frame work time.
+
+    Work time is an exponential moving average of the seconds spent
+    producing a frame (preprocess, enhance, map, glitch and render; not
+    the wait for the camera). Quality steps down after GOVERNOR_DOWN_FRAMES
+    consecutive frames over GOVERNOR_DOWN_RATIO of the frame budget, and
+    steps up only after GOVERNOR_UP_FRAMES frames under GOVERNOR_UP_RATIO.
+    The gap between the two ratios, the longer wait to step up and a
+    cool-down after every change keep it from oscillating.
+    """
+
+    def __init__(self, target_fps: float = None, enabled: bool = True):
+        self.enabled = enabled
+        self.budget = 1.0 / (target_fps or config.TARGET_FPS)
+        self.level = 0
+        self.average = 0.0
+        self._over = 0
+        self._under = 0
+        self._cooldown = 0
+
+    @property
+    def quality(self) -> QualityLevel:
+        return LEVELS[self.level]
+
+    def update(self, work_seconds: float) -> bool:
+        """Feed one frame's work time; returns True if the level changed"""
+        if not self.enabled:
+            return False
+        alpha = config.GOVERNOR_SMOOTHING
+        self.average = work_seconds if self.average == 0.0 else self.average + alpha * (work_seconds - self.average)
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return False
+
+        if self.average > self.budget * config.GOVERNOR_DOWN_RATIO:
+            self._over += 1
+            self._under = 0
+        elif self.average < self.budget * config.GOVERNOR_UP_RATIO:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= config.GOVERNOR_DOWN_FRAMES and self.level < len(LEVELS) - 1:
+            return self._step(1)
+        if self._under >= config.GOVERNOR_UP_FRAMES and self.level > 0:
+            return self._step(-1)
+        return False
+
+    def _step(self, direction: int) -> bool:
+        self.level += direction
+        self._over = self._under = 0
+        self._cooldown = config.GOVERNOR_COOLDOWN_FRAMES
+        return True
+
+    def apply(self, converter, camera):
+        """Push the current level's settings into the converter and camera"""
+        quality = self.quality
+        converter.edge_blend = quality.edge_blend
+        converter.clahe_interval = quality.clahe_interval
+        camera.interpolation = quality.interpolation
+
+    def capture_height(self, rows: int) -> int:
+        """Rows to sample for a grid of `rows` text rows"""
+        return max(1, rows // self.quality.row_step)
+
+    def expand_rows(self, lines, rows: int):
+        """
+        Repeat sampled rows (text lines or a per-cell array) to fill `rows`
+        rows again. Goes by the frame's own row count, so frames produced
+        before a level change still come out the right height.
+        """
+        if lines is None or len(lines) == 0 or len(lines) >= rows:
+            return lines
+        step = -(-rows // len(lines))
+        if isinstance(lines, np.ndarray):
+            return np.repeat(lines, step, axis=0)[:rows]
+        return [line for line in lines for _ in range(step)][:rows]
+
+    def format_status(self) -> str:
+        """Short status-line item, e.g. 'Q0' or 'Q2:linear'"""
+        if not self.enabled:
+            return "Q:fixed"
+        if self.level == 0:
+            return "Q0"
+        return f"Q{self.level}:{self.quality.name}"
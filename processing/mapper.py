@@ -4,24 +4,56 @@ Converts pixel intensity values to ASCII characters.
 """
 
 import numpy as np
-from typing import List
+from typing import List, Union
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 
+# Codec matching the native layout of a uint32 code buffer
+_UCS4_CODEC = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+def buffer_to_text(buf: np.ndarray) -> str:
+    """Decode a newline-terminated code buffer (see frame_buffer) into text without the final newline"""
+    if buf.dtype == np.uint8:
+        return buf.tobytes().decode('ascii')[:-1]
+    return buf.astype(np.uint32, copy=False).tobytes().decode(_UCS4_CODEC)[:-1]
+
+
+def text_to_buffer(text: str, dtype: np.dtype) -> np.ndarray:
+    """Encode text into a flat code array of the given dtype (inverse of buffer_to_text)"""
+    if np.dtype(dtype) == np.uint8:
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(text.encode(_UCS4_CODEC), dtype=np.uint32)
+
 
 class AsciiMapper:
     """Maps grayscale pixel values to ASCII characters"""
     
-    def __init__(self, ramp: str = None):
+    # Whether frame_buffer() takes the converter's gradients (see StructureMapper)
+    needs_gradients = False
+    # Samples per cell (columns, rows) frame_buffer() expects (see ShapeMapper)
+    cell_samples = (1, 1)
+    
+    def __init__(self, ramp: str = None, calibrated: bool = None):
         self.ramp = ramp if ramp else config.DEFAULT_RAMP
+        self.calibrated = config.CALIBRATED_RAMPS if calibrated is None else calibrated
         self._ramp_len = len(self.ramp)
         self._lookup = self._build_lookup_table()
+        self._build_code_lut()
     
     def _build_lookup_table(self) -> List[str]:
-        """Build a 256-entry lookup table for O(1) character mapping"""
+        """
+        Build a 256-entry lookup table for O(1) character mapping.
+
+        Calibrated mappers pick glyphs by measured ink coverage (see
+        processing.calibration); otherwise the ramp is spaced evenly.
+        """
+        if self.calibrated:
+            from processing.calibration import calibrated_lookup
+            return calibrated_lookup(self.ramp)
         lookup = []
         for i in range(256):
             index = int(i / 256 * self._ramp_len)
@@ -34,12 +66,75 @@ class AsciiMapper:
         self.ramp = ramp
         self._ramp_len = len(ramp)
         self._lookup = self._build_lookup_table()
+        self._build_code_lut()
+    
+    def _build_code_lut(self):
+        """
+        Build the 256-entry intensity -> character code table.
+
+        ASCII ramps get a uint8 (byte) table, anything else a uint32 (UCS-4)
+        table, so a whole frame can be produced with one np.take.
+        """
+        self._is_ascii = all(ord(ch) < 128 for ch in self.ramp)
+        dtype = np.uint8 if self._is_ascii else np.uint32
+        self._code_lut = np.array([ord(ch) for ch in self._lookup], dtype=dtype)
+        self._char_lut = np.array(self._lookup)
+        self._newline = dtype(ord('\n'))
+        self._frame_buf = None
+    
+    def frame_buffer(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Map a frame into a contiguous (height, width + 1) array of character
+        codes, each row terminated by a newline code.
+
+        The returned array is reused by the next call.
+        """
+        h, w = gray.shape
+        buf = self._frame_buf
+        if buf is None or buf.shape != (h, w + 1):
+            buf = np.empty((h, w + 1), dtype=self._code_lut.dtype)
+            buf[:, w] = self._newline
+            self._frame_buf = buf
+        np.take(self._code_lut, gray, out=buf[:, :w])
+        return buf
+    
+    def update_rows(self, buf: np.ndarray, gray: np.ndarray, start: int):
+        """Re-map rows start.. of a frame_buffer()-shaped array from new gray rows"""
+        np.take(self._code_lut, gray, out=buf[start:start + gray.shape[0], :-1])
+    
+    @property
+    def lookup(self) -> List[str]:
+        """The 256-entry intensity -> character table (replaced, not mutated, on set_ramp)"""
+        return self._lookup
+    
+    @property
+    def code_dtype(self) -> np.dtype:
+        """dtype of frame_buffer(): uint8 for ASCII ramps, uint32 otherwise"""
+        return self._code_lut.dtype
+    
+    def map_frame_text(self, gray: np.ndarray) -> str:
+        """Map a frame to a single newline-separated string"""
+        return buffer_to_text(self.frame_buffer(gray))
+    
+    def map_frame_lut(self, gray: np.ndarray, split: bool = True) -> Union[List[str], str]:
+        """
+        Lookup-table version of map_frame_fast.
+
+        Produces the same characters from one table gather over the whole
+        frame; the result is split into lines only when `split` is True.
+        """
+        text = self.map_frame_text(gray)
+        return text.split('\n') if split else text
     
     def map_frame_fast(self, gray: np.ndarray) -> List[str]:
-        """Optimized version using numpy vectorization."""
-        indices = (gray.astype(np.float32) / 256 * self._ramp_len).astype(np.int32)
-        indices = np.clip(indices, 0, self._ramp_len - 1)
-        ramp_array = np.array(list(self.ramp))
-        char_frame = ramp_array[indices]
-        return [''.join(row) for row in char_frame]
+        """
+        Optimized version using numpy vectorization.
 
+        Gathers characters from the same lookup as frame_buffer. Mappers that
+        replace frame_buffer (structure, shape, dots) only produce code
+        buffers, so for them this is map_frame_lut.
+        """
+        if type(self).frame_buffer is not AsciiMapper.frame_buffer:
+            return self.map_frame_lut(gray)
+        char_frame = self._char_lut[gray]
+        return [''.join(row) for row in char_frame]
@@ -0,0 +1,26 @@
+"""
+Real-Time ASCII Camera - Mapper Modes
+Names for the available mappers, used by --mode on the command line.
+"""
+
+from processing.dots import BrailleMapper, HalfBlockMapper
+from processing.mapper import AsciiMapper
+from processing.shape import QuadrantMapper, ShapeMapper
+from processing.structure import StructureMapper
+
+MAPPER_MODES = {
+    'ramp': AsciiMapper,
+    'structure': StructureMapper,
+    'shape': ShapeMapper,
+    'quadrant': QuadrantMapper,
+    'braille': BrailleMapper,
+    'halfblock': HalfBlockMapper,
+}
+
+
+def create_mapper(mode: str, ramp: str = None, calibrated: bool = None) -> AsciiMapper:
+    """Mapper for a mode name, using the given character ramp"""
+    try:
+        return MAPPER_MODES[mode](ramp, calibrated)
+    except KeyError:
+        raise ValueError(f"Unknown mapper mode: {mode}") from None
@@ -0,0 +1,256 @@
+"""
+Real-Time ASCII Camera - Frame Pipeline
+Runs capture, processing and rendering as separate stages connected by
+bounded queues, so a slow camera read no longer adds to the frame time.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from camera.grabber import FrameGrabber, LatestFrameSlot
+from processing.mapper import buffer_to_text
+
+
+class Frame(NamedTuple):
+    """A processed frame ready for rendering"""
+    seq: int
+    lines: List[str]
+    timestamp: float  # perf_counter() time at which the camera read started
+    work: float = 0.0  # seconds spent preprocessing and processing it
+    colors: Optional[np.ndarray] = None  # per-cell colours in colour mode
+
+
+class StageTimings:
+    """Thread-safe per-stage timing accumulator"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._maxima: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float):
+        """Record one measurement for a stage"""
+        with self._lock:
+            self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+            if seconds > self._maxima.get(stage, 0.0):
+                self._maxima[stage] = seconds
+
+    def summary(self, reset: bool = False) -> Dict[str, Dict[str, float]]:
+        """Average/max milliseconds and sample count per stage"""
+        with self._lock:
+            result = {
+                stage: {
+                    'avg_ms': self._totals[stage] / count * 1000.0,
+                    'max_ms': self._maxima[stage] * 1000.0,
+                    'count': count,
+                }
+                for stage, count in self._counts.items()
+            }
+            if reset:
+                self._totals.clear()
+                self._counts.clear()
+                self._maxima.clear()
+        return result
+
+    def format_compact(self) -> str:
+        """Short 'stage:avg' string for the status line"""
+        stages = self.summary()
+        return " ".join(f"{name[:3]}:{s['avg_ms']:.1f}" for name, s in stages.items())
+
+
+class DropOldestQueue:
+    """Bounded queue that discards its oldest item instead of blocking"""
+
+    def __init__(self, maxsize: int):
+        self._items = deque()
+        self._maxsize = max(1, maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None):
+        """Pop the oldest item, or return None on timeout"""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class FrameProcessor:
+    """Turns a grayscale frame into ASCII lines (enhance -> map -> glitch)"""
+
+    def __init__(self, converter, mapper, glitcher, timings: Optional[StageTimings] = None,
+                 temporal=None):
+        self.converter = converter
+        self.mapper = mapper
+        self.glitcher = glitcher
+        self.timings = timings
+        # Optional TemporalReuse: only re-process the rows that changed
+        # (not used with mappers that need the full frame's gradients or
+        # sample several pixel rows per text row)
+        self.temporal = temporal if not mapper.needs_gradients and mapper.cell_samples == (1, 1) else None
+        converter.keep_gradients = mapper.needs_gradients
+        # ColorQuantizer while colour mode is on
+        self.quantizer = None
+        # Optional Ditherer between enhancement and ramp mapping (dot and
+        # shape mappers threshold their own samples)
+        self.ditherer = None
+        # Held while a frame is processed; take it before swapping ramps
+        # or other mapper state from another thread.
+        self.lock = threading.Lock()
+
+    def process(self, gray: np.ndarray) -> List[str]:
+        timings = self.timings
+        with self.lock:
+            t0 = time.perf_counter()
+            if self.temporal is not None:
+                enhanced, bands = self.temporal.enhance(gray)
+            else:
+                enhanced = self.converter.enhance_fast(gray)
+            t1 = time.perf_counter()
+            dither = self.ditherer is not None and self.mapper.cell_samples == (1, 1)
+            if dither:
+                enhanced = self.ditherer.apply(enhanced, self.mapper.lookup)
+            td = time.perf_counter()
+            if self.temporal is not None:
+                buf = self.temporal.frame_buffer(enhanced, bands)
+            elif self.mapper.needs_gradients:
+                buf = self.mapper.frame_buffer(enhanced, self.converter.last_gradients)
+            else:
+                buf = self.mapper.frame_buffer(enhanced)
+            t2 = time.perf_counter()
+            if config.ENABLE_GLITCH:
+                if self.temporal is not None:
+                    buf = buf.copy()  # keep the reused codes clean
+                # Glitch the codes in place (not the trailing newline column)
+                self.glitcher.apply_codes(buf[:, :-1])
+            t3 = time.perf_counter()
+            lines = buffer_to_text(buf).split('\n')
+            t4 = time.perf_counter()
+        if timings is not None:
+            timings.add('enhance', t1 - t0)
+            if dither:
+                timings.add('dither', td - t1)
+            timings.add('map', (t2 - td) + (t4 - t3))
+            if config.ENABLE_GLITCH:
+                timings.add('glitch', t3 - t2)
+        return lines
+
+    def process_color(self, gray: np.ndarray, bgr: Optional[np.ndarray]):
+        """process() plus per-cell colours from the grid-sized BGR frame (None when off)"""
+        lines = self.process(gray)
+        quantizer = self.quantizer
+        if quantizer is None or bgr is None:
+            return lines, None
+        start = time.perf_counter()
+        if bgr.shape[0] != len(lines):
+            # Sampled at several pixels per cell: one colour per cell
+            bgr = cv2.resize(bgr, (len(lines[0]), len(lines)), interpolation=cv2.INTER_AREA)
+        colors = quantizer.quantize(bgr)
+        if self.timings is not None:
+            self.timings.add('color', time.perf_counter() - start)
+        return lines, colors
+
+
+class ThreadedPipeline:
+    """
+    Pipelined capture/processing.
+
+    A grabber thread keeps only the newest camera frame in a latest-frame
+    slot, a processing thread turns it into ASCII lines, and finished frames
+    wait in a small drop-oldest queue for the render loop. When rendering
+    falls behind, stale frames are discarded so latency stays bounded.
+    """
+
+    def __init__(self, camera, processor: FrameProcessor, queue_size: int = None):
+        self.camera = camera
+        self.processor = processor
+        self.timings = processor.timings if processor.timings is not None else StageTimings()
+        processor.timings = self.timings
+        self.slot = LatestFrameSlot()
+        self.output = DropOldestQueue(queue_size or config.PIPELINE_QUEUE_SIZE)
+        self.grabber = FrameGrabber(camera, self.slot, self.timings)
+        self._geometry_lock = threading.Lock()
+        self._geometry = None
+        self._stop_event = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._worker = threading.Thread(target=self._process_loop, name="frame-processor", daemon=True)
+
+    def set_geometry(self, width: int, height: int, zoom: float, mirror: bool):
+        """Update the target grid, zoom and mirror used for the next frames"""
+        with self._geometry_lock:
+            self._geometry = (width, height, zoom, mirror)
+
+    def start(self):
+        self.grabber.start()
+        self._worker.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self.grabber.stop()
+        if self._worker.is_alive():
+            self._worker.join(1.0)
+
+    def get_frame(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        """Next processed frame, or None if none arrived within timeout"""
+        if self._error is not None:
+            raise RuntimeError("Frame processing thread failed") from self._error
+        return self.output.get(timeout)
+
+    def record_render(self, frame: Frame, seconds: float):
+        """Account for the render stage, which runs on the caller's thread"""
+        self.timings.add('render', seconds)
+        self.timings.add('latency', time.perf_counter() - frame.timestamp)
+
+    @property
+    def dropped(self) -> int:
+        """Frames discarded anywhere in the pipeline"""
+        return self.slot.overwritten + self.output.dropped
+
+    def _process_loop(self):
+        try:
+            while not self._stop_event.is_set():
+                item = self.slot.take(timeout=0.1)
+                if item is None:
+                    continue
+                with self._geometry_lock:
+                    geometry = self._geometry
+                if geometry is None:
+                    continue
+                seq, timestamp, raw = item
+                width, height, zoom, mirror = geometry
+
+                start = time.perf_counter()
+                if self.processor.quantizer is not None:
+                    gray, bgr = self.camera.preprocess_color(raw, width, height, zoom, mirror)
+                else:
+                    gray, bgr = self.camera.preprocess(raw, width, height, zoom, mirror), None
+                self.timings.add('preprocess', time.perf_counter() - start)
+
+                lines, colors = self.processor.process_color(gray, bgr)
+                self.output.put(Frame(seq, lines, timestamp, time.perf_counter() - start, colors))
+        except BaseException as e:
+            self._error = e
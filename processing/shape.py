@@ -0,0 +1,122 @@
+"""
+Real-Time ASCII Camera - Shape Mappers
+Sample each cell on a small sub-grid and pick the glyph whose ink layout
+matches, instead of deciding the cell from one averaged intensity.
+"""
+
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from processing.mapper import AsciiMapper
+
+# Unicode quadrant blocks indexed by a 4-bit mask
+# (bit 0 top-left, bit 1 top-right, bit 2 bottom-left, bit 3 bottom-right)
+QUADRANT_GLYPHS = " ▘▝▀▖▌▞▛▗▚▐▜▄▙▟█"
+
+# Shape tables per (mapper class, glyphs, cell_samples, calibration gamma);
+# they do not depend on the ramp, so set_ramp reuses them
+_shape_tables: Dict[tuple, List[str]] = {}
+
+
+class ShapeMapper(AsciiMapper):
+    """
+    Sub-cell shape matching.
+
+    The frame is sampled at cell_samples (columns, rows) per cell. Each
+    sample is quantized to 2 bits and the 2x3 samples form a 12-bit key;
+    a 4096-entry table, built once from the glyphs' measured per-region
+    ink coverage, gives the nearest glyph for every key. Cells whose
+    samples differ by less than SHAPE_CONTRAST_THRESHOLD have no shape to
+    match and use the intensity ramp of their mean, as AsciiMapper would.
+    """
+
+    cell_samples = (2, 3)
+
+    def _build_code_lut(self):
+        super()._build_code_lut()
+        key = (type(self), config.SHAPE_GLYPHS, self.cell_samples,
+               config.CALIBRATION_GAMMA if self.calibrated else None)
+        table = _shape_tables.get(key)
+        if table is None:
+            table = _shape_tables[key] = self._build_shape_table()
+        if self._is_ascii and any(ord(ch) >= 128 for ch in table):
+            self._is_ascii = False
+            self._code_lut = self._code_lut.astype(np.uint32)
+            self._newline = np.uint32(ord('\n'))
+        self._shape_lut = np.array([ord(ch) for ch in table], dtype=self._code_lut.dtype)
+
+    def _build_shape_table(self) -> List[str]:
+        """Glyph for every 12-bit key (2 bits per sample, row-major)"""
+        from processing.calibration import glyph_coverage
+        glyphs = config.SHAPE_GLYPHS
+        coverage = glyph_coverage(glyphs, grid=self.cell_samples)
+        coverage = coverage / max(coverage.max(), 1e-6)
+        n = self.cell_samples[0] * self.cell_samples[1]
+        # Level centres (q + 0.5) / 4 of every sample of every key
+        keys = np.arange(4 ** n)
+        levels = (keys[:, None] >> (2 * np.arange(n))[None, :]) & 3
+        target = (levels + 0.5) / 4.0
+        if self.calibrated:
+            target = target ** config.CALIBRATION_GAMMA
+        nearest = ((target[:, None, :] - coverage[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        return [glyphs[i] for i in nearest]
+
+    def _samples(self, gray: np.ndarray) -> Tuple[List[np.ndarray], int, int]:
+        """One (rows, cols) view per sub-cell position, row-major"""
+        sx, sy = self.cell_samples
+        h, w = gray.shape[0] // sy, gray.shape[1] // sx
+        return [gray[i:h * sy:sy, j:w * sx:sx] for i in range(sy) for j in range(sx)], h, w
+
+    def _cell_keys(self, samples: List[np.ndarray], low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """Shape table index per cell: each sample's top 2 bits"""
+        key = np.zeros(samples[0].shape, dtype=np.uint16)
+        for i, sample in enumerate(samples):
+            key |= (sample >> 6).astype(np.uint16) << (2 * i)
+        return key
+
+    def frame_buffer(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Like AsciiMapper.frame_buffer for a frame sampled at cell_samples
+        per cell: the result has one code per cell, not per pixel.
+        """
+        samples, h, w = self._samples(gray)
+        sx, sy = self.cell_samples
+        mean = cv2.resize(gray[:h * sy, :w * sx], (w, h), interpolation=cv2.INTER_AREA)
+        buf = super().frame_buffer(mean)
+
+        low, high = samples[0].copy(), samples[0].copy()
+        for sample in samples[1:]:
+            np.minimum(low, sample, out=low)
+            np.maximum(high, sample, out=high)
+        cells = np.flatnonzero(high - low >= config.SHAPE_CONTRAST_THRESHOLD)
+        if len(cells):
+            key = self._cell_keys(samples, low, high)
+            buf[cells // w, cells % w] = self._shape_lut[key.ravel()[cells]]
+        return buf
+
+
+class QuadrantMapper(ShapeMapper):
+    """
+    2x2 Unicode quadrant blocks. Samples above the midpoint of their cell's
+    range are lit, so edges keep their shape at double the grid resolution;
+    flat cells use the ramp (the block ramp matches best).
+    """
+
+    cell_samples = (2, 2)
+
+    def _build_shape_table(self) -> List[str]:
+        return list(QUADRANT_GLYPHS)
+
+    def _cell_keys(self, samples: List[np.ndarray], low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """4-bit mask of samples above (low + high) / 2"""
+        middle = (low.astype(np.uint16) + high) >> 1
+        key = np.zeros(samples[0].shape, dtype=np.uint8)
+        for i, sample in enumerate(samples):
+            key |= (sample > middle).view(np.uint8) << i
+        return key
@@ -0,0 +1,109 @@
+"""
+Real-Time ASCII Camera - Structure Mapper
+Draws edges with direction glyphs (- | / \\) picked from the Sobel gradients
+the converter already computed; flat regions keep the intensity ramp.
+"""
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from processing.mapper import AsciiMapper
+
+# Orientation bins, in the order of each STRUCTURE_GLYPHS string
+HORIZONTAL, VERTICAL, RISING, FALLING = range(4)
+
+# Orientation from three comparisons, as a 3-bit index:
+#   bit 0: |gy| < 0.4 |gx|  (gradient mostly horizontal -> vertical edge)
+#   bit 1: |gx| < 0.4 |gy|  (gradient mostly vertical -> horizontal edge)
+#   bit 2: gx and gy differ in sign (edge falls left to right, image y down)
+# Bits 0 and 1 never both hold. tan(22.5 deg) ~= 0.4 splits the bins.
+_ORIENTATION = np.array([RISING, VERTICAL, HORIZONTAL, HORIZONTAL,
+                         FALLING, VERTICAL, HORIZONTAL, HORIZONTAL], dtype=np.intp)
+
+# Step along the gradient (across the edge) per orientation, for thinning
+_ACROSS_Y = np.array([1, 0, 1, 1], dtype=np.intp)
+_ACROSS_X = np.array([0, 1, 1, -1], dtype=np.intp)
+
+Gradients = Tuple[np.ndarray, np.ndarray, np.ndarray]  # (gx, gy, magnitude)
+
+
+class StructureMapper(AsciiMapper):
+    """
+    Intensity ramp plus edge-direction glyphs.
+
+    Each cell's Sobel gradient is quantized to one of four orientations and
+    a magnitude band; a (band, orientation) table gives the glyph. Band 0
+    (below STRUCTURE_EDGE_THRESHOLD) falls back to the intensity ramp.
+    Edges are thinned to one cell by keeping only cells whose magnitude
+    peaks across the edge. Everything is a handful of array operations.
+    """
+
+    needs_gradients = True
+
+    def _build_code_lut(self):
+        super()._build_code_lut()
+        glyphs = config.STRUCTURE_GLYPHS
+        if self._is_ascii and any(ord(ch) >= 128 for chars in glyphs for ch in chars):
+            self._is_ascii = False
+            self._code_lut = self._code_lut.astype(np.uint32)
+            self._newline = np.uint32(ord('\n'))
+        dtype = self._code_lut.dtype
+        # Band 0 is never read from the table (the ramp is used instead)
+        self._glyph_table = np.zeros((len(glyphs) + 1, 8), dtype=dtype)
+        for band, chars in enumerate(glyphs, start=1):
+            self._glyph_table[band] = [ord(chars[o]) for o in _ORIENTATION]
+        # Magnitude (0-255) -> band: the threshold, then equal steps up to 255
+        threshold = config.STRUCTURE_EDGE_THRESHOLD
+        edges = np.linspace(threshold, 256, len(glyphs) + 1)[:-1]
+        self._band_lut = np.searchsorted(edges, np.arange(256), side='right').astype(np.uint8)
+
+    def frame_buffer(self, gray: np.ndarray, gradients: Optional[Gradients] = None) -> np.ndarray:
+        """
+        Like AsciiMapper.frame_buffer, with edge cells replaced by direction
+        glyphs. `gradients` are the converter's (gx, gy, magnitude) for this
+        frame; without them (e.g. enhancement off) a Sobel pass is run here.
+        """
+        buf = super().frame_buffer(gray)
+        if gradients is None or gradients[0].shape != gray.shape:
+            gradients = self._gradients(gray)
+        gx, gy, magnitude = gradients
+
+        band = self._band_lut[magnitude]
+        cells = np.flatnonzero(band)
+        if not len(cells):
+            return buf
+        gx, gy = gx.ravel()[cells], gy.ravel()[cells]
+        ax, ay = np.abs(gx).astype(np.int32), np.abs(gy).astype(np.int32)
+        index = (5 * ay < 2 * ax).view(np.uint8) | ((5 * ax < 2 * ay).view(np.uint8) << 1) \
+            | (((gx ^ gy) < 0).view(np.uint8) << 2)
+
+        # Non-maximum suppression across the edge (strict on one side so a
+        # plateau keeps exactly one cell), on a zero-padded flat copy
+        h, w = magnitude.shape
+        padded = np.zeros((h + 2, w + 2), dtype=magnitude.dtype)
+        padded[1:-1, 1:-1] = magnitude
+        padded = padded.ravel()
+        orientation = _ORIENTATION[index]
+        step = _ACROSS_Y[orientation] * (w + 2) + _ACROSS_X[orientation]
+        at = cells + (cells // w) * 2 + w + 3  # position of each cell in the padded frame
+        peak = padded[at]
+        keep = (peak > padded[at - step]) & (peak >= padded[at + step])
+
+        cells = cells[keep]
+        buf[cells // w, cells % w] = self._glyph_table[band.ravel()[cells], index[keep]]
+        return buf
+
+    @staticmethod
+    def _gradients(gray: np.ndarray) -> Gradients:
+        """Sobel gradients and approximate magnitude (as ImageConverter computes them)"""
+        gx = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3)
+        gy = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3)
+        ax, ay = cv2.convertScaleAbs(gx), cv2.convertScaleAbs(gy)
+        magnitude = cv2.addWeighted(cv2.max(ax, ay), 1.0, cv2.min(ax, ay), 0.375, 0)
+        return gx, gy, magnitude
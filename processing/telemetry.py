@@ -0,0 +1,179 @@
+"""
+Real-Time ASCII Camera - Telemetry
+Per-stage latency histograms, frame rate and counters (dropped frames,
+bytes written to the tty) for the live loop, with a one-line status
+overlay and JSON/CSV dumps.
+"""
+
+import bisect
+import csv
+import json
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+# Bucket upper bounds in seconds: 1 us to 10 s, 20 buckets per decade
+# (about 12% wide), so a percentile is off by at most one bucket.
+_BOUNDS: List[float] = np.geomspace(1e-6, 10.0, 7 * 20 + 1).tolist()
+
+# Order stages are listed in (anything else follows alphabetically)
+STAGE_ORDER = ('capture', 'grab', 'preprocess', 'enhance', 'dither', 'map', 'glitch', 'color', 'render', 'latency')
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with exact count, mean and max"""
+
+    def __init__(self):
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Upper bound (seconds) of the bucket holding the p-th percentile"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(np.ceil(self.count * p / 100.0)))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_BOUNDS[i] if i < len(_BOUNDS) else self.max, self.max)
+        return self.max
+
+    def stats_ms(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'avg_ms': self.total / self.count * 1000.0 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000.0,
+            'p95_ms': self.percentile(95) * 1000.0,
+            'p99_ms': self.percentile(99) * 1000.0,
+            'max_ms': self.max * 1000.0,
+        }
+
+    def buckets(self) -> Dict[str, list]:
+        """Non-empty buckets as parallel lists of upper bounds (ms) and counts"""
+        nonzero = [i for i, n in enumerate(self.counts) if n]
+        return {
+            'le_ms': [_BOUNDS[i] * 1000.0 if i < len(_BOUNDS) else None for i in nonzero],
+            'counts': [self.counts[i] for i in nonzero],
+        }
+
+
+class Telemetry:
+    """
+    Thread-safe collector for stage latencies and counters.
+
+    Has the same add()/summary()/format_compact() interface as
+    StageTimings, so it can be handed to FrameProcessor and
+    ThreadedPipeline in its place.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._start = time.perf_counter()
+        self._window_start = self._start
+        self._window_frames = 0
+        self.fps = 0.0
+
+    def add(self, stage: str, seconds: float):
+        """Record one latency sample for a stage"""
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = LatencyHistogram()
+            hist.add(seconds)
+
+    def count(self, name: str, n: int = 1):
+        """Add n to a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def set(self, name: str, value: int):
+        """Set a counter that is tracked elsewhere (e.g. a queue's drop count)"""
+        with self._lock:
+            self._counters[name] = value
+
+    def frame_done(self):
+        """Count a displayed frame and refresh the frame rate about once a second"""
+        now = time.perf_counter()
+        with self._lock:
+            self._counters['frames'] = self._counters.get('frames', 0) + 1
+            self._window_frames += 1
+            if now - self._window_start >= 1.0:
+                self.fps = self._window_frames / (now - self._window_start)
+                self._window_start = now
+                self._window_frames = 0
+
+    def _ordered(self) -> List[str]:
+        known = [s for s in STAGE_ORDER if s in self._stages]
+        return known + sorted(s for s in self._stages if s not in STAGE_ORDER)
+
+    def summary(self, reset: bool = False) -> Dict[str, Dict[str, float]]:
+        """Latency statistics (ms) and sample count per stage"""
+        with self._lock:
+            result = {stage: self._stages[stage].stats_ms() for stage in self._ordered()}
+            if reset:
+                self._stages.clear()
+        return result
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def format_compact(self) -> str:
+        """Short 'stage:avg' string (StageTimings compatible)"""
+        return " ".join(f"{name[:3]}:{s['avg_ms']:.1f}" for name, s in self.summary().items())
+
+    def format_overlay(self) -> str:
+        """One status line: fps, p50/p99 ms per stage, drops and tty throughput"""
+        stages = self.summary()
+        counters = self.counters()
+        elapsed = max(time.perf_counter() - self._start, 1e-9)
+        parts = [f"fps:{self.fps:.1f}"]
+        parts += [f"{name[:3]}:{s['p50_ms']:.1f}/{s['p99_ms']:.1f}" for name, s in stages.items()]
+        parts.append(f"drop:{counters.get('dropped', 0)}")
+        parts.append(f"tty:{counters.get('tty_bytes', 0) / elapsed / 1024:.0f}K/s")
+        return " " + " ".join(parts) + " (p50/p99 ms)"
+
+    def report(self) -> dict:
+        """Everything collected, as a JSON-serializable dict"""
+        elapsed = time.perf_counter() - self._start
+        counters = self.counters()
+        with self._lock:
+            histograms = {stage: self._stages[stage].buckets() for stage in self._ordered()}
+        return {
+            'duration_s': elapsed,
+            'avg_fps': counters.get('frames', 0) / elapsed if elapsed > 0 else 0.0,
+            'stages': self.summary(),
+            'counters': counters,
+            'histograms': histograms,
+        }
+
+    def dump(self, path: str):
+        """Write the report as CSV (for a .csv path) or JSON"""
+        report = self.report()
+        if path.lower().endswith('.csv'):
+            fields = ['count', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['metric'] + fields)
+                for stage, stats in report['stages'].items():
+                    writer.writerow([stage] + [round(stats[k], 4) for k in fields])
+                for name, value in sorted(report['counters'].items()):
+                    writer.writerow([name, value] + [''] * (len(fields) - 1))
+                writer.writerow(['avg_fps', round(report['avg_fps'], 2)] + [''] * (len(fields) - 1))
+        else:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
@@ -0,0 +1,136 @@
+"""
+Real-Time ASCII Camera - Temporal Reuse
+Finds the parts of a frame that changed since they were last processed and
+re-runs enhancement and mapping only there, reusing everything else.
+"""
+
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+Band = Tuple[int, int]  # (start row, stop row exclusive)
+
+
+def merge_bands(bands: List[Band]) -> List[Band]:
+    """Sorted, non-overlapping union of row bands (touching bands are joined)"""
+    merged: List[Band] = []
+    for start, stop in sorted(bands):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+class TemporalReuse:
+    """
+    Change detection between the grayscale frame and the last one processed.
+
+    The frame is compared in tiles of TEMPORAL_TILE (columns, rows); a tile
+    counts as changed when its mean absolute difference exceeds
+    TEMPORAL_THRESHOLD grey levels, so sensor noise alone does not trigger
+    work. Changed rows are widened by one CLAHE tile either side (a tile's
+    histogram also shapes its neighbours) and one row for the Sobel kernel,
+    then only those bands are re-enhanced and re-mapped. Unchanged rows keep
+    their previous codes, so their text is identical and the renderers skip
+    them.
+
+    Everything is recomputed when the frame shape or any setting that
+    affects the output changes, while CLAHE is being skipped on alternate
+    frames, and every TEMPORAL_REFRESH_FRAMES frames so sub-threshold drift
+    cannot accumulate.
+    """
+
+    def __init__(self, converter, mapper, tile: Tuple[int, int] = None,
+                 threshold: float = None, refresh_frames: int = None):
+        self.converter = converter
+        self.mapper = mapper
+        self.tile = tile or config.TEMPORAL_TILE
+        self.threshold = config.TEMPORAL_THRESHOLD if threshold is None else threshold
+        self.refresh_frames = refresh_frames or config.TEMPORAL_REFRESH_FRAMES
+        self.rows_total = 0
+        self.rows_processed = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the previous frame; the next one is processed in full"""
+        self._reference = None
+        self._enhanced = None
+        self._codes = None
+        self._key = None
+        self._frames_since_full = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of rows served from the previous frame so far"""
+        return 1.0 - self.rows_processed / self.rows_total if self.rows_total else 0.0
+
+    def _settings_key(self, gray: np.ndarray) -> tuple:
+        converter = self.converter
+        return (gray.shape, config.ENABLE_CLAHE, config.ENABLE_EDGE_BLEND and converter.edge_blend,
+                config.ENABLE_INVERT, self.mapper.ramp, self.mapper.code_dtype)
+
+    def enhance(self, gray: np.ndarray) -> Tuple[np.ndarray, List[Band]]:
+        """
+        Enhanced frame (owned by this object) and the row bands that were
+        recomputed for it.
+        """
+        h = gray.shape[0]
+        key = self._settings_key(gray)
+        self._frames_since_full += 1
+        if (self._reference is None or key != self._key or self.converter.clahe_interval > 1
+                or self._frames_since_full >= self.refresh_frames):
+            self._key = key
+            self._frames_since_full = 0
+            self._reference = gray.copy()
+            self._enhanced = self.converter.enhance_fast(gray).copy()
+            bands = [(0, h)]
+        else:
+            bands = self._affected_bands(self.changed_bands(gray), gray.shape)
+            for start, stop in bands:
+                self._enhanced[start:stop] = self.converter.enhance_rows(gray, start, stop)
+                self._reference[start:stop] = gray[start:stop]
+        self.rows_total += h
+        self.rows_processed += sum(stop - start for start, stop in bands)
+        return self._enhanced, bands
+
+    def frame_buffer(self, enhanced: np.ndarray, bands: List[Band]) -> np.ndarray:
+        """
+        Character codes for the frame (AsciiMapper.frame_buffer layout),
+        re-mapping only the given bands. The array is owned by this object
+        and must not be modified.
+        """
+        codes = self._codes
+        if codes is None or bands == [(0, enhanced.shape[0])] or codes.shape[0] != enhanced.shape[0]:
+            self._codes = self.mapper.frame_buffer(enhanced).copy()
+            return self._codes
+        for start, stop in bands:
+            self.mapper.update_rows(codes, enhanced[start:stop], start)
+        return codes
+
+    def changed_bands(self, gray: np.ndarray) -> List[Band]:
+        """Row bands containing a tile whose mean change is above the threshold"""
+        h, w = gray.shape
+        tile_w, tile_h = self.tile
+        tiles_x, tiles_y = -(-w // tile_w), -(-h // tile_h)
+        diff = cv2.absdiff(gray, self._reference)
+        means = cv2.resize(diff, (tiles_x, tiles_y), interpolation=cv2.INTER_AREA)
+        changed = np.flatnonzero((means > self.threshold).any(axis=1))
+        return merge_bands([(int(r) * h // tiles_y, -(-(int(r) + 1) * h // tiles_y)) for r in changed])
+
+    def _affected_bands(self, changed: List[Band], shape: tuple) -> List[Band]:
+        """Rows whose enhanced value can differ when the `changed` rows do"""
+        h = shape[0]
+        if config.ENABLE_CLAHE:
+            tile_h = self.converter.clahe_tile_height(shape)
+            bands = [(max((start // tile_h - 1) * tile_h - 1, 0), min((-(-stop // tile_h) + 1) * tile_h + 1, h))
+                     for start, stop in changed]
+        else:
+            bands = [(max(start - 1, 0), min(stop + 1, h)) for start, stop in changed]
+        return merge_bands(bands)
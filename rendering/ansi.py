@@ -0,0 +1,262 @@
+"""
+Real-Time ASCII Camera - Raw ANSI Renderer
+Writes each frame as one buffered ANSI/VT100 byte stream, bypassing curses.
+"""
+
+import os
+import sys
+import select
+import functools
+import termios
+import tty
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from processing.color import COLOR_DTYPES
+
+CSI = b'\x1b['
+CURSOR_HOME = CSI + b'H'
+CLEAR_SCREEN = CSI + b'2J'
+CLEAR_EOL = CSI + b'K'
+CLEAR_BELOW = CSI + b'J'
+REVERSE = CSI + b'7m'
+RESET = CSI + b'0m'
+HIDE_CURSOR = CSI + b'?25l'
+SHOW_CURSOR = CSI + b'?25h'
+ALT_SCREEN_ON = CSI + b'?1049h'
+ALT_SCREEN_OFF = CSI + b'?1049l'
+# Synchronized output (DEC mode 2026): the terminal holds the screen until the
+# end marker, so a frame never tears. Terminals without support ignore it.
+SYNC_BEGIN = CSI + b'?2026h'
+SYNC_END = CSI + b'?2026l'
+
+
+# Foreground colour escapes, as str so they join with the row text
+SGR_256 = ['\x1b[38;5;%dm' % i for i in range(256)]
+
+
+def cursor_to(row: int, col: int) -> bytes:
+    """Absolute cursor position (0-based arguments)"""
+    return b'%s%d;%dH' % (CSI, row + 1, col + 1)
+
+
+@functools.lru_cache(maxsize=1 << 15)
+def sgr_truecolor(value: int) -> str:
+    """Foreground escape for a packed 0xRRGGBB colour"""
+    return '\x1b[38;2;%d;%d;%dm' % (value >> 16, (value >> 8) & 0xFF, value & 0xFF)
+
+
+def color_row(line: str, colors: np.ndarray, sgr) -> str:
+    """
+    A row of text with a colour escape only where the colour changes.
+    `colors` holds one value per character; `sgr` maps a value to its escape.
+    """
+    colors = colors[:len(line)]
+    if not len(colors):
+        return line
+    bounds = [0] + (np.flatnonzero(colors[1:] != colors[:-1]) + 1).tolist() + [len(line)]
+    values = colors[bounds[:-1]].tolist()
+    return ''.join([sgr(value) + line[start:end] for value, start, end in zip(values, bounds, bounds[1:])])
+
+
+class AnsiRenderer:
+    """
+    Terminal renderer that talks to the tty directly.
+
+    Same interface as AsciiRenderer. Each frame - including the status line
+    and any overlay submitted since the previous frame - is assembled into
+    one preallocated bytearray and pushed with a single os.write. In
+    differential mode only rows whose text changed are rewritten.
+    """
+
+    def __init__(self, out_fd: int = None, in_fd: int = None, sync_update: bool = None,
+                 differential: bool = None):
+        self.out_fd = sys.stdout.fileno() if out_fd is None else out_fd
+        self.in_fd = sys.stdin.fileno() if in_fd is None else in_fd
+        self.sync_update = config.ANSI_SYNC_UPDATE if sync_update is None else sync_update
+        self.differential = config.ENABLE_DIFF_RENDER if differential is None else differential
+        self._prev_lines: Optional[List[str]] = None
+        self._prev_colors: Optional[np.ndarray] = None
+        self.color_mode = 'none'
+        self.width = 0
+        self.height = 0
+        self._buf = bytearray(64 * 1024)
+        self._status: Optional[str] = None
+        self._overlay: Optional[List[str]] = None
+        self._saved_tty = None
+        self._pending_keys = deque()
+        self._needs_clear = True
+        self.last_cells_written = 0
+        self.last_bytes_written = 0
+
+    def start(self):
+        """Enter cbreak mode and the alternate screen"""
+        if os.isatty(self.in_fd):
+            self._saved_tty = termios.tcgetattr(self.in_fd)
+            tty.setcbreak(self.in_fd)
+        self._write(ALT_SCREEN_ON + HIDE_CURSOR + CLEAR_SCREEN)
+        self.get_dimensions()
+
+    def stop(self):
+        """Restore the terminal to how start() found it"""
+        self._write(RESET + SHOW_CURSOR + ALT_SCREEN_OFF)
+        if self._saved_tty is not None:
+            termios.tcsetattr(self.in_fd, termios.TCSADRAIN, self._saved_tty)
+            self._saved_tty = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def get_dimensions(self) -> tuple:
+        """Get current terminal dimensions (width, height)"""
+        try:
+            size = os.get_terminal_size(self.out_fd)
+        except OSError:
+            return self.width, self.height
+        if (size.columns, size.lines) != (self.width, self.height):
+            self._needs_clear = True
+        self.width, self.height = size.columns, size.lines
+        return self.width, self.height
+
+    def invalidate(self):
+        """Clear the screen before the next frame"""
+        self._needs_clear = True
+
+    def set_color_mode(self, mode: str) -> str:
+        """'none', '256' or 'truecolor'; takes effect with a full redraw"""
+        self.color_mode = mode
+        self.invalidate()
+        return mode
+
+    def render_frame(self, lines: List[str], colors: Optional[np.ndarray] = None):
+        """
+        Compose and write a complete frame with one os.write. `colors`
+        (one value per cell, as produced by ColorQuantizer) colours the text
+        with an escape at each change of colour along a row.
+        """
+        if self.width <= 0 or self.height <= 0:
+            return
+        width = self.width - 1
+        rows = [line[:width] for line in lines[:self.height - 1]]
+        if self.color_mode == 'none' or colors is None or colors.dtype != COLOR_DTYPES[self.color_mode]:
+            colors = None
+        else:
+            colors = colors[:len(rows), :width]
+        prev_lines, prev_colors = self._prev_lines, self._prev_colors
+        self._prev_lines = rows if self.differential else None
+        self._prev_colors = colors
+        full = (self._needs_clear or prev_lines is None or len(prev_lines) != len(rows)
+                or (colors is None) != (prev_colors is None)
+                or (colors is not None and colors.shape != prev_colors.shape))
+        if full:
+            targets = range(len(rows))
+        else:
+            changed = [line != prev_lines[y] for y, line in enumerate(rows)]
+            if colors is not None:
+                changed = np.logical_or(changed, (colors != prev_colors).any(axis=1))
+            targets = np.flatnonzero(changed).tolist()
+        if colors is None:
+            encoded = [rows[y].encode('utf-8') for y in targets]
+        else:
+            sgr = SGR_256.__getitem__ if self.color_mode == '256' else sgr_truecolor
+            encoded = [color_row(rows[y], colors[y], sgr).encode('utf-8') for y in targets]
+        status = self._status.encode('utf-8') if self._status is not None else b''
+        overlay = self._overlay
+        self._overlay = None
+
+        # Worst case size: payload plus per-row escapes and the overlay
+        needed = sum(map(len, encoded)) + len(status) + 16 * (len(rows) + 4)
+        if overlay:
+            needed += sum(len(line.encode('utf-8')) + 24 for line in overlay)
+        if needed > len(self._buf):
+            self._buf = bytearray(needed * 2)
+        buf = self._buf
+        pos = 0
+
+        def put(data: bytes):
+            nonlocal pos
+            end = pos + len(data)
+            buf[pos:end] = data
+            pos = end
+
+        if self.sync_update:
+            put(SYNC_BEGIN)
+        if self._needs_clear:
+            put(CLEAR_SCREEN)
+            self._needs_clear = False
+        if full:
+            put(CURSOR_HOME)
+            for y, data in zip(targets, encoded):
+                if y:
+                    put(b'\r\n')
+                put(data)
+                put(CLEAR_EOL)
+            put(CLEAR_BELOW)
+        else:
+            # Only the rows that changed since the last frame
+            for y, data in zip(targets, encoded):
+                put(cursor_to(y, 0))
+                put(data)
+                put(CLEAR_EOL)
+        if colors is not None:
+            put(RESET)
+        cells = sum(len(rows[y]) for y in targets)
+
+        if status:
+            put(cursor_to(self.height - 1, 0) + REVERSE)
+            put(status)
+            put(RESET)
+        if overlay:
+            oy = max((self.height - len(overlay)) // 2, 0)
+            ox = max((self.width - len(overlay[0])) // 2, 0)
+            put(REVERSE)
+            for i, line in enumerate(overlay):
+                put(cursor_to(oy + i, ox))
+                put(line[:max(self.width - ox - 1, 0)].encode('utf-8'))
+            put(RESET)
+        if self.sync_update:
+            put(SYNC_END)
+
+        self._write(memoryview(buf)[:pos])
+        self.last_cells_written = cells
+        self.last_bytes_written = pos
+
+    def render_status(self, text: str):
+        """Set the status line; it is drawn with the next frame"""
+        self._status = text[:max(self.width - 1, 0)].ljust(max(self.width - 1, 0))
+
+    def render_overlay(self, lines: List[str]):
+        """Draw centred reverse-video lines over the next frame"""
+        self._overlay = lines
+
+    def get_key(self) -> Optional[int]:
+        """Get a key press (non-blocking, -1 when none, like curses getch)"""
+        if not self._pending_keys:
+            try:
+                ready, _, _ = select.select([self.in_fd], [], [], 0)
+            except (OSError, ValueError):
+                return -1
+            if not ready:
+                return -1
+            data = os.read(self.in_fd, 64)
+            if not data:
+                return -1
+            if data[0] == 27 and len(data) > 1:
+                # Escape sequence (arrow keys etc.) - not a bare Esc press
+                return -1
+            self._pending_keys.extend(data)
+        return self._pending_keys.popleft()
+
+    def _write(self, data):
+        view = memoryview(data)
+        while view:
+            written = os.write(self.out_fd, view)
+            view = view[written:]
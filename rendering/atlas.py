@@ -0,0 +1,106 @@
+"""
+Real-Time ASCII Camera - Glyph Atlas
+Rasterizes each glyph once and builds whole frame bitmaps with a single
+NumPy gather, instead of asking FreeType to draw every line of every frame.
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from typing import Iterable, List, Tuple
+
+# Monospaced fonts tried in order (macOS, then common Linux path)
+FONT_PATHS = (
+    "/System/Library/Fonts/Supplemental/Courier New.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+)
+
+
+def load_font(size: int):
+    """First available monospaced TrueType font, else PIL's built-in bitmap font"""
+    for path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except:
+            pass
+    return ImageFont.load_default()
+
+
+def cell_size(font) -> Tuple[int, int]:
+    """(width, height) of one character cell: advance width x line height"""
+    if hasattr(font, 'getmetrics'):
+        ascent, descent = font.getmetrics()
+        height = ascent + descent
+    else:
+        height = font.getbbox("Ag")[3]
+    if hasattr(font, 'getlength'):
+        width = int(round(font.getlength("M")))
+    else:
+        bbox = font.getbbox("M")
+        width = bbox[2] - bbox[0]
+    return max(width, 1), max(height, 1)
+
+
+def gradient_palette(bg: tuple, fg: tuple, levels: int) -> List[int]:
+    """Flat 768-entry palette: `levels` steps from bg to fg, rest padded with bg"""
+    t = np.linspace(0.0, 1.0, levels)[:, None]
+    colors = np.rint(np.array(bg) * (1 - t) + np.array(fg) * t).astype(np.uint8)
+    palette = np.tile(np.array(bg, np.uint8), (256, 1))
+    palette[:levels] = colors
+    return palette.ravel().tolist()
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered glyph tiles indexed by character.
+
+    Tiles hold palette indices (0 = background, levels - 1 = full ink), so
+    frames can be emitted directly as palette ("P" mode) images with no RGB
+    quantization. Characters not seen before are rasterized on first use.
+    """
+
+    def __init__(self, font, levels: int = 16, chars: Iterable[str] = " "):
+        self.font = font
+        self.levels = max(2, min(levels, 256))
+        self.cell_width, self.cell_height = cell_size(font)
+        self._chars: List[str] = []
+        self._tiles = np.zeros((0, self.cell_height, self.cell_width), np.uint8)
+        self._codes = np.zeros(0, np.uint32)      # sorted code points
+        self._order = np.zeros(0, np.intp)        # tile index for each sorted code point
+        self.add(" ")
+        self.add(chars)
+
+    def _rasterize(self, ch: str) -> np.ndarray:
+        img = Image.new('L', (self.cell_width, self.cell_height), 0)
+        ImageDraw.Draw(img).text((0, 0), ch, font=self.font, fill=255)
+        coverage = np.asarray(img, dtype=np.uint16)
+        return ((coverage * (self.levels - 1) + 127) // 255).astype(np.uint8)
+
+    def add(self, chars: Iterable[str]):
+        """Rasterize any characters that are not in the atlas yet"""
+        known = set(self._chars)
+        new = [ch for ch in dict.fromkeys(chars) if ch not in known]
+        if not new:
+            return
+        tiles = np.stack([self._rasterize(ch) for ch in new])
+        self._tiles = np.concatenate([self._tiles, tiles])
+        self._chars.extend(new)
+        codes = np.array([ord(ch) for ch in self._chars], np.uint32)
+        self._order = np.argsort(codes)
+        self._codes = codes[self._order]
+
+    def indices(self, codes: np.ndarray) -> np.ndarray:
+        """Map a grid of code points to tile indices, adding unseen glyphs"""
+        pos = np.searchsorted(self._codes, codes)
+        pos_clipped = np.minimum(pos, len(self._codes) - 1)
+        missing = self._codes[pos_clipped] != codes
+        if missing.any():
+            self.add(chr(c) for c in np.unique(codes[missing]))
+            return self.indices(codes)
+        return self._order[pos_clipped]
+
+    def render(self, codes: np.ndarray) -> np.ndarray:
+        """(rows, cols) code points -> (rows * cell_h, cols * cell_w) palette-index bitmap"""
+        rows, cols = codes.shape
+        idx = self.indices(codes)                           # may grow self._tiles
+        tiles = self._tiles[idx]                            # rows, cols, ch, cw
+        return tiles.transpose(0, 2, 1, 3).reshape(rows * self.cell_height, cols * self.cell_width)
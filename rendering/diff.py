@@ -0,0 +1,63 @@
+"""
+Real-Time ASCII Camera - Frame Differencing
+Finds the spans of a frame that changed since the previous one.
+"""
+
+import numpy as np
+from typing import List, Optional, Tuple
+
+# Changed cells closer together than this are written as one span; a cursor
+# move costs about as many bytes as rewriting a few unchanged cells.
+DEFAULT_MERGE_GAP = 6
+
+Span = Tuple[int, int, int]  # (row, start column, end column exclusive)
+
+
+def lines_to_codes(lines: List[str], width: int) -> np.ndarray:
+    """
+    Convert lines into a (rows, width) uint32 array of code points.
+    Short lines are padded with spaces, long ones truncated.
+    """
+    if not lines:
+        return np.full((0, width), ord(' '), dtype=np.uint32)
+    arr = np.array(lines, dtype=f'<U{max(width, 1)}')
+    codes = arr.view(np.uint32).reshape(len(lines), max(width, 1))[:, :width].copy()
+    codes[codes == 0] = ord(' ')
+    return codes
+
+
+def changed_spans(prev: Optional[np.ndarray], cur: np.ndarray,
+                  merge_gap: int = DEFAULT_MERGE_GAP,
+                  rows: Optional[np.ndarray] = None) -> List[Span]:
+    """
+    Spans of `cur` that differ from `prev`.
+
+    With no previous frame (or a different shape) every row is one span.
+    `rows` optionally restricts the comparison to the given row indices.
+    """
+    height, width = cur.shape
+    if prev is None or prev.shape != cur.shape:
+        return [(y, 0, width) for y in range(height)]
+
+    if rows is None:
+        diff = prev != cur
+        dirty_rows = np.flatnonzero(diff.any(axis=1))
+    else:
+        rows = np.asarray(rows, dtype=np.intp)
+        diff = np.zeros(cur.shape, dtype=bool)
+        diff[rows] = prev[rows] != cur[rows]
+        dirty_rows = rows[diff[rows].any(axis=1)]
+
+    spans = []
+    for y in dirty_rows:
+        cols = np.flatnonzero(diff[y])
+        breaks = np.flatnonzero(np.diff(cols) > merge_gap)
+        starts = cols[np.r_[0, breaks + 1]]
+        ends = cols[np.r_[breaks, len(cols) - 1]] + 1
+        spans.extend((int(y), int(s), int(e)) for s, e in zip(starts, ends))
+    return spans
+
+
+def cursor_move_cost(row: int, col: int) -> int:
+    """Bytes in an ANSI cursor-position sequence (ESC [ row ; col H)"""
+    return 4 + len(str(row + 1)) + len(str(col + 1))
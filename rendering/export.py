@@ -4,23 +4,49 @@ Handles converting ASCII frames to image and animated GIF.
 """
 
 import os
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageDraw
 import config
+from rendering.atlas import GlyphAtlas, gradient_palette, load_font
+from rendering.diff import lines_to_codes
+from rendering.gifstream import GifStreamWriter
 
 class GifExporter:
     """Converts captured ASCII frames into an animated GIF"""
     
     def __init__(self):
         self.font_size = config.GIF_FONT_SIZE
-        # Try to load a monospaced font
-        try:
-            # Common monospaced fonts on macOS
-            self.font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Courier New.ttf", self.font_size)
-        except:
-            try:
-                self.font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf", self.font_size)
-            except:
-                self.font = ImageFont.load_default()
+        self.font = load_font(self.font_size)
+        self.atlas = GlyphAtlas(self.font, levels=config.GIF_SHADES)
+        self.palette = gradient_palette(config.GIF_BG_COLOR, config.GIF_TEXT_COLOR, self.atlas.levels)
+    
+    def frame_size(self, frame_text: str) -> tuple:
+        """(columns, rows) of a frame"""
+        lines = frame_text.split('\n')
+        return max((len(line) for line in lines), default=0), len(lines)
+    
+    def render_frame(self, frame_text: str, size: tuple = None) -> Image.Image:
+        """
+        Rasterize one ASCII frame as a palette image using the glyph atlas.
+        `size` (columns, rows) pads or crops the frame to a fixed grid.
+        """
+        cols, rows = size or self.frame_size(frame_text)
+        lines = frame_text.split('\n')[:rows]
+        codes = np.full((rows, cols), ord(' '), np.uint32)
+        codes[:len(lines)] = lines_to_codes(lines, cols)
+        img = Image.fromarray(self.atlas.render(codes), mode='P')
+        img.putpalette(self.palette)
+        return img
+    
+    def render_frame_draw(self, frame_text: str, size: tuple) -> Image.Image:
+        """Reference rasterizer: one ImageDraw.text call per line (slow)"""
+        cols, rows = size
+        cw, ch = self.atlas.cell_width, self.atlas.cell_height
+        img = Image.new('RGB', (cw * cols, ch * rows), color=config.GIF_BG_COLOR)
+        draw = ImageDraw.Draw(img)
+        for y, line in enumerate(frame_text.split('\n')[:rows]):
+            draw.text((0, y * ch), line, font=self.font, fill=config.GIF_TEXT_COLOR)
+        return img
 
     def export(self, frames: list, filename: str):
         """
@@ -35,29 +61,14 @@ class GifExporter:
             
         print(f"🎬 Exporting GIF ({len(frames)} frames)... This may take a moment.")
         
-        # 1. Determine image size based on first frame
-        lines = frames[0].split('\n')
-        if not lines: return False
-        
-        # Character dimensions (approximate)
-        bbox = self.font.getbbox("A")
-        char_width = bbox[2] - bbox[0]
-        char_height = bbox[3] - bbox[1] + 2 # Add some vertical padding
-        
-        img_width = char_width * len(lines[0])
-        img_height = char_height * len(lines)
+        # 1. Determine the character grid from the first frame; every frame
+        #    is rasterized from pre-rendered glyph tiles at that size
+        size = self.frame_size(frames[0])
+        if not size[0]: return False
         
         gif_frames = []
         for i, frame_text in enumerate(frames):
-            # Create a new image for each frame
-            img = Image.new('RGB', (img_width, img_height), color=config.GIF_BG_COLOR)
-            draw = ImageDraw.Draw(img)
-            
-            # Draw each line
-            for y, line in enumerate(frame_text.split('\n')):
-                draw.text((0, y * char_height), line, font=self.font, fill=config.GIF_TEXT_COLOR)
-            
-            gif_frames.append(img)
+            gif_frames.append(self.render_frame(frame_text, size))
             
             if i % 10 == 0:
                 print(f"   Processed {i}/{len(frames)} frames...")
@@ -77,3 +88,21 @@ class GifExporter:
         
         print(f"✅ GIF saved to {os.path.abspath(filename)}")
         return True
+    
+    def export_stream(self, frames, filename: str, workers: int = None) -> bool:
+        """
+        Export frames (any iterable of frame strings) through the streaming
+        encoder: two colours, bounded memory, parallel rasterization.
+        """
+        if not filename.endswith(".gif"):
+            filename += ".gif"
+        print("🎬 Exporting GIF (streaming)...")
+        with GifStreamWriter(filename, workers) as writer:
+            for frame_text in frames:
+                writer.add(frame_text)
+        if not writer.frames_in:
+            os.remove(filename)
+            return False
+        print(f"✅ GIF saved to {os.path.abspath(filename)} "
+              f"({writer.frames_in} frames, {writer.frames_out} after merging repeats)")
+        return True
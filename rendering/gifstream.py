@@ -0,0 +1,235 @@
+"""
+Real-Time ASCII Camera - Streaming GIF Encoder
+Writes an animated GIF frame by frame instead of collecting every frame for
+one final Pillow save, so memory stays bounded however long the clip is.
+
+- fixed two-colour global palette (GIF_BG_COLOR / GIF_TEXT_COLOR), so no
+  per-frame quantization
+- identical consecutive frames are merged into one with a longer delay
+- each frame after the first only covers the bounding rectangle of the
+  cells that changed (disposal "do not dispose" keeps the rest)
+- rasterization and LZW compression run on a pool of worker processes,
+  in chunks of consecutive frames, with a bounded number in flight
+"""
+
+import io
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from rendering.atlas import GlyphAtlas, cell_size, load_font
+from rendering.diff import lines_to_codes
+
+_GCE = struct.Struct('<BBBBHBB')          # introducer, label, size, flags, delay (cs), transparent, end
+_DESCRIPTOR = struct.Struct('<BHHHHB')    # separator, left, top, width, height, flags
+_DISPOSE_KEEP = 1 << 2                    # disposal method 1: leave the frame in place
+
+# Longest delay one GIF frame can hold, in centiseconds
+MAX_DELAY_CS = 0xFFFF
+
+
+def _skip_sub_blocks(data: bytes, pos: int) -> int:
+    while data[pos]:
+        pos += data[pos] + 1
+    return pos + 1
+
+
+def _image_data(gif: bytes) -> bytes:
+    """LZW code size + data sub-blocks of the first image in a GIF file"""
+    flags = gif[10]
+    pos = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+    while pos < len(gif):
+        if gif[pos] == 0x21:                  # extension: introducer, label, sub-blocks
+            pos = _skip_sub_blocks(gif, pos + 2)
+        elif gif[pos] == 0x2C:
+            flags = gif[pos + 9]
+            pos += _DESCRIPTOR.size
+            if flags & 0x80:
+                pos += 3 << ((flags & 7) + 1)
+            return gif[pos:_skip_sub_blocks(gif, pos + 1)]
+        else:
+            break
+    raise ValueError("No image data in GIF")
+
+
+class _FrameEncoder:
+    """Rasterizes frames with a two-level glyph atlas and LZW-encodes the changed region"""
+
+    def __init__(self, font_size: int):
+        self.atlas = GlyphAtlas(load_font(font_size), levels=2)
+        self._palette = bytes(config.GIF_BG_COLOR) + bytes(config.GIF_TEXT_COLOR)
+
+    def codes(self, text: str, size: Tuple[int, int]) -> np.ndarray:
+        cols, rows = size
+        lines = text.split('\n')[:rows]
+        codes = np.full((rows, cols), ord(' '), np.uint32)
+        codes[:len(lines)] = lines_to_codes(lines, cols)
+        return codes
+
+    def encode(self, codes: np.ndarray, x0: int, y0: int) -> bytes:
+        """Image descriptor + compressed pixels for the cells codes, placed at cell (x0, y0)"""
+        bitmap = self.atlas.render(codes)
+        img = Image.fromarray(bitmap, mode='P')
+        img.putpalette(self._palette)
+        buf = io.BytesIO()
+        img.save(buf, format='GIF', optimize=False, interlace=False)
+        height, width = bitmap.shape
+        descriptor = _DESCRIPTOR.pack(0x2C, x0 * self.atlas.cell_width, y0 * self.atlas.cell_height,
+                                      width, height, 0)
+        return descriptor + _image_data(buf.getvalue())
+
+    def encode_chunk(self, prev_text: Optional[str], texts: List[str],
+                     size: Tuple[int, int]) -> List[bytes]:
+        """Encode consecutive frames; each one only covers what changed since the one before"""
+        prev = self.codes(prev_text, size) if prev_text is not None else None
+        blocks = []
+        for text in texts:
+            cur = self.codes(text, size)
+            if prev is None:
+                y0, y1, x0, x1 = 0, cur.shape[0], 0, cur.shape[1]
+            else:
+                changed = cur != prev
+                rows = np.flatnonzero(changed.any(axis=1))
+                cols = np.flatnonzero(changed.any(axis=0))
+                if rows.size:
+                    y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+                else:
+                    y0, y1, x0, x1 = 0, 1, 0, 1   # differs only outside the grid
+            blocks.append(self.encode(cur[y0:y1, x0:x1], int(x0), int(y0)))
+            prev = cur
+        return blocks
+
+
+_encoder: Optional[_FrameEncoder] = None
+
+
+def _init_encoder(font_size: int):
+    global _encoder
+    _encoder = _FrameEncoder(font_size)
+
+
+def _encode_chunk(prev_text: Optional[str], texts: List[str], size: Tuple[int, int]) -> List[bytes]:
+    return _encoder.encode_chunk(prev_text, texts, size)
+
+
+class GifStreamWriter:
+    """
+    Animated GIF written incrementally: add() frames, then close().
+
+    The grid size is taken from the first frame; later frames are padded
+    or cropped to it. With workers > 1, chunks of `chunk_size` distinct
+    frames are encoded in parallel, at most 2 * workers chunks at a time.
+    """
+
+    def __init__(self, path: str, workers: int = None, chunk_size: int = None,
+                 frame_duration: int = None):
+        self.path = path
+        self.workers = workers if workers is not None else config.GIF_EXPORT_WORKERS
+        self.workers = self.workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or config.GIF_CHUNK_FRAMES
+        self.frame_duration = frame_duration or config.GIF_DURATION
+        self.font_size = config.GIF_FONT_SIZE
+        self.frames_in = 0
+        self.frames_out = 0
+        self._file = open(path, 'wb')
+        self._size: Optional[Tuple[int, int]] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._local: Optional[_FrameEncoder] = None
+        self._pending = deque()              # (durations, future or encoded blocks)
+        self._chunk: List[str] = []
+        self._durations: List[int] = []
+        self._last_text: Optional[str] = None
+        self._chunk_prev: Optional[str] = None
+        self._delay_error = 0.0
+
+    def _start(self, text: str):
+        lines = text.split('\n')
+        self._size = (max((len(line) for line in lines), default=0) or 1, len(lines))
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_encoder,
+                                             initargs=(self.font_size,))
+            cell_w, cell_h = cell_size(load_font(self.font_size))
+        else:
+            self._local = _FrameEncoder(self.font_size)
+            cell_w, cell_h = self._local.atlas.cell_width, self._local.atlas.cell_height
+        width, height = self._size[0] * cell_w, self._size[1] * cell_h
+        f = self._file
+        f.write(b'GIF89a')
+        f.write(struct.pack('<HHBBB', width, height, 0x80, 0, 0))   # global table of 2 colours
+        f.write(bytes(config.GIF_BG_COLOR) + bytes(config.GIF_TEXT_COLOR))
+        f.write(b'\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00')     # loop forever
+
+    def add(self, text: str, duration: int = None):
+        """Queue one frame (newline-joined text); `duration` in ms overrides the default"""
+        duration = duration or self.frame_duration
+        self.frames_in += 1
+        if self._size is None:
+            self._start(text)
+        if text == self._last_text:
+            self._durations[-1] += duration
+            return
+        if len(self._chunk) >= self.chunk_size:
+            # The last frame's duration is final now that a different frame follows
+            self._submit()
+        self._chunk.append(text)
+        self._durations.append(duration)
+        self._last_text = text
+
+    def _submit(self):
+        texts, durations = self._chunk, self._durations
+        if self._pool is not None:
+            while len(self._pending) >= 2 * self.workers:
+                self._write_oldest()
+            result = self._pool.submit(_encode_chunk, self._chunk_prev, texts, self._size)
+        else:
+            result = self._local.encode_chunk(self._chunk_prev, texts, self._size)
+        self._pending.append((durations, result))
+        self._chunk_prev = texts[-1]
+        self._chunk, self._durations = [], []
+        if self._pool is None:
+            self._write_oldest()
+
+    def _write_oldest(self):
+        durations, result = self._pending.popleft()
+        blocks = result.result() if self._pool is not None else result
+        for duration, block in zip(durations, blocks):
+            # Carry rounding error so long clips keep their overall timing
+            exact = duration / 10.0 + self._delay_error
+            delay = min(max(int(round(exact)), 1), MAX_DELAY_CS)
+            self._delay_error = exact - delay
+            self._file.write(_GCE.pack(0x21, 0xF9, 4, _DISPOSE_KEEP, delay, 0, 0))
+            self._file.write(block)
+            self.frames_out += 1
+
+    def close(self) -> str:
+        """Encode what is left, write the trailer and return the path"""
+        if self._file.closed:
+            return self.path
+        try:
+            if self._chunk:
+                self._submit()
+            while self._pending:
+                self._write_oldest()
+            if self._size is not None:
+                self._file.write(b'\x3B')
+        finally:
+            if self._pool is not None:
+                for _, future in self._pending:
+                    future.cancel()
+                self._pool.shutdown()
+            self._file.close()
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,46 @@
+"""
+Real-Time ASCII Camera - Null Renderer
+Accepts frames without drawing them, for benchmarks and headless runs.
+"""
+
+from typing import List, Optional
+
+
+class NullRenderer:
+    """
+    Same interface as AsciiRenderer, but nothing reaches a terminal.
+    Counts what a full redraw would have written.
+    """
+
+    def __init__(self, width: int = 120, height: int = 40):
+        self.width = width
+        self.height = height
+        self.frames = 0
+        self.last_cells_written = 0
+        self.last_bytes_written = 0
+        self.color_mode = 'none'
+
+    def get_dimensions(self) -> tuple:
+        return self.width, self.height
+
+    def invalidate(self):
+        pass
+
+    def set_color_mode(self, mode: str) -> str:
+        self.color_mode = mode
+        return mode
+
+    def render_frame(self, lines: List[str], colors: Optional[object] = None):
+        rows = lines[:max(self.height - 1, 0)]
+        self.last_cells_written = sum(len(line) for line in rows)
+        self.last_bytes_written = self.last_cells_written + len(rows)
+        self.frames += 1
+
+    def render_status(self, text: str):
+        pass
+
+    def render_overlay(self, lines: List[str]):
+        pass
+
+    def get_key(self) -> int:
+        return -1
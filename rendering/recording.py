@@ -0,0 +1,473 @@
+"""
+Real-Time ASCII Camera - Recording Files
+Streams recorded ASCII frames to a compact, indexed binary file (.acr)
+from a background thread instead of keeping them in memory.
+
+Layout (little-endian):
+    header   magic 'ACR1', version, width, height, fps, ramp
+    blocks   one per frame: kind, codec, dtype, rows, cols, timestamp,
+             payload length, payload
+    index    frame count, then (offset, timestamp, keyframe) per frame
+    footer   index offset, magic 'ACRX'
+
+Version 2 stores a keyframe (all character codes) at least every
+RECORD_KEYFRAME_INTERVAL frames and deltas in between: runs of the cells
+that differ (XOR != 0) from the previous frame, with their new codes. A
+frame whose compressed delta is not smaller than its keyframe is written
+as a keyframe. Each block is compressed with zlib or lzma, or stored as-is
+when that is smaller.
+Version 1 files (keyframes only, no keyframe column in the index) are
+still read.
+
+A file whose writer died before writing the index is still readable: the
+reader rebuilds the index by scanning the blocks.
+"""
+
+import bisect
+import lzma
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from rendering.diff import lines_to_codes
+
+MAGIC = b'ACR1'
+FOOTER_MAGIC = b'ACRX'
+VERSION = 2
+
+_HEADER = struct.Struct('<4sHIIfI')       # magic, version, width, height, fps, ramp bytes
+_BLOCK = struct.Struct('<BBBHHdI')        # kind, codec, dtype, rows, cols, timestamp, payload bytes
+_INDEX_ENTRY_V1 = struct.Struct('<Qd')    # offset, timestamp
+_INDEX_ENTRY = struct.Struct('<QdI')      # offset, timestamp, frame number of its keyframe
+_FOOTER = struct.Struct('<Q4s')           # index offset, magic
+
+BLOCK_FRAME = 1                           # keyframe: every code of the frame
+BLOCK_DELTA = 2                           # runs of cells XORed against the previous frame
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_LZMA = 2
+CODECS = {'none': CODEC_NONE, 'zlib': CODEC_ZLIB, 'lzma': CODEC_LZMA}
+DTYPE_U8 = 1
+DTYPE_U32 = 4
+_DTYPES = {DTYPE_U8: np.uint8, DTYPE_U32: np.uint32}
+
+# Unchanged cells between two changed ones are stored inside the run
+# rather than starting a new one when the gap is this short in bytes;
+# a run costs 8 bytes (gap + length).
+_RUN_MERGE_BYTES = 8
+
+
+def _dtype_code(values: np.ndarray) -> int:
+    return DTYPE_U8 if values.size == 0 or values.max() < 256 else DTYPE_U32
+
+
+def _compress(raw: bytes, codec: int) -> Tuple[int, bytes]:
+    """Compress with the requested codec, or store raw if that is not smaller"""
+    if codec == CODEC_ZLIB:
+        packed = zlib.compress(raw, config.RECORD_COMPRESSION_LEVEL)
+    elif codec == CODEC_LZMA:
+        packed = lzma.compress(raw, preset=config.RECORD_COMPRESSION_LEVEL)
+    else:
+        return CODEC_NONE, raw
+    return (codec, packed) if len(packed) < len(raw) else (CODEC_NONE, raw)
+
+
+def _decompress(payload: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+    if codec == CODEC_LZMA:
+        return lzma.decompress(payload)
+    if codec == CODEC_NONE:
+        return payload
+    raise ValueError(f"Unknown recording codec {codec}")
+
+
+def encode_delta(prev: np.ndarray, cur: np.ndarray) -> Tuple[int, bytes]:
+    """
+    Delta of two equally shaped uint32 code arrays: (dtype code, raw payload).
+
+    XOR against the previous frame finds the changed cells, which are
+    grouped into runs. Payload: run count, then per run the gap since the
+    previous run and its length (uint32 each), then the new codes of every
+    cell inside a run.
+    """
+    flat = cur.reshape(-1)
+    changed = np.flatnonzero(np.bitwise_xor(prev, cur).reshape(-1))
+    if changed.size == 0:
+        return DTYPE_U8, struct.pack('<I', 0)
+    dtype_code = _dtype_code(flat[changed])
+    gap = _RUN_MERGE_BYTES // np.dtype(_DTYPES[dtype_code]).itemsize
+    breaks = np.flatnonzero(np.diff(changed) > gap + 1) + 1
+    starts = changed[np.r_[0, breaks]]
+    ends = changed[np.r_[breaks - 1, changed.size - 1]] + 1
+    gaps = starts - np.r_[0, ends[:-1]]
+    lengths = ends - starts
+    values = flat[_run_indices(starts, lengths)].astype(_DTYPES[dtype_code])
+    return dtype_code, b''.join((struct.pack('<I', starts.size),
+                                 gaps.astype(np.uint32).tobytes(),
+                                 lengths.astype(np.uint32).tobytes(),
+                                 values.tobytes()))
+
+
+def apply_delta(prev: np.ndarray, raw: bytes, dtype_code: int) -> np.ndarray:
+    """Inverse of encode_delta: a new array equal to the frame after prev"""
+    (count,) = struct.unpack_from('<I', raw)
+    cur = prev.copy()
+    if count == 0:
+        return cur
+    runs = np.frombuffer(raw, np.uint32, 2 * count, offset=4).astype(np.intp)
+    gaps, lengths = runs[:count], runs[count:]
+    starts = np.cumsum(gaps) + (np.cumsum(lengths) - lengths)
+    values = np.frombuffer(raw, _DTYPES[dtype_code], offset=4 + 8 * count)
+    cur.reshape(-1)[_run_indices(starts, lengths)] = values
+    return cur
+
+
+def _run_indices(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Flat indices of every cell covered by the runs"""
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(int(lengths.sum()))
+
+
+class RecordingWriter:
+    """Appends frames to a recording file"""
+
+    def __init__(self, path: str, width: int, height: int, fps: float, ramp: str = "",
+                 keyframe_interval: int = None, codec: str = None):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.keyframe_interval = max(1, keyframe_interval or config.RECORD_KEYFRAME_INTERVAL)
+        self.codec = CODECS[codec or config.RECORD_CODEC]
+        self._file = open(path, 'wb')
+        ramp_bytes = ramp.encode('utf-8')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, width, height, fps, len(ramp_bytes)))
+        self._file.write(ramp_bytes)
+        self._index = []
+        self._prev: Optional[np.ndarray] = None
+        self._keyframe = 0
+
+    def write_frame(self, lines: List[str], timestamp: float):
+        """Append one frame (lines are padded to the longest line)"""
+        cols = max((len(line) for line in lines), default=0)
+        self.write_codes(lines_to_codes(lines, cols), timestamp)
+
+    def write_codes(self, codes: np.ndarray, timestamp: float):
+        """Append one frame given as a (rows, cols) uint32 code array"""
+        n = len(self._index)
+        key_dtype = _dtype_code(codes)
+        kind, dtype_code = BLOCK_FRAME, key_dtype
+        codec, payload = _compress(codes.astype(_DTYPES[key_dtype], copy=False).tobytes(), self.codec)
+        if (self._prev is not None and self._prev.shape == codes.shape
+                and n - self._keyframe < self.keyframe_interval):
+            delta_dtype, raw = encode_delta(self._prev, codes)
+            delta_codec, delta_payload = _compress(raw, self.codec)
+            # Keep the delta unless the frame changed so much a keyframe is no bigger
+            if len(delta_payload) < len(payload):
+                kind, dtype_code, codec, payload = BLOCK_DELTA, delta_dtype, delta_codec, delta_payload
+        if kind == BLOCK_FRAME:
+            self._keyframe = n
+
+        offset = self._file.tell()
+        self._file.write(_BLOCK.pack(kind, codec, dtype_code, codes.shape[0], codes.shape[1],
+                                     timestamp, len(payload)))
+        self._file.write(payload)
+        self._index.append((offset, timestamp, self._keyframe))
+        self._prev = codes
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """Write the seek index and footer"""
+        if self._file.closed:
+            return
+        try:
+            index_offset = self._file.tell()
+            self._file.write(struct.pack('<I', len(self._index)))
+            for entry in self._index:
+                self._file.write(_INDEX_ENTRY.pack(*entry))
+            self._file.write(_FOOTER.pack(index_offset, FOOTER_MAGIC))
+        finally:
+            # Without the footer, RecordingReader still finds the blocks by scanning
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class RecordingReader:
+    """Random access to the frames of a recording file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        magic, version, self.width, self.height, self.fps, ramp_len = _HEADER.unpack(
+            self._file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an ASCII camera recording")
+        if version > VERSION:
+            raise ValueError(f"{path} uses recording format v{version}, newer than supported v{VERSION}")
+        self.version = version
+        self.ramp = self._file.read(ramp_len).decode('utf-8')
+        self._data_start = self._file.tell()
+        self._index = self._read_index()
+        self._cached: Tuple[int, Optional[np.ndarray]] = (-1, None)
+
+    def _read_index(self) -> list:
+        f = self._file
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size >= self._data_start + _FOOTER.size:
+            f.seek(size - _FOOTER.size)
+            index_offset, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+            if magic == FOOTER_MAGIC:
+                f.seek(index_offset)
+                (count,) = struct.unpack('<I', f.read(4))
+                if self.version == 1:
+                    data = f.read(count * _INDEX_ENTRY_V1.size)
+                    return [_INDEX_ENTRY_V1.unpack_from(data, i * _INDEX_ENTRY_V1.size) + (i,)
+                            for i in range(count)]
+                data = f.read(count * _INDEX_ENTRY.size)
+                return [_INDEX_ENTRY.unpack_from(data, i * _INDEX_ENTRY.size) for i in range(count)]
+        return self._scan_blocks(size)
+
+    def _scan_blocks(self, size: int) -> list:
+        """Rebuild the index of an unfinished file, ignoring a truncated last block"""
+        index = []
+        offset = self._data_start
+        keyframe = None
+        f = self._file
+        while offset + _BLOCK.size <= size:
+            f.seek(offset)
+            kind, _, _, _, _, timestamp, length = _BLOCK.unpack(f.read(_BLOCK.size))
+            end = offset + _BLOCK.size + length
+            if kind not in (BLOCK_FRAME, BLOCK_DELTA) or end > size:
+                break
+            if kind == BLOCK_FRAME:
+                keyframe = len(index)
+            elif keyframe is None:
+                break
+            index.append((offset, timestamp, keyframe))
+            offset = end
+        return index
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def timestamps(self) -> List[float]:
+        return [entry[1] for entry in self._index]
+
+    def timestamp(self, i: int) -> float:
+        return self._index[i][1]
+
+    def keyframe_of(self, i: int) -> int:
+        """Frame number of the keyframe that frame i is decoded from"""
+        return self._index[i][2]
+
+    def index_at(self, timestamp: float) -> int:
+        """Last frame shown at `timestamp` (seconds from the start)"""
+        i = bisect.bisect_right(self.timestamps, timestamp) - 1
+        return max(0, min(i, len(self) - 1))
+
+    def _read_block(self, i: int) -> Tuple[int, int, int, int, bytes]:
+        offset = self._index[i][0]
+        self._file.seek(offset)
+        kind, codec, dtype_code, rows, cols, _, length = _BLOCK.unpack(self._file.read(_BLOCK.size))
+        return kind, dtype_code, rows, cols, _decompress(self._file.read(length), codec)
+
+    def frame_codes(self, i: int) -> np.ndarray:
+        """
+        Character codes of frame i as a read-only (rows, cols) uint32 array.
+
+        Decodes from frame i's keyframe, or from the last decoded frame
+        when that is on the way, so sequential reads cost one delta each.
+        """
+        cached_i, codes = self._cached
+        if cached_i == i:
+            return codes
+        keyframe = self.keyframe_of(i)
+        if not keyframe <= cached_i < i:
+            kind, dtype_code, rows, cols, raw = self._read_block(keyframe)
+            codes = np.frombuffer(raw, dtype=_DTYPES[dtype_code]).reshape(rows, cols).astype(np.uint32)
+            cached_i = keyframe
+        for j in range(cached_i + 1, i + 1):
+            kind, dtype_code, rows, cols, raw = self._read_block(j)
+            codes = apply_delta(codes, raw, dtype_code)
+        codes.setflags(write=False)
+        self._cached = (i, codes)
+        return codes
+
+    def frame_lines(self, i: int) -> List[str]:
+        codes = self.frame_codes(i)
+        rows, cols = codes.shape
+        if cols == 0:
+            return [''] * rows
+        return np.ascontiguousarray(codes).view(f'U{cols}').reshape(rows).tolist()
+
+    def __getitem__(self, i: int) -> str:
+        """Frame i as newline-joined text"""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return "\n".join(self.frame_lines(i))
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class RecordingPlayer:
+    """
+    Plays a recording back in real time from any timestamp.
+
+    Seeking lands on the frame showing at that time; the reader decodes it
+    from the nearest preceding keyframe.
+    """
+
+    def __init__(self, reader: RecordingReader, speed: float = 1.0):
+        self.reader = reader
+        self.speed = speed if speed > 0 else 1.0
+
+    def frames(self, start: float = 0.0) -> Iterator[Tuple[float, List[str]]]:
+        """(timestamp, lines) from `start` seconds to the end, without pacing"""
+        for i in range(self.reader.index_at(start), len(self.reader)):
+            yield self.reader.timestamp(i), self.reader.frame_lines(i)
+
+    def play(self, sink, start: float = 0.0):
+        """Write frames to a FrameSink at their recorded pace (scaled by speed)"""
+        clock_start = time.perf_counter()
+        first = None
+        for timestamp, lines in self.frames(start):
+            if first is None:
+                first = timestamp
+            delay = (timestamp - first) / self.speed - (time.perf_counter() - clock_start)
+            if delay > 0:
+                time.sleep(delay)
+            sink.write(lines)
+
+
+def text_to_recording(txt_path: str, acr_path: str, fps: float = None, ramp: str = "",
+                      keyframe_interval: int = None, codec: str = None) -> int:
+    """Convert a form-feed separated .txt recording to .acr; returns the frame count"""
+    from rendering.sinks import FRAME_SEPARATOR
+    fps = fps or config.TARGET_FPS
+    with open(txt_path, encoding="utf-8") as f:
+        frames = [frame.split("\n") for frame in f.read().split(FRAME_SEPARATOR)]
+    width = max((len(line) for line in frames[0]), default=0)
+    with RecordingWriter(acr_path, width, len(frames[0]), fps, ramp, keyframe_interval, codec) as writer:
+        for i, lines in enumerate(frames):
+            writer.write_frame(lines, i / fps)
+        return len(writer)
+
+
+def recording_to_text(acr_path: str, txt_path: str) -> int:
+    """Convert an .acr recording to the form-feed separated .txt format"""
+    from rendering.sinks import TextSink
+    with RecordingReader(acr_path) as reader, TextSink(txt_path) as sink:
+        for i in range(len(reader)):
+            sink.write(reader.frame_lines(i))
+        return len(reader)
+
+
+def recode_recording(src_path: str, dst_path: str, keyframe_interval: int = None,
+                     codec: str = None) -> int:
+    """Rewrite an .acr recording (any version) with the current format and settings"""
+    with RecordingReader(src_path) as reader, \
+            RecordingWriter(dst_path, reader.width, reader.height, reader.fps, reader.ramp,
+                            keyframe_interval, codec) as writer:
+        for i in range(len(reader)):
+            writer.write_codes(reader.frame_codes(i), reader.timestamp(i))
+        return len(writer)
+
+
+class StreamingRecorder:
+    """
+    Records frames on a background writer thread.
+
+    add() only enqueues the frame's line list; encoding, compression and
+    disk writes happen on the writer thread. The queue is bounded, so if
+    the disk cannot keep up frames are dropped (and counted) instead of
+    memory growing. If the writer fails, later frames are dropped too and
+    close() raises once the file is finished as far as possible.
+    """
+
+    def __init__(self, path: str, width: int, height: int, fps: float, ramp: str = ""):
+        self.path = path
+        self.writer = RecordingWriter(path, width, height, fps, ramp)
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=config.RECORD_QUEUE_SIZE)
+        self._start = time.perf_counter()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="recording-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, lines: List[str]):
+        if self._error is not None:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((list(lines), time.perf_counter() - self._start))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                self.writer.write_frame(*item)
+        except BaseException as e:
+            self._error = e
+
+    @property
+    def frames_written(self) -> int:
+        return len(self.writer)
+
+    def close(self) -> str:
+        """
+        Flush pending frames, finish the file and return its path. Raises
+        RuntimeError if the writer failed; the frames written before the
+        failure stay readable at self.path.
+        """
+        # A failed writer no longer drains the queue, so never block on it
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        try:
+            self.writer.close()
+        except OSError:
+            if self._error is None:
+                raise
+        if self._error is not None:
+            raise RuntimeError("Recording writer failed") from self._error
+        return self.path
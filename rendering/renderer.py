@@ -4,16 +4,78 @@ Uses curses for smooth, flicker-free terminal output.
 """
 
 import curses
+from collections import OrderedDict
+import numpy as np
 from typing import List, Optional
 
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from rendering.diff import lines_to_codes, changed_spans, cursor_move_cost
+from processing.color import COLOR_DTYPES, reduce_palette
+
+# In colour mode a cell's xterm colour index is stored above its code point
+# (code points fit in 21 bits), so one comparison covers both.
+COLOR_SHIFT = 21
+STALE_CELL = np.uint32(0xFFFFFFFF)  # never equals a real cell
+COLOR_ESCAPE_COST = 11  # bytes in ESC [ 38 ; 5 ; n m
+
+
+class ColorPairCache:
+    """
+    LRU map from colour number to a curses colour pair.
+
+    Terminals offer a limited number of pairs (often fewer than the 256
+    colours), so the least recently used pair is reassigned when they run
+    out. Reassigned colours are collected in `evicted` because cells already
+    on screen with that pair change colour with it.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._attrs = OrderedDict()  # colour -> (pair, attribute)
+        self.evicted: List[int] = []
+
+    def attr(self, color: int) -> int:
+        """curses attribute drawing in `color` on the default background"""
+        entry = self._attrs.get(color)
+        if entry is not None:
+            self._attrs.move_to_end(color)
+            return entry[1]
+        if len(self._attrs) < self.capacity:
+            pair = len(self._attrs) + 1
+        else:
+            old, (pair, _) = self._attrs.popitem(last=False)
+            self.evicted.append(old)
+        curses.init_pair(pair, color, -1)
+        attr = curses.color_pair(pair)
+        self._attrs[color] = (pair, attr)
+        return attr
+
+    def drain_evicted(self) -> List[int]:
+        evicted, self.evicted = self.evicted, []
+        return evicted
+
 
 class AsciiRenderer:
     """Curses-based terminal renderer for ASCII art"""
     
-    def __init__(self):
+    def __init__(self, differential: bool = None):
         self.stdscr: Optional[curses.window] = None
         self.width = 0
         self.height = 0
+        # Differential mode keeps the last drawn frame and only rewrites
+        # the spans that changed instead of clearing the whole screen.
+        self.differential = config.ENABLE_DIFF_RENDER if differential is None else differential
+        self._prev_codes: Optional[np.ndarray] = None
+        self._prev_lines: Optional[List[str]] = None
+        self._prev_colors: Optional[np.ndarray] = None
+        self._pairs: Optional[ColorPairCache] = None
+        self._palette: Optional[np.ndarray] = None
+        self.color_mode = 'none'
+        self.last_cells_written = 0
+        self.last_bytes_written = 0
     
     def set_screen(self, stdscr: curses.window):
         """Set the curses screen"""
@@ -33,30 +95,178 @@ class AsciiRenderer:
             self.height, self.width = self.stdscr.getmaxyx()
         return self.width, self.height
     
-    def render_frame(self, lines: List[str]):
-        """Render a complete ASCII frame to the terminal (Grayscale)"""
+    def invalidate(self):
+        """Forget the last frame so the next one is drawn in full"""
+        self._prev_codes = None
+        self._prev_lines = None
+        self._prev_colors = None
+    
+    def set_color_mode(self, mode: str) -> str:
+        """
+        Switch colour output on ('256'/'truecolor') or off ('none').
+        Curses has no truecolour, so that falls back to the 256-colour
+        palette (reduced further on 8/16-colour terminals). Returns the mode
+        actually in use.
+        """
+        if mode != 'none' and (self.stdscr is None or not curses.has_colors()):
+            mode = 'none'
+        if mode != 'none' and self._pairs is None:
+            curses.start_color()
+            curses.use_default_colors()
+            self._pairs = ColorPairCache(max(curses.COLOR_PAIRS - 1, 1))
+            self._palette = reduce_palette(curses.COLORS)
+        self.color_mode = 'none' if mode == 'none' else '256'
+        self.invalidate()
+        return self.color_mode
+    
+    def render_frame(self, lines: List[str], colors: Optional[np.ndarray] = None):
+        """
+        Render a complete ASCII frame to the terminal. `colors` (xterm
+        indices per cell, from ColorQuantizer) is drawn through curses
+        colour pairs, one addstr per run of equal colour.
+        """
         if not self.stdscr:
             return
+        if self.color_mode == 'none' or colors is None or colors.dtype != COLOR_DTYPES[self.color_mode]:
+            colors = None
+        else:
+            colors = self._palette[colors[:max(self.height - 1, 0), :max(self.width - 1, 0)]]
+        if self.differential:
+            self._render_diff(lines, colors)
+            return
         
+        cells = 0
+        nbytes = 0
         try:
             self.stdscr.clear()
             for y, line in enumerate(lines):
                 if y >= self.height - 1: break
-                try:
-                    self.stdscr.addstr(y, 0, line[:self.width - 1])
-                except: pass
+                text = line[:self.width - 1]
+                nbytes += self._draw(y, 0, text, colors[y] if colors is not None else None)
+                cells += len(text)
+            if colors is not None and self._pairs.evicted:
+                # Rows drawn before one of their colours' pairs was
+                # reassigned show the new colour: draw them once more
+                stale = np.isin(colors, self._pairs.drain_evicted()).any(axis=1)
+                for y in np.flatnonzero(stale):
+                    text = lines[y][:self.width - 1]
+                    nbytes += self._draw(y, 0, text, colors[y])
+                # Pairs this pass reassigns are fixed by the next full redraw
+                self._pairs.drain_evicted()
             self.stdscr.refresh()
         except: pass
+        self.last_cells_written = cells
+        self.last_bytes_written = nbytes
+    
+    def _draw(self, y: int, x: int, text: str, colors: Optional[np.ndarray]) -> int:
+        """addstr text at (y, x), split into runs of equal colour; returns bytes emitted"""
+        if colors is None:
+            try:
+                self.stdscr.addstr(y, x, text)
+            except curses.error:
+                pass
+            return cursor_move_cost(y, x) + len(text.encode('utf-8'))
+        colors = colors[x:x + len(text)]
+        bounds = [0] + (np.flatnonzero(colors[1:] != colors[:-1]) + 1).tolist() + [len(text)]
+        nbytes = cursor_move_cost(y, x) + len(text.encode('utf-8'))
+        for color, start, stop in zip(colors[bounds[:-1]].tolist(), bounds, bounds[1:]):
+            try:
+                self.stdscr.addstr(y, x + start, text[start:stop], self._pairs.attr(color))
+            except curses.error:
+                pass
+            nbytes += COLOR_ESCAPE_COST
+        return nbytes
+    
+    def _render_diff(self, lines: List[str], colors: Optional[np.ndarray] = None):
+        """
+        Write only the spans that differ from the previously drawn frame.
+        Rows whose text and colours are unchanged are skipped before any
+        array work, so a mostly static frame costs a string compare per row.
+        In colour mode the colour index rides in the cell codes' top bits,
+        so a colour change alone also marks a cell as changed.
+        """
+        width = max(self.width - 1, 0)
+        rows = lines[:max(self.height - 1, 0)]
+        if colors is not None and colors.shape != (len(rows), width):
+            padded = np.zeros((len(rows), width), dtype=colors.dtype)
+            padded[:colors.shape[0], :colors.shape[1]] = colors
+            colors = padded
+        prev = self._prev_codes
+        prev_colors = self._prev_colors
+        if (prev is not None and self._prev_lines is not None and prev.shape == (len(rows), width)
+                and (colors is None) == (prev_colors is None)):
+            prev_lines = self._prev_lines
+            changed = [line != prev_lines[y] for y, line in enumerate(rows)]
+            if colors is not None:
+                changed = np.logical_or(changed, (colors != prev_colors).any(axis=1))
+            dirty = np.flatnonzero(changed)
+            cur = self._cell_codes([rows[y] for y in dirty], colors[dirty] if colors is not None else None, width)
+            spans = [(int(dirty[y]), start, end) for y, start, end in changed_spans(prev[dirty], cur)]
+            prev[dirty] = cur
+            codes = prev
+        else:
+            codes = self._cell_codes(rows, colors, width)
+            if prev is None or prev.shape != codes.shape:
+                self.stdscr.erase()
+                prev = None
+            spans = changed_spans(prev, codes)
+        
+        cells = 0
+        nbytes = 0
+        for y, start, end in spans:
+            text = rows[y].ljust(width)[start:end]
+            nbytes += self._draw(y, start, text, colors[y] if colors is not None else None)
+            cells += end - start
+        try:
+            self.stdscr.refresh()
+        except curses.error:
+            pass
+        self._prev_codes = codes
+        self._prev_lines = rows
+        self._prev_colors = colors
+        if colors is not None and self._pairs.evicted:
+            self._forget_colors(self._pairs.drain_evicted())
+        self.last_cells_written = cells
+        self.last_bytes_written = nbytes
+    
+    @staticmethod
+    def _cell_codes(rows: List[str], colors: Optional[np.ndarray], width: int) -> np.ndarray:
+        codes = lines_to_codes(rows, width)
+        if colors is not None:
+            codes |= colors.astype(np.uint32) << COLOR_SHIFT
+        return codes
+    
+    def _forget_colors(self, evicted: List[int]):
+        """
+        Cells drawn with a colour whose pair was just reassigned now show the
+        wrong colour on screen; mark them so the next frame redraws them.
+        """
+        stale = np.isin(self._prev_codes >> COLOR_SHIFT, evicted)
+        self._prev_codes[stale] = STALE_CELL
+        for y in np.flatnonzero(stale.any(axis=1)):
+            self._prev_lines[y] = None
 
     def render_status(self, text: str):
         """Render a status line at the bottom"""
         if not self.stdscr:
             return
         try:
-            self.stdscr.addstr(self.height - 1, 0, text[:self.width - 1], curses.A_REVERSE)
+            # Pad so a shorter status fully overwrites the previous one
+            self.stdscr.addstr(self.height - 1, 0, text[:self.width - 1].ljust(self.width - 1), curses.A_REVERSE)
         except curses.error:
             pass
     
+    def render_overlay(self, lines: List[str]):
+        """Draw centred reverse-video lines over the current frame"""
+        if not self.stdscr or not lines:
+            return
+        sy = (self.height - len(lines)) // 2
+        sx = (self.width - len(lines[0])) // 2
+        for i, line in enumerate(lines):
+            try: self.stdscr.addstr(sy + i, sx, line, curses.A_REVERSE)
+            except: pass
+        self.stdscr.refresh()
+    
     def get_key(self) -> Optional[int]:
         """Get a key press (non-blocking)"""
         if not self.stdscr:
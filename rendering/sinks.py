@@ -0,0 +1,96 @@
+"""
+Real-Time ASCII Camera - Frame Sinks
+Headless destinations for ASCII frames: plain text, ANSI stream and GIF.
+"""
+
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rendering.gifstream import GifStreamWriter
+
+# Separator between frames in multi-frame text files (same as recordings)
+FRAME_SEPARATOR = "\n\f\n"
+
+
+class FrameSink(ABC):
+    """Base class for frame destinations"""
+
+    @abstractmethod
+    def write(self, lines: List[str]):
+        """Write one frame"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TextSink(FrameSink):
+    """Frames as plain text separated by form feeds (the recording .txt format)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = sys.stdout if path == '-' else open(path, "w", encoding="utf-8")
+        self._first = True
+
+    def write(self, lines: List[str]):
+        if not self._first:
+            self._file.write(FRAME_SEPARATOR)
+        self._file.write("\n".join(lines))
+        self._first = False
+
+    def close(self):
+        self._file.flush()
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class AnsiSink(FrameSink):
+    """Frames as an ANSI stream (cursor home + frame) that can be cat'ed to a terminal"""
+
+    def __init__(self, path: str = '-'):
+        self.path = path
+        self._file = sys.stdout.buffer if path == '-' else open(path, "wb")
+        self._file.write(b"\x1b[2J")
+
+    def write(self, lines: List[str]):
+        self._file.write(b"\x1b[H" + "\n".join(lines).encode("utf-8") + b"\n")
+
+    def close(self):
+        self._file.flush()
+        if self._file is not sys.stdout.buffer:
+            self._file.close()
+
+
+class GifSink(FrameSink):
+    """Frames encoded into an animated GIF as they arrive (see GifStreamWriter)"""
+
+    def __init__(self, path: str, workers: int = None):
+        if not path.endswith(".gif"):
+            path += ".gif"
+        self.path = path
+        self._writer = GifStreamWriter(path, workers)
+
+    def write(self, lines: List[str]):
+        self._writer.add("\n".join(lines))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_sink(fmt: str, path: str, workers: int = None) -> FrameSink:
+    """Create a sink for 'txt', 'ansi' or 'gif' output (workers only applies to GIF)"""
+    if fmt == 'txt':
+        return TextSink(path)
+    if fmt == 'ansi':
+        return AnsiSink(path)
+    if fmt == 'gif':
+        return GifSink(path, workers)
+    raise ValueError(f"Unknown output format: {fmt}")